@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def make_etag(last_modified: datetime, *versions: int) -> str:
+    # Время хранится в БД как naive UTC с точностью до микросекунд
+    micros = (last_modified.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1)
+    return '"' + "-".join(f"{value:x}" for value in (*versions, micros)) + '"'
+
+
+def http_date(moment: datetime) -> str:
+    return format_datetime(
+        moment.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True
+    )
+
+
+def make_validators(last_modified: datetime, *versions: int) -> dict[str, str]:
+    return {
+        "ETag": make_etag(last_modified, *versions),
+        "Last-Modified": http_date(last_modified),
+    }
+
+
+def is_not_modified(request: Request, validators: dict[str, str]) -> bool:
+    # If-None-Match важнее If-Modified-Since (RFC 9110, 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validators["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return parsedate_to_datetime(validators["Last-Modified"]) <= since
+
+
+def not_modified(validators: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Sequence
+
+from .fast_json import storage_to_iso, storage_to_uuid
+
+EXPORT_COLUMNS = (
+    "id",
+    "dictionary_id",
+    "original_text",
+    "translated_text",
+    "usage_example",
+    "notes",
+    "created_at",
+    "updated_at",
+)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _api_row(row: Sequence) -> list:
+    values = list(row)
+    values[0] = storage_to_uuid(values[0])
+    values[1] = storage_to_uuid(values[1])
+    values[-2] = storage_to_iso(values[-2])
+    values[-1] = storage_to_iso(values[-1])
+    return values
+
+
+def encode_ndjson(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for batch in batches:
+        lines = [
+            encoder.encode(dict(zip(EXPORT_COLUMNS, _api_row(row)))) for row in batch
+        ]
+        lines.append("")
+        yield "\n".join(lines).encode()
+
+
+def encode_csv(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for batch in batches:
+        writer.writerows(_api_row(row) for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Пустой словарь: отдаём хотя бы заголовок
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+EXPORT_ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv}
@@ -1,20 +1,47 @@
+from dataclasses import asdict
+from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.infrastructure import get_db
-from app.infrastructure.entry_repository import EntryRepository
+from app.domain import DuplicateEntryError
+from app.infrastructure import get_db, iterate_db, run_db
+from app.infrastructure.entry_repository import EntryRepository, OnDuplicate
+from app.infrastructure.write_batching import EntryWriteBatcher, get_entry_batcher
+from app.infrastructure.writer import WriterClient, get_writer
 from app.services.entry_service import EntryService
 
-from .entry_schemas import EntryCreate, EntryListResponse, EntryResponse
+from .conditional import is_not_modified, make_validators, not_modified
+from .entry_export import EXPORT_ENCODERS, EXPORT_MEDIA_TYPES
+from .entry_schemas import (
+    AutocompleteResponse,
+    EntryBatchGetRequest,
+    EntryBatchGetResponse,
+    EntryCreate,
+    EntryImportResponse,
+    EntryListResponse,
+    EntryResponse,
+    FuzzyMatchResponse,
+    FuzzySearchResponse,
+    SearchHit,
+    SearchResponse,
+)
+from .fast_json import FastJSONResponse, row_objects
+from .pagination import decode_cursor, next_cursor
+from .tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1", tags=["entries"])
+router = APIRouter(prefix="/api/v1", tags=["entries"], route_class=TracedRoute)
 
 
-def get_entry_service(db: Session = Depends(get_db)) -> EntryService:
+def get_entry_service(
+    db: Session = Depends(get_db),
+    batcher: Optional[EntryWriteBatcher] = Depends(get_entry_batcher),
+    writer: Optional[WriterClient] = Depends(get_writer),
+) -> EntryService:
     repository = EntryRepository(db)
-    return EntryService(repository)
+    return EntryService(repository, batcher, writer)
 
 
 @router.post(
@@ -22,7 +49,11 @@ def get_entry_service(db: Session = Depends(get_db)) -> EntryService:
     response_model=EntryResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Добавить запись в словарь",
-    description="Создание новой записи (слова/выражения) в указанном словаре",
+    description=(
+        "Создание новой записи (слова/выражения) в указанном словаре. "
+        "Если запись с тем же текстом (без учёта регистра и пробелов) уже "
+        "есть, возвращается 409"
+    ),
 )
 async def create_entry(
     dictionary_id: UUID,
@@ -30,7 +61,7 @@ async def create_entry(
     service: EntryService = Depends(get_entry_service),
 ) -> EntryResponse:
     try:
-        entry = service.create_entry(
+        entry = await service.add_entry(
             dictionary_id=dictionary_id,
             original_text=entry_data.original_text,
             translated_text=entry_data.translated_text,
@@ -38,28 +69,185 @@ async def create_entry(
             notes=entry_data.notes,
         )
         return EntryResponse.from_domain(entry)
+    except DuplicateEntryError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
         ) from e
 
 
+@router.post(
+    "/dictionaries/{dictionary_id}/entries/import",
+    response_model=EntryImportResponse,
+    summary="Массовый импорт записей",
+    description=(
+        "Потоковый импорт записей из NDJSON или CSV (с заголовком). "
+        "Некорректные строки пропускаются и возвращаются в списке ошибок"
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_entries(
+    dictionary_id: UUID,
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    on_duplicate: OnDuplicate = Query(
+        "skip",
+        description=(
+            "Запись, уже существующая в словаре: error - ошибка строки, "
+            "skip - пропустить, merge - обновить перевод, пример и заметки"
+        ),
+    ),
+    service: EntryService = Depends(get_entry_service),
+) -> EntryImportResponse:
+    if not await run_db(service.dictionary_exists, dictionary_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Dictionary with id {dictionary_id} not found",
+        )
+
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if content_type.startswith("text/csv") else "ndjson"
+
+    report = await service.import_entries(
+        dictionary_id, request.stream(), format, on_duplicate=on_duplicate
+    )
+    return EntryImportResponse.model_validate(asdict(report))
+
+
+@router.get(
+    "/dictionaries/{dictionary_id}/entries/export",
+    response_class=StreamingResponse,
+    summary="Экспорт записей словаря",
+    description="Потоковая выгрузка всех записей словаря в NDJSON или CSV",
+)
+async def export_entries(
+    dictionary_id: UUID,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    service: EntryService = Depends(get_entry_service),
+) -> StreamingResponse:
+    if not await run_db(service.dictionary_exists, dictionary_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Dictionary with id {dictionary_id} not found",
+        )
+
+    # Чтение курсора и кодирование батчей идут в пуле потоков БД
+    body = iterate_db(EXPORT_ENCODERS[format](service.export_entries(dictionary_id)))
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="entries-{dictionary_id}.{format}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/dictionaries/{dictionary_id}/autocomplete",
+    response_model=AutocompleteResponse,
+    summary="Автодополнение по оригинальному тексту",
+    description="Подсказки записей словаря, начинающихся с введённого префикса",
+)
+async def autocomplete_entries(
+    dictionary_id: UUID,
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    service: EntryService = Depends(get_entry_service),
+) -> AutocompleteResponse:
+    suggestions = await run_db(service.autocomplete, dictionary_id, prefix, limit=limit)
+    return AutocompleteResponse(suggestions=suggestions)
+
+
+@router.get(
+    "/dictionaries/{dictionary_id}/fuzzy",
+    response_model=FuzzySearchResponse,
+    summary="Поиск с опечатками",
+    description=(
+        "Поиск записей по оригиналу и переводу с учётом опечаток: кандидаты "
+        "отбираются по триграммам и ранжируются по расстоянию Дамерау-Левенштейна"
+    ),
+)
+async def fuzzy_search_entries(
+    dictionary_id: UUID,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    max_distance: int = Query(2, ge=0, le=3),
+    service: EntryService = Depends(get_entry_service),
+) -> FuzzySearchResponse:
+    matches = await run_db(
+        service.fuzzy_search, dictionary_id, q, limit=limit, max_distance=max_distance
+    )
+    return FuzzySearchResponse(
+        matches=[FuzzyMatchResponse(**match._asdict()) for match in matches]
+    )
+
+
 @router.get(
     "/dictionaries/{dictionary_id}/entries",
     response_model=EntryListResponse,
     summary="Получить записи словаря",
-    description="Получение всех записей указанного словаря",
+    description=(
+        "Получение записей указанного словаря. Для быстрой пагинации передайте "
+        "next_cursor из предыдущего ответа в параметре cursor. Поддерживает "
+        "условные запросы (If-None-Match/If-Modified-Since) с ответом 304"
+    ),
 )
 async def get_dictionary_entries(
     dictionary_id: UUID,
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     service: EntryService = Depends(get_entry_service),
-) -> EntryListResponse:
-    entries = service.get_dictionary_entries(dictionary_id, skip=skip, limit=limit)
+) -> Response:
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    # Версия содержимого словаря меняется при любой записи в entries,
+    # поэтому 304 отдаётся без чтения самих записей
+    headers: dict[str, str] = {}
+    version = await run_db(service.get_entries_version, dictionary_id)
+    if version is not None:
+        entries_version, last_modified = version
+        headers = make_validators(last_modified, entries_version)
+        if is_not_modified(request, headers):
+            return not_modified(headers)
 
-    return EntryListResponse(
-        entries=[EntryResponse.from_domain(e) for e in entries], total=len(entries)
+    # Плоские колонки сразу в JSON: без ORM, доменных и Pydantic-моделей;
+    # форма ответа совпадает с EntryListResponse
+    rows = await run_db(
+        service.get_dictionary_entry_rows,
+        dictionary_id,
+        skip=skip,
+        limit=limit,
+        after=after,
+    )
+    total = await run_db(service.count_dictionary_entries, dictionary_id)
+
+    entries = row_objects(rows)
+    return FastJSONResponse(
+        {
+            "entries": entries,
+            "total": total,
+            "next_cursor": next_cursor(entries, limit),
+        },
+        headers=headers,
     )
 
 
@@ -72,7 +260,7 @@ async def get_dictionary_entries(
 async def get_entry(
     entry_id: UUID, service: EntryService = Depends(get_entry_service)
 ) -> EntryResponse:
-    entry = service.get_entry(entry_id)
+    entry = await run_db(service.get_entry, entry_id)
 
     if entry is None:
         raise HTTPException(
@@ -81,3 +269,70 @@ async def get_entry(
         )
 
     return EntryResponse.from_domain(entry)
+
+
+@router.post(
+    "/entries:batchGet",
+    response_model=EntryBatchGetResponse,
+    summary="Получить записи по списку ID",
+    description=(
+        "Пакетное получение записей одним запросом вместо запроса на каждую. "
+        "Записи возвращаются в порядке ID в запросе (повторы отбрасываются), "
+        "ненайденные ID перечисляются в missing"
+    ),
+)
+async def batch_get_entries(
+    batch: EntryBatchGetRequest, service: EntryService = Depends(get_entry_service)
+) -> EntryBatchGetResponse:
+    entries, missing = await run_db(service.get_entries, batch.ids)
+
+    return EntryBatchGetResponse(
+        entries=[EntryResponse.from_domain(entry) for entry in entries],
+        missing=missing,
+    )
+
+
+@router.delete(
+    "/entries/{entry_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Удалить запись",
+    description="Удаление записи по её ID",
+)
+async def delete_entry(
+    entry_id: UUID, service: EntryService = Depends(get_entry_service)
+) -> None:
+    if not await service.remove_entry(entry_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entry with id {entry_id} not found",
+        )
+
+
+@router.get(
+    "/search",
+    response_model=SearchResponse,
+    tags=["search"],
+    summary="Полнотекстовый поиск",
+    description=(
+        "Поиск по оригиналу, переводу и примеру использования (FTS5, BM25). "
+        "Последнее слово запроса ищется по префиксу"
+    ),
+)
+async def search_entries(
+    q: str = Query(..., min_length=1),
+    dictionary_id: Optional[UUID] = None,
+    limit: int = Query(20, ge=1, le=100),
+    service: EntryService = Depends(get_entry_service),
+) -> SearchResponse:
+    hits = await run_db(
+        service.search_entries, q, dictionary_id=dictionary_id, limit=limit
+    )
+
+    return SearchResponse(
+        hits=[
+            SearchHit(
+                entry=EntryResponse.from_domain(entry), score=score, snippet=snippet
+            )
+            for entry, score, snippet in hits
+        ]
+    )
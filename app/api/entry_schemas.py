@@ -53,6 +53,61 @@ class EntryResponse(BaseModel):
         )
 
 
+BATCH_GET_MAX_IDS = 5000
+
+
+class EntryBatchGetRequest(BaseModel):
+    ids: list[UUID] = Field(
+        ..., max_length=BATCH_GET_MAX_IDS, description="ID записей, до 5000"
+    )
+
+
+class EntryBatchGetResponse(BaseModel):
+    entries: list[EntryResponse]
+    missing: list[UUID]
+
+
 class EntryListResponse(BaseModel):
     entries: list[EntryResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class EntryImportError(BaseModel):
+    line: int
+    error: str
+
+
+class EntryImportResponse(BaseModel):
+    imported: int
+    duplicates: int = 0
+    failed: int
+    errors: list[EntryImportError]
+    errors_omitted: int = 0
+
+
+class SearchHit(BaseModel):
+    entry: EntryResponse
+    score: float
+    snippet: str
+
+
+class SearchResponse(BaseModel):
+    hits: list[SearchHit]
+
+
+class AutocompleteResponse(BaseModel):
+    suggestions: list[str]
+
+
+class FuzzyMatchResponse(BaseModel):
+    entry_id: UUID
+    original_text: str
+    translated_text: str
+    field: str
+    distance: int
+    score: float
+
+
+class FuzzySearchResponse(BaseModel):
+    matches: list[FuzzyMatchResponse]
@@ -0,0 +1,54 @@
+from typing import Any, Optional, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ через orjson для данных, собранных из строк БД.
+
+    Содержимое не проходит через Pydantic и response_model, поэтому
+    его форма должна совпадать со схемой ответа байт в байт.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def storage_to_iso(value: Optional[str]) -> Optional[str]:
+    # "2024-01-01 12:00:00.000000" -> "2024-01-01T12:00:00", как в EntryResponse
+    if value is None:
+        return None
+    value = value.replace(" ", "T", 1)
+    return value[:-7] if value.endswith(".000000") else value
+
+
+def storage_to_uuid(value: bytes) -> str:
+    # 16 байт BinaryUUID -> каноническая строка, вдвое дешевле str(UUID(...))
+    h = value.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def row_objects(rows: Sequence[Any]) -> list[dict]:
+    if not rows:
+        return []
+
+    # Имена колонок SQLAlchemy - подкласс str, а orjson принимает только str
+    fields = [str(name) for name in rows[0]._fields]
+    timestamps = [i for i, name in enumerate(fields) if name.endswith("_at")]
+    keys = [i for i, name in enumerate(fields) if name == "id" or name.endswith("_id")]
+    # dictionary_id на странице записей один и тот же: форматируется единожды
+    formatted: dict[bytes, str] = {}
+    objects = []
+    for row in rows:
+        values = list(row)
+        for i in timestamps:
+            values[i] = storage_to_iso(values[i])
+        for i in keys:
+            value = values[i]
+            text = formatted.get(value)
+            if text is None:
+                text = formatted[value] = storage_to_uuid(value)
+            values[i] = text
+        objects.append(dict(zip(fields, values)))
+    return objects
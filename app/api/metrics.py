@@ -0,0 +1,67 @@
+import time
+
+from fastapi import APIRouter, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure import metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["health"])
+
+
+class MetricsMiddleware:
+    """Время, статус и число SQL-запросов каждого HTTP-запроса.
+
+    Чистый ASGI без BaseHTTPMiddleware: тело ответа не буферизуется, а
+    время выгрузки считается до последнего отправленного фрагмента.
+    Маршрут в метке - шаблон пути (``/api/v1/entries/{entry_id}``),
+    запросы мимо маршрутов собираются под ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        tally = metrics.QueryTally()
+        token = metrics.request_queries.set(tally)
+        metrics.http_requests_in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.http_requests_in_progress.dec()
+            metrics.request_queries.reset(token)
+
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            metrics.http_requests.inc(*labels, str(status))
+            metrics.http_request_duration.observe(elapsed, *labels)
+            metrics.http_request_db_queries.observe(tally.count, *labels)
+            metrics.http_request_db_duration.observe(tally.seconds, *labels)
+
+
+@router.get(
+    "/metrics",
+    summary="Метрики Prometheus",
+    description=(
+        "Задержки HTTP по маршрутам, число и время SQL-запросов, "
+        "состояние пула соединений и кэшей в текстовом формате Prometheus"
+    ),
+    response_class=Response,
+)
+async def get_metrics() -> Response:
+    return Response(metrics.registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,34 @@
+import base64
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+Cursor = tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = (
+            base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except ValueError as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def next_cursor(objects: list[dict], limit: int) -> Optional[str]:
+    # Неполная страница означает, что дальше данных нет
+    if not objects or len(objects) < limit:
+        return None
+
+    last = objects[-1]
+    return encode_cursor(datetime.fromisoformat(last["created_at"]), UUID(last["id"]))
@@ -1,19 +1,35 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.infrastructure import DictionaryRepository, get_db
+from app.infrastructure import DictionaryRepository, get_db, run_db
+from app.infrastructure.writer import WriterClient, WriterUnavailableError, get_writer
 from app.services import DictionaryService
 
-from .schemas import DictionaryCreate, DictionaryListResponse, DictionaryResponse
+from .conditional import is_not_modified, make_validators, not_modified
+from .fast_json import FastJSONResponse, row_objects
+from .pagination import decode_cursor, next_cursor
+from .schemas import (
+    DictionaryCreate,
+    DictionaryListResponse,
+    DictionaryResponse,
+    DictionaryStatsResponse,
+)
+from .tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/dictionaries", tags=["dictionaries"])
+router = APIRouter(
+    prefix="/api/v1/dictionaries", tags=["dictionaries"], route_class=TracedRoute
+)
 
 
-def get_dictionary_service(db: Session = Depends(get_db)) -> DictionaryService:
+def get_dictionary_service(
+    db: Session = Depends(get_db),
+    writer: Optional[WriterClient] = Depends(get_writer),
+) -> DictionaryService:
     repository = DictionaryRepository(db)
-    return DictionaryService(repository)
+    return DictionaryService(repository, writer)
 
 
 @router.post(
@@ -28,7 +44,7 @@ async def create_dictionary(
     service: DictionaryService = Depends(get_dictionary_service),
 ) -> DictionaryResponse:
     try:
-        dictionary = service.create_dictionary(
+        dictionary = await service.add_dictionary(
             name=dictionary_data.name,
             description=dictionary_data.description,
             source_language=dictionary_data.source_language,
@@ -39,6 +55,8 @@ async def create_dictionary(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
         ) from e
+    except WriterUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -50,12 +68,26 @@ async def create_dictionary(
     "/{dictionary_id}",
     response_model=DictionaryResponse,
     summary="Получить словарь",
-    description="Получение словаря по его ID",
+    description=(
+        "Получение словаря по его ID. Поддерживает условные запросы "
+        "(If-None-Match/If-Modified-Since) с ответом 304"
+    ),
 )
 async def get_dictionary(
-    dictionary_id: UUID, service: DictionaryService = Depends(get_dictionary_service)
+    dictionary_id: UUID,
+    request: Request,
+    response: Response,
+    service: DictionaryService = Depends(get_dictionary_service),
 ) -> DictionaryResponse:
-    dictionary = service.get_dictionary(dictionary_id)
+    # Проверка If-None-Match/If-Modified-Since читает только updated_at
+    updated_at = await run_db(service.get_dictionary_updated_at, dictionary_id)
+    if updated_at is not None:
+        validators = make_validators(updated_at)
+        if is_not_modified(request, validators):
+            return not_modified(validators)
+        dictionary = await run_db(service.get_dictionary, dictionary_id)
+    else:
+        dictionary = None
 
     if dictionary is None:
         raise HTTPException(
@@ -63,23 +95,70 @@ async def get_dictionary(
             detail=f"Dictionary with id {dictionary_id} not found",
         )
 
+    response.headers.update(make_validators(dictionary.updated_at))
     return DictionaryResponse.from_domain(dictionary)
 
 
+@router.get(
+    "/{dictionary_id}/stats",
+    response_model=DictionaryStatsResponse,
+    summary="Статистика словаря",
+    description=(
+        "Число записей, доли записей с примерами и заметками, средние длины "
+        "текстов и число добавленных записей по дням и неделям (UTC). "
+        "Считается по агрегатам, без чтения записей"
+    ),
+)
+async def get_dictionary_stats(
+    dictionary_id: UUID,
+    days: int = Query(30, ge=1, le=366),
+    weeks: int = Query(12, ge=1, le=53),
+    service: DictionaryService = Depends(get_dictionary_service),
+) -> DictionaryStatsResponse:
+    stats = await run_db(service.get_dictionary_stats, dictionary_id, days, weeks)
+
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Dictionary with id {dictionary_id} not found",
+        )
+
+    return DictionaryStatsResponse.from_domain(dictionary_id, stats, days, weeks)
+
+
 @router.get(
     "/",
     response_model=DictionaryListResponse,
     summary="Получить список словарей",
-    description="Получение списка всех словарей с пагинацией",
+    description=(
+        "Получение списка всех словарей с пагинацией по skip/limit "
+        "или по курсору next_cursor"
+    ),
 )
 async def get_dictionaries(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     service: DictionaryService = Depends(get_dictionary_service),
-) -> DictionaryListResponse:
-    dictionaries = service.get_all_dictionaries(skip=skip, limit=limit)
+) -> Response:
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    # Форма ответа совпадает с DictionaryListResponse
+    rows = await run_db(
+        service.get_all_dictionary_rows, skip=skip, limit=limit, after=after
+    )
+    total = await run_db(service.count_dictionaries)
 
-    return DictionaryListResponse(
-        dictionaries=[DictionaryResponse.from_domain(d) for d in dictionaries],
-        total=len(dictionaries),
+    dictionaries = row_objects(rows)
+    return FastJSONResponse(
+        {
+            "dictionaries": dictionaries,
+            "total": total,
+            "next_cursor": next_cursor(dictionaries, limit),
+        }
     )
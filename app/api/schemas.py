@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from uuid import UUID
 
@@ -86,3 +86,48 @@ class DictionaryResponse(BaseModel):
 class DictionaryListResponse(BaseModel):
     dictionaries: list[DictionaryResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class DailyAdded(BaseModel):
+    day: date
+    count: int
+
+
+class WeeklyAdded(BaseModel):
+    week_start: date
+    count: int
+
+
+class DictionaryStatsResponse(BaseModel):
+    dictionary_id: UUID
+    entry_count: int
+    with_example_share: float = Field(description="Доля записей с примером")
+    with_notes_share: float = Field(description="Доля записей с заметками")
+    average_original_length: float
+    average_translated_length: float
+    added_per_day: list[DailyAdded]
+    added_per_week: list[WeeklyAdded] = Field(
+        description="Недели с понедельника; последняя - текущая"
+    )
+
+    @classmethod
+    def from_domain(
+        cls, dictionary_id, stats, days: int, weeks: int
+    ) -> "DictionaryStatsResponse":
+        return cls(
+            dictionary_id=dictionary_id,
+            entry_count=stats.entry_count,
+            with_example_share=stats.with_example_share,
+            with_notes_share=stats.with_notes_share,
+            average_original_length=stats.average_original_length,
+            average_translated_length=stats.average_translated_length,
+            added_per_day=[
+                DailyAdded(day=day, count=count)
+                for day, count in stats.added_per_day(days)
+            ],
+            added_per_week=[
+                WeeklyAdded(week_start=start, count=count)
+                for start, count in stats.added_per_week(weeks)
+            ],
+        )
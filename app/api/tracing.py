@@ -0,0 +1,72 @@
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure import tracing
+
+
+class TracingMiddleware:
+    """Корневой span запроса, решение о сэмплировании и заголовок X-Trace-Id.
+
+    Имя корня - метод и шаблон маршрута, известный после маршрутизации;
+    фактический путь сохраняется в атрибуте ``path``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = tracing.tracer
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root = tracer.start_trace(f"{method} {scope['path']}", path=scope["path"])
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        trace_header = (b"x-trace-id", root.trace.trace_id.encode())
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["status"] = message["status"]
+                message["headers"] = [*message.get("headers", []), trace_header]
+            await send(message)
+
+        token = tracing.current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        except BaseException as e:
+            root.attributes["error"] = repr(e)
+            raise
+        finally:
+            tracing.current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{method} {route.path}"
+            tracer.finish(root)
+
+
+class TracedRoute(APIRoute):
+    """Маршрут с двумя span: обработчик целиком и сама функция эндпоинта.
+
+    Разница между ними - разбор запроса, валидация Pydantic, зависимости
+    и сериализация ответа.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, tracing.traced(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        name = f"route {self.name}"
+
+        async def traced_handler(request: Request) -> Response:
+            with tracing.span(name):
+                return await handler(request)
+
+        return traced_handler
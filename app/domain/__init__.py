@@ -1,4 +1,11 @@
 from .dictionary import Dictionary
-from .entry import Entry
+from .entry import DuplicateEntryError, Entry, normalize_key
+from .statistics import DictionaryStats
 
-__all__ = ["Dictionary", "Entry"]
+__all__ = [
+    "Dictionary",
+    "Entry",
+    "DictionaryStats",
+    "DuplicateEntryError",
+    "normalize_key",
+]
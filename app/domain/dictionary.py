@@ -1,9 +1,25 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID, uuid4
 
+from .fields import stored_datetime, stored_uuid
+
 
 class Dictionary:
+    __slots__ = (
+        "_id",
+        "name",
+        "description",
+        "source_language",
+        "target_language",
+        "_created_at",
+        "_updated_at",
+    )
+
+    id = stored_uuid()
+    created_at = stored_datetime()
+    updated_at = stored_datetime()
+
     def __init__(
         self,
         name: str,
@@ -22,6 +38,28 @@ class Dictionary:
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
 
+    @classmethod
+    def from_storage(
+        cls,
+        id: Union[UUID, bytes, str],
+        name: str,
+        description: Optional[str],
+        source_language: str,
+        target_language: str,
+        created_at: Union[datetime, str],
+        updated_at: Union[datetime, str],
+    ) -> "Dictionary":
+        # Как Entry.from_storage: доверенная строка БД, разбор при чтении
+        dictionary = cls.__new__(cls)
+        dictionary._id = id
+        dictionary.name = name
+        dictionary.description = description
+        dictionary.source_language = source_language
+        dictionary.target_language = target_language
+        dictionary._created_at = created_at
+        dictionary._updated_at = updated_at
+        return dictionary
+
     @staticmethod
     def _validate_name(name: str) -> str:
         if not name or not name.strip():
@@ -34,21 +72,42 @@ class Dictionary:
             raise ValueError("Language code must be at least 2 characters")
         return language.lower()
 
-    def update(
-        self,
+    @classmethod
+    def validate_changes(
+        cls,
         name: Optional[str] = None,
         description: Optional[str] = None,
         source_language: Optional[str] = None,
         target_language: Optional[str] = None,
-    ) -> None:
+    ) -> dict[str, str]:
+        # Проверенные значения только переданных полей: частичное изменение
+        # проверяется без загрузки словаря
+        changes = {}
         if name is not None:
-            self.name = self._validate_name(name)
+            changes["name"] = cls._validate_name(name)
         if description is not None:
-            self.description = description
+            changes["description"] = description
         if source_language is not None:
-            self.source_language = self._validate_language(source_language)
+            changes["source_language"] = cls._validate_language(source_language)
         if target_language is not None:
-            self.target_language = self._validate_language(target_language)
+            changes["target_language"] = cls._validate_language(target_language)
+        return changes
+
+    def update(
+        self,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        source_language: Optional[str] = None,
+        target_language: Optional[str] = None,
+    ) -> None:
+        changes = self.validate_changes(
+            name=name,
+            description=description,
+            source_language=source_language,
+            target_language=target_language,
+        )
+        for field, value in changes.items():
+            setattr(self, field, value)
         self.updated_at = datetime.utcnow()
 
     def __repr__(self) -> str:
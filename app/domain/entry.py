@@ -1,9 +1,40 @@
+import unicodedata
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID, uuid4
 
+from .fields import stored_datetime, stored_uuid
+
+
+class DuplicateEntryError(ValueError):
+    pass
+
+
+def normalize_key(text: str) -> str:
+    # Ключ дедупликации original_text: без различий регистра,
+    # формы Unicode и пробелов
+    folded = unicodedata.normalize("NFC", text).casefold()
+    return unicodedata.normalize("NFC", " ".join(folded.split()))
+
 
 class Entry:
+    # Без __dict__: в памяти держатся большие списки записей словаря
+    __slots__ = (
+        "_id",
+        "_dictionary_id",
+        "original_text",
+        "translated_text",
+        "usage_example",
+        "notes",
+        "_created_at",
+        "_updated_at",
+    )
+
+    id = stored_uuid()
+    dictionary_id = stored_uuid()
+    created_at = stored_datetime()
+    updated_at = stored_datetime()
+
     def __init__(
         self,
         dictionary_id: UUID,
@@ -24,6 +55,35 @@ class Entry:
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
 
+    @classmethod
+    def from_storage(
+        cls,
+        id: Union[UUID, bytes, str],
+        dictionary_id: Union[UUID, bytes, str],
+        original_text: str,
+        translated_text: str,
+        usage_example: Optional[str],
+        notes: Optional[str],
+        created_at: Union[datetime, str],
+        updated_at: Union[datetime, str],
+    ) -> "Entry":
+        # Строка из БД уже прошла валидацию при записи: без проверок
+        # и значений по умолчанию, UUID и даты разбираются при чтении
+        entry = cls.__new__(cls)
+        entry._id = id
+        entry._dictionary_id = dictionary_id
+        entry.original_text = original_text
+        entry.translated_text = translated_text
+        entry.usage_example = usage_example
+        entry.notes = notes
+        entry._created_at = created_at
+        entry._updated_at = created_at if updated_at == created_at else updated_at
+        return entry
+
+    @property
+    def normalized_key(self) -> str:
+        return normalize_key(self.original_text)
+
     @staticmethod
     def _validate_text(text: str, field_name: str) -> str:
         if not text or not text.strip():
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any, Callable, Generic, Optional, TypeVar, Union, overload
+from uuid import UUID
+
+T = TypeVar("T")
+
+
+class StoredField(Generic[T]):
+    """Поле, которое разбирается из формата хранения при первом чтении.
+
+    Значение лежит в слоте ``_<имя>``: значение из БД (UUID в байтах,
+    дата строкой в формате SQLite) превращается в объект только при
+    первом обращении и подменяет собой исходное. Уже разобранные
+    значения хранятся как есть.
+    """
+
+    def __init__(self, parse: Callable[[Any], T], stored_types: tuple[type, ...]):
+        self.parse = parse
+        self.stored_types = stored_types
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        # Дескриптор слота __slots__, созданный для класса-владельца
+        self.slot = getattr(owner, "_" + name)
+
+    @overload
+    def __get__(self, instance: None, owner: Optional[type] = None) -> "StoredField[T]":
+        ...
+
+    @overload
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> T:
+        ...
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.slot.__get__(instance, owner)
+        if isinstance(value, self.stored_types):
+            value = self.parse(value)
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance: Any, value: T) -> None:
+        self.slot.__set__(instance, value)
+
+
+def _parse_uuid(value: Union[bytes, str]) -> UUID:
+    return UUID(bytes=value) if isinstance(value, bytes) else UUID(value)
+
+
+def stored_uuid() -> StoredField[UUID]:
+    return StoredField(_parse_uuid, (bytes, str))
+
+
+def stored_datetime() -> StoredField[datetime]:
+    # Формат SQLAlchemy для DateTime в SQLite: "YYYY-MM-DD HH:MM:SS[.ffffff]"
+    return StoredField(datetime.fromisoformat, (str,))
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+
+@dataclass
+class DictionaryStats:
+    """Статистика словаря на дату ``as_of``.
+
+    Счётчики и суммы длин берутся из агрегатов как есть; доли и средние
+    считаются от ``entry_count``. ``added_by_day`` содержит только дни
+    с записями из запрошенного окна.
+    """
+
+    as_of: date
+    entry_count: int = 0
+    with_example: int = 0
+    with_notes: int = 0
+    original_length: int = 0
+    translated_length: int = 0
+    added_by_day: dict[date, int] = field(default_factory=dict)
+
+    def _per_entry(self, total: int) -> float:
+        return total / self.entry_count if self.entry_count else 0.0
+
+    @property
+    def with_example_share(self) -> float:
+        return self._per_entry(self.with_example)
+
+    @property
+    def with_notes_share(self) -> float:
+        return self._per_entry(self.with_notes)
+
+    @property
+    def average_original_length(self) -> float:
+        return self._per_entry(self.original_length)
+
+    @property
+    def average_translated_length(self) -> float:
+        return self._per_entry(self.translated_length)
+
+    def added_per_day(self, days: int) -> list[tuple[date, int]]:
+        first = self.as_of - timedelta(days=days - 1)
+        return [
+            (day, self.added_by_day.get(day, 0))
+            for day in (first + timedelta(days=i) for i in range(days))
+        ]
+
+    def added_per_week(self, weeks: int) -> list[tuple[date, int]]:
+        # Недели с понедельника; последняя - текущая, неполная
+        first = week_start(self.as_of) - timedelta(weeks=weeks - 1)
+        totals = {first + timedelta(weeks=i): 0 for i in range(weeks)}
+        for day, added in self.added_by_day.items():
+            start = week_start(day)
+            if start in totals:
+                totals[start] += added
+        return list(totals.items())
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
@@ -1,5 +1,7 @@
+from . import fulltext  # noqa: F401  (регистрирует DDL для FTS5)
 from .database import Base, SessionLocal, engine, get_db
 from .entry_repository import EntryRepository
+from .executor import iterate_db, run_db
 from .models import DictionaryORM, EntryORM
 from .repository import DictionaryRepository
 
@@ -12,4 +14,6 @@ __all__ = [
     "EntryORM",
     "DictionaryRepository",
     "EntryRepository",
+    "run_db",
+    "iterate_db",
 ]
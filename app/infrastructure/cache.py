@@ -0,0 +1,313 @@
+import copy
+import math
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator, Optional, Protocol, Sequence, TypeVar
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+
+MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CacheBackend(Protocol):
+    stats: CacheStats
+
+    def version(self) -> int:
+        ...
+
+    def get(self, key: str) -> Any:
+        ...
+
+    def get_many(self, keys: Sequence[str]) -> list[Any]:
+        ...
+
+    def peek_many(self, keys: Sequence[str]) -> list[Any]:
+        # Как get_many, но без учёта в статистике и без продления LRU:
+        # для служебных ключей, которые проверяются при каждом чтении
+        ...
+
+    def set(self, key: str, value: Any, version: Optional[int] = None) -> None:
+        ...
+
+    def delete(self, *keys: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class LRUCache:
+    """LRU-кэш в памяти процесса с ограничением числа ключей и TTL.
+
+    Номер версии растёт при каждой инвалидации: значение, прочитанное
+    из БД до конкурентной записи, не попадёт в кэш после неё.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.stats.misses += 1
+                return MISSING
+
+            expires_at, value = item
+            if expires_at <= self._clock():
+                del self._items[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return MISSING
+
+            self._items.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def get_many(self, keys: Sequence[str]) -> list[Any]:
+        return [self.get(key) for key in keys]
+
+    def peek_many(self, keys: Sequence[str]) -> list[Any]:
+        now = self._clock()
+        values = []
+        with self._lock:
+            for key in keys:
+                item = self._items.get(key)
+                values.append(MISSING if item is None or item[0] <= now else item[1])
+        return values
+
+    def set(self, key: str, value: Any, version: Optional[int] = None) -> None:
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._items[key] = (self._clock() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if self._items.pop(key, None) is not None:
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._items.clear()
+
+
+class KeyValueClient(Protocol):
+    # Подмножество интерфейса redis.Redis
+    def get(self, name: str) -> Optional[bytes]:
+        ...
+
+    def mget(self, names: Sequence[str]) -> list[Optional[bytes]]:
+        ...
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> Any:
+        ...
+
+    def delete(self, *names: str) -> int:
+        ...
+
+    def scan_iter(self, match: Optional[str] = None) -> Iterator[Any]:
+        ...
+
+
+class SharedCache:
+    """Кэш во внешнем хранилище (Redis), общий для всех воркеров.
+
+    Вытеснение и TTL обеспечивает хранилище. Запись в любом воркере
+    удаляет общий ключ, поэтому остальные воркеры увидят изменение
+    при следующем чтении; гонку чтения с записью ограничивает TTL.
+    """
+
+    def __init__(
+        self,
+        client: KeyValueClient,
+        ttl: float = CACHE_TTL_SECONDS,
+        prefix: str = "dictionary-library:",
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def version(self) -> int:
+        return 0
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return MISSING
+        self.stats.hits += 1
+        return pickle.loads(raw)
+
+    def get_many(self, keys: Sequence[str]) -> list[Any]:
+        # Один MGET вместо обращения к хранилищу на каждый ключ
+        if not keys:
+            return []
+        values = []
+        for raw in self.client.mget([self.prefix + key for key in keys]):
+            if raw is None:
+                self.stats.misses += 1
+                values.append(MISSING)
+            else:
+                self.stats.hits += 1
+                values.append(pickle.loads(raw))
+        return values
+
+    def peek_many(self, keys: Sequence[str]) -> list[Any]:
+        if not keys:
+            return []
+        return [
+            MISSING if raw is None else pickle.loads(raw)
+            for raw in self.client.mget([self.prefix + key for key in keys])
+        ]
+
+    def set(self, key: str, value: Any, version: Optional[int] = None) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=math.ceil(self.ttl))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.stats.invalidations += self.client.delete(
+                *(self.prefix + key for key in keys)
+            )
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class InMemoryKeyValueStore:
+    """Заменитель Redis в памяти процесса для тестов SharedCache."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: dict[str, tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(name)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[name]
+                return None
+            return value
+
+    def mget(self, names: Sequence[str]) -> list[Optional[bytes]]:
+        return [self.get(name) for name in names]
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            expires_at = self._clock() + ex if ex is not None else None
+            self._data[name] = (expires_at, value)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: Optional[str] = None) -> Iterator[str]:
+        prefix = (match or "*").rstrip("*")
+        with self._lock:
+            names = [name for name in self._data if name.startswith(prefix)]
+        return iter(names)
+
+
+def read_through(
+    cache: CacheBackend, key: str, load: Callable[[], Optional[T]]
+) -> Optional[T]:
+    # Доменные объекты изменяемы: наружу всегда отдаётся копия,
+    # чтобы правка объекта вызывающим кодом не портила кэш
+    value = cache.get(key)
+    if value is not MISSING:
+        return copy.copy(value)
+
+    version = cache.version()
+    value = load()
+    # Отсутствие не кэшируется: новые записи видны сразу
+    if value is not None:
+        cache.set(key, copy.copy(value), version)
+    return value
+
+
+def read_through_many(
+    cache: CacheBackend,
+    ids: Sequence[K],
+    key: Callable[[K], str],
+    load: Callable[[list[K]], dict[K, T]],
+) -> dict[K, T]:
+    # Пакетный вариант read_through: из БД читаются только промахи
+    found: dict[K, T] = {}
+    misses: list[K] = []
+    for item_id, value in zip(ids, cache.get_many([key(i) for i in ids])):
+        if value is MISSING:
+            misses.append(item_id)
+        else:
+            found[item_id] = copy.copy(value)
+
+    if misses:
+        version = cache.version()
+        loaded = load(misses)
+        for item_id, value in loaded.items():
+            cache.set(key(item_id), copy.copy(value), version)
+        found.update(loaded)
+    return found
+
+
+def create_entity_cache() -> CacheBackend:
+    if CACHE_REDIS_URL:
+        import redis  # опциональная зависимость для нескольких воркеров
+
+        return SharedCache(redis.Redis.from_url(CACHE_REDIS_URL))
+    return LRUCache()
+
+
+entity_cache = create_entity_cache()
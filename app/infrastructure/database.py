@@ -1,12 +1,50 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import os
+import time
+from typing import Optional
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./dictionary_library.db"
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+from .executor import DB_EXECUTOR_WORKERS
+from .storage import SQLiteProfile, install_profile, load_profile
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dictionary_library.db")
+# Сессия держит соединение до конца запроса, а запросов в полёте
+# бывает больше, чем потоков БД. Одновременную работу с базой
+# ограничивает пул потоков, поэтому лимит соединений по умолчанию не нужен:
+# иначе потоки ждали бы соединений, занятых ожидающими запросами
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(DB_EXECUTOR_WORKERS)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "-1"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_ECHO = os.getenv("DB_ECHO", "0") == "1"
+
+
+def create_db_engine(
+    url: str = SQLALCHEMY_DATABASE_URL,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    echo: bool = DB_ECHO,
+    profile: Optional[SQLiteProfile] = None,
+) -> Engine:
+    # Соединение открывается при первом запросе, а не здесь:
+    # импорт модуля базу не трогает
+    is_sqlite = url.startswith("sqlite")
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        echo=echo,
+    )
+    if is_sqlite:
+        install_profile(engine, profile if profile is not None else load_profile())
+    return engine
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -19,3 +57,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def ping(db: Session) -> float:
+    # Время круга до БД в секундах; ошибка соединения пробрасывается
+    started = time.perf_counter()
+    db.execute(text("SELECT 1"))
+    return time.perf_counter() - started
@@ -1,26 +1,360 @@
-from typing import Optional
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Iterable, Iterator, Literal, Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.domain import Entry
+from app.domain import DuplicateEntryError, Entry
 
-from .models import EntryORM
+from . import cache, text_indexes
+from .cache import MISSING, CacheBackend, read_through, read_through_many
+from .fulltext import FTS_COLUMNS, FTS_TABLE, build_match_query
+from .models import DictionaryORM, EntryORM
+from .repository import (
+    deleted_dictionary_key,
+    entry_key,
+    keyset_position,
+    storage_columns,
+)
+from .statistics import StatsRow, adjust_entry_stats, subtract_entry_totals
+from .text_indexes import DictionaryIndexCache, FuzzyMatch, PrefixIndex, TrigramIndex
+from .tracing import trace_methods, traced
 
+_ROW_COLUMNS = (
+    "id",
+    "dictionary_id",
+    "original_text",
+    "translated_text",
+    "usage_example",
+    "notes",
+    "created_at",
+    "updated_at",
+)
+_INSERT_COLUMNS = (*_ROW_COLUMNS, "normalized_key")
+IN_CHUNK_SIZE = 500
+_INSERT_ROWS_SQL = (
+    f"INSERT INTO {EntryORM.__tablename__} ({', '.join(_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_INSERT_COLUMNS))})"
+)
 
+# Слияние с существующей записью: перевод из новой, пример и заметки -
+# если в новой они непустые; original_text и created_at не меняются
+_MERGE_SQL = (
+    "DO UPDATE SET translated_text = excluded.translated_text, "
+    "usage_example = coalesce(nullif(excluded.usage_example, ''), usage_example), "
+    "notes = coalesce(nullif(excluded.notes, ''), notes), "
+    "updated_at = excluded.updated_at"
+)
+
+
+@lru_cache(maxsize=32)
+def _upsert_sql(rows: int, merge: bool) -> str:
+    # Многострочный INSERT ... ON CONFLICT строкой для драйвера: компиляция
+    # такого выражения в SQLAlchemy дороже самой вставки
+    values = ", ".join([f"({', '.join('?' * len(_INSERT_COLUMNS))})"] * rows)
+    return (
+        f"INSERT INTO {EntryORM.__tablename__} ({', '.join(_INSERT_COLUMNS)}) "
+        f"VALUES {values} ON CONFLICT (dictionary_id, normalized_key) "
+        f"{_MERGE_SQL if merge else 'DO NOTHING'} "
+        f"RETURNING {', '.join(_ROW_COLUMNS)}"
+    )
+
+
+# Что делать с записью, чей нормализованный original_text уже есть в словаре:
+# ошибка, пропуск или слияние с существующей записью
+OnDuplicate = Literal["error", "skip", "merge"]
+
+
+@trace_methods
 class EntryRepository:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        prefix_indexes: Optional[DictionaryIndexCache[PrefixIndex]] = None,
+        trigram_indexes: Optional[DictionaryIndexCache[TrigramIndex]] = None,
+        entity_cache: Optional[CacheBackend] = None,
+    ):
         self.db = db
+        self.cache = entity_cache if entity_cache is not None else cache.entity_cache
+        self.prefix_indexes = (
+            prefix_indexes
+            if prefix_indexes is not None
+            else text_indexes.prefix_indexes
+        )
+        self.trigram_indexes = (
+            trigram_indexes
+            if trigram_indexes is not None
+            else text_indexes.trigram_indexes
+        )
 
     def create(self, entry: Entry) -> Entry:
-        db_entry = self._to_orm(entry)
-        self.db.add(db_entry)
+        # Один INSERT без refresh: строка целиком берётся из доменного объекта;
+        # дубликат отсекает уникальный индекс, без предварительного SELECT
+        try:
+            self.db.connection().exec_driver_sql(
+                _INSERT_ROWS_SQL, self._to_row(entry, entry.dictionary_id.bytes)
+            )
+            self._adjust_entry_count(entry.dictionary_id, 1)
+            adjust_entry_stats(
+                self.db, entry.dictionary_id, [self._stats_row(entry)], 1
+            )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise self._insert_error(e, [entry]) from e
+
+        self.cache.delete(entry_key(entry.id))
+        self._index_added(entry.dictionary_id, [entry])
+        return entry
+
+    def bulk_create(
+        self, entries: list[Entry], on_duplicate: OnDuplicate = "error"
+    ) -> int:
+        # Возвращает число новых строк. В режимах skip и merge дубликаты
+        # разрешаются в самом INSERT ... ON CONFLICT: при skip остаётся
+        # существующая запись, при merge она получает перевод и непустые
+        # пример и заметки из новой
+        return len(self._bulk_write(entries, on_duplicate))
+
+    def insert_new(self, entries: list[Entry]) -> list[Entry]:
+        # Вставляет записи, которых ещё нет в словаре, и возвращает их:
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING, дубликаты (в том числе
+        # повторы внутри пачки) не прерывают вставку остальных
+        return self._bulk_write(entries, "skip")
+
+    def _bulk_write(
+        self, entries: list[Entry], on_duplicate: OnDuplicate
+    ) -> list[Entry]:
+        if not entries:
+            return []
+
+        try:
+            if on_duplicate == "error":
+                # executemany напрямую в драйвер: без ORM-объектов, refresh
+                # и покомпонентной обработки параметров SQLAlchemy
+                dictionary_keys = {
+                    e.dictionary_id: e.dictionary_id.bytes for e in entries
+                }
+                self.db.connection().exec_driver_sql(
+                    _INSERT_ROWS_SQL,
+                    [
+                        self._to_row(e, dictionary_keys[e.dictionary_id])
+                        for e in entries
+                    ],
+                )
+                inserted, merged = entries, []
+            else:
+                inserted, merged = self._upsert(entries, on_duplicate == "merge")
+
+            inserted_groups, merged_groups = _group(inserted), _group(merged)
+            for dictionary_id in inserted_groups.keys() | merged_groups.keys():
+                group = inserted_groups.get(dictionary_id, [])
+                self._adjust_entry_count(dictionary_id, len(group))
+                adjust_entry_stats(
+                    self.db, dictionary_id, map(self._stats_row, group), 1
+                )
+                adjust_entry_stats(
+                    self.db,
+                    dictionary_id,
+                    map(self._stats_row, merged_groups.get(dictionary_id, [])),
+                    1,
+                    count_days=False,
+                )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise self._insert_error(e, entries) from e
+
+        self.cache.delete(*(entry_key(entry.id) for entry in (*inserted, *merged)))
+
+        for dictionary_id, group in inserted_groups.items():
+            self._index_added(dictionary_id, group)
+        for entry in merged:
+            self._index_merged(entry)
+        return list(inserted)
+
+    @traced
+    def _upsert(
+        self, entries: list[Entry], merge: bool
+    ) -> tuple[list[Entry], list[Entry]]:
+        # Повторы внутри пачки схлопываются заранее: в одном INSERT
+        # ключ встречается один раз
+        unique: dict[tuple[UUID, str], Entry] = {}
+        for entry in entries:
+            key = (entry.dictionary_id, entry.normalized_key)
+            first = unique.setdefault(key, entry)
+            if merge and first is not entry:
+                unique[key] = self._merged(first, entry)
+
+        pending = list(unique.values())
+        inserted: list[Entry] = []
+        merged: list[Entry] = []
+        connection = self.db.connection()
+        for start in range(0, len(pending), IN_CHUNK_SIZE):
+            chunk = pending[start : start + IN_CHUNK_SIZE]
+            if merge:
+                # До перезаписи из статистики вычитается вклад старых строк
+                for dictionary_id, group in _group(chunk).items():
+                    subtract_entry_totals(
+                        self.db, dictionary_id, [e.normalized_key for e in group]
+                    )
+
+            # RETURNING отдаёт и вставленные, и обновлённые строки в формате
+            # хранения; вставленные узнаются по собственному id
+            submitted = {entry.id.bytes: entry for entry in chunk}
+            result = connection.exec_driver_sql(
+                _upsert_sql(len(chunk), merge),
+                tuple(
+                    value
+                    for entry in chunk
+                    for value in self._to_row(entry, entry.dictionary_id.bytes)
+                ),
+            )
+            for row in result:
+                entry = submitted.get(row[0])
+                if entry is not None:
+                    inserted.append(entry)
+                else:
+                    merged.append(Entry.from_storage(*row))
+        return inserted, merged
+
+    def delete(self, entry_id: UUID) -> bool:
+        deleted = self.db.execute(
+            delete(EntryORM)
+            .where(EntryORM.id == entry_id)
+            .returning(
+                EntryORM.dictionary_id,
+                EntryORM.original_text,
+                EntryORM.translated_text,
+                EntryORM.usage_example,
+                EntryORM.notes,
+                EntryORM.created_at,
+            )
+        ).all()
+
+        for dictionary_id, *stats_row in deleted:
+            self._adjust_entry_count(dictionary_id, -1)
+            adjust_entry_stats(self.db, dictionary_id, [tuple(stats_row)], -1)
+
         self.db.commit()
-        self.db.refresh(db_entry)
-        return self._to_domain(db_entry)
+        self.cache.delete(entry_key(entry_id))
+        for dictionary_id, original_text, *_ in deleted:
+            self.prefix_indexes.apply(
+                dictionary_id, partial(_remove_prefix, original_text)
+            )
+            self.trigram_indexes.apply(dictionary_id, partial(_remove_row, entry_id))
+        return len(deleted) > 0
+
+    def autocomplete(
+        self, dictionary_id: UUID, prefix: str, limit: int = 10
+    ) -> list[str]:
+        return self.prefix_indexes.read(
+            dictionary_id,
+            lambda: PrefixIndex(self._original_texts(dictionary_id)),
+            lambda index: index.complete(prefix, limit),
+        )
+
+    def fuzzy_search(
+        self, dictionary_id: UUID, query: str, limit: int = 10, max_distance: int = 2
+    ) -> list[FuzzyMatch]:
+        return self.trigram_indexes.read(
+            dictionary_id,
+            lambda: TrigramIndex(self._index_rows(dictionary_id)),
+            lambda index: index.search(query, limit=limit, max_distance=max_distance),
+        )
+
+    def dictionary_exists(self, dictionary_id: UUID) -> bool:
+        found = (
+            self.db.query(DictionaryORM.id)
+            .filter(DictionaryORM.id == dictionary_id)
+            .first()
+        )
+        return found is not None
+
+    def count_by_dictionary(self, dictionary_id: UUID) -> int:
+        count = (
+            self.db.query(DictionaryORM.entry_count)
+            .filter(DictionaryORM.id == dictionary_id)
+            .scalar()
+        )
+        return count or 0
+
+    def get_entries_version(
+        self, dictionary_id: UUID
+    ) -> Optional[tuple[int, datetime]]:
+        # Одна строка по первичному ключу, без чтения самих записей
+        row = (
+            self.db.query(
+                DictionaryORM.entries_version,
+                func.coalesce(
+                    DictionaryORM.entries_updated_at, DictionaryORM.created_at
+                ),
+            )
+            .filter(DictionaryORM.id == dictionary_id)
+            .first()
+        )
+        return None if row is None else (row[0], row[1])
 
     def get_by_id(self, entry_id: UUID) -> Optional[Entry]:
-        db_entry = self.db.query(EntryORM).filter(EntryORM.id == str(entry_id)).first()
+        entry = read_through(
+            self.cache, entry_key(entry_id), lambda: self._load(entry_id)
+        )
+        if entry is None or self._deleted_dictionaries([entry]):
+            return None
+        return entry
+
+    def get_by_ids(self, entry_ids: Sequence[UUID]) -> dict[UUID, Entry]:
+        found = read_through_many(self.cache, entry_ids, entry_key, self._load_many)
+        deleted = self._deleted_dictionaries(found.values())
+        if deleted:
+            found = {
+                entry_id: entry
+                for entry_id, entry in found.items()
+                if entry.dictionary_id not in deleted
+            }
+        return found
+
+    def _deleted_dictionaries(self, entries: Iterable[Entry]) -> set[UUID]:
+        # Словари с меткой удаления: записи из них могли остаться в кэше
+        dictionary_ids = list({entry.dictionary_id for entry in entries})
+        # Проверка не учитывается в статистике: иначе каждое попадание
+        # в кэш записи считалось бы ещё и промахом по метке
+        marks = self.cache.peek_many(
+            [deleted_dictionary_key(d) for d in dictionary_ids]
+        )
+        return {d for d, mark in zip(dictionary_ids, marks) if mark is not MISSING}
+
+    @traced
+    def _load_many(self, entry_ids: list[UUID]) -> dict[UUID, Entry]:
+        # Порциями, чтобы не упереться в лимит параметров SQLite
+        table = EntryORM.__table__
+        query = select(*storage_columns(table, _ROW_COLUMNS))
+        found: dict[UUID, Entry] = {}
+        for start in range(0, len(entry_ids), IN_CHUNK_SIZE):
+            chunk = entry_ids[start : start + IN_CHUNK_SIZE]
+            for row in self.db.execute(query.where(table.c.id.in_(chunk))):
+                entry = Entry.from_storage(*row)
+                found[entry.id] = entry
+        return found
+
+    @traced
+    def _load(self, entry_id: UUID) -> Optional[Entry]:
+        db_entry = self.db.query(EntryORM).filter(EntryORM.id == entry_id).first()
 
         if db_entry is None:
             return None
@@ -28,42 +362,259 @@ class EntryRepository:
         return self._to_domain(db_entry)
 
     def get_by_dictionary(
-        self, dictionary_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        dictionary_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[Entry]:
+        # Доверенные строки БД: без ORM, валидации и разбора дат; один
+        # объект dictionary_id на всю страницу
+        return [
+            Entry.from_storage(entry_id, dictionary_id, *values)
+            for entry_id, _, *values in self.get_rows_by_dictionary(
+                dictionary_id, skip, limit, after
+            )
+        ]
+
+    def get_rows_by_dictionary(
+        self,
+        dictionary_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> Sequence[Row]:
+        # Страница записей словаря плоскими колонками:
+        # без ORM identity map, доменных объектов и парсинга дат
+        table = EntryORM.__table__
+        query = (
+            select(*storage_columns(table, _ROW_COLUMNS))
+            .where(table.c.dictionary_id == dictionary_id)
+            .order_by(table.c.created_at, table.c.id)
+        )
+
+        if after is not None:
+            created_at, entry_id = after
+            query = query.where(
+                tuple_(table.c.created_at, table.c.id)
+                > keyset_position(created_at, entry_id)
+            )
+        else:
+            query = query.offset(skip)
+
+        return self.db.execute(query.limit(limit)).all()
+
+    def iter_rows(
+        self, dictionary_id: UUID, batch_size: int = 1000
+    ) -> Iterator[Sequence[Row]]:
+        # Сырые значения колонок без ORM identity map и парсинга дат;
+        # вся выгрузка читается одним курсором, т.е. из одного снимка БД
+        table = EntryORM.__table__
+        result = self.db.execute(
+            select(*storage_columns(table, _ROW_COLUMNS))
+            .where(table.c.dictionary_id == dictionary_id)
+            .order_by(table.c.created_at, table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for partition in result.partitions():
+                yield partition
+        finally:
+            result.close()
+            self.db.rollback()
+
+    def search(
+        self, query: str, dictionary_id: Optional[UUID] = None, limit: int = 20
+    ) -> list[tuple[Entry, float, str]]:
+        match = build_match_query(query, dictionary_id)
+        if not match:
+            return []
+
+        # ORDER BY rank LIMIT внутри FTS5: сниппеты строятся только для top-N
+        snippets = ", ".join(
+            f"snippet({FTS_TABLE}, {i}, '<mark>', '</mark>', '…', 12) AS s{i}"
+            for i in range(len(FTS_COLUMNS))
+        )
+        hits = (
+            text(
+                f"SELECT rowid, rank, {snippets} FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH :match ORDER BY rank LIMIT :limit"
+            )
+            .columns(
+                column("rowid", Integer),
+                column("rank", Float),
+                *(column(f"s{i}", String) for i in range(len(FTS_COLUMNS))),
+            )
+            .subquery("hits")
+        )
+        rows = (
+            self.db.query(EntryORM, hits)
+            .join(hits, hits.c.rowid == literal_column("entries.rowid"))
+            .order_by(hits.c.rank)
+            .params(match=match, limit=limit)
+            .all()
+        )
+
+        results = []
+        for db_entry, _, rank, *column_snippets in rows:
+            snippet = next(
+                (s for s in column_snippets if s and "<mark>" in s),
+                column_snippets[0],
+            )
+            results.append((self._to_domain(db_entry), -rank, snippet))
+        return results
+
+    def get_by_original_text(
+        self, dictionary_id: UUID, original_text: str
     ) -> list[Entry]:
         db_entries = (
             self.db.query(EntryORM)
-            .filter(EntryORM.dictionary_id == str(dictionary_id))
-            .offset(skip)
-            .limit(limit)
+            .filter(
+                EntryORM.dictionary_id == dictionary_id,
+                EntryORM.original_text == original_text.strip(),
+            )
             .all()
         )
 
         return [self._to_domain(db_entry) for db_entry in db_entries]
 
+    def _original_texts(self, dictionary_id: UUID) -> list[str]:
+        # Читается только покрывающий индекс (dictionary_id, original_text)
+        rows = self.db.query(EntryORM.original_text).filter(
+            EntryORM.dictionary_id == dictionary_id
+        )
+        return [original_text for (original_text,) in rows]
+
+    def _index_rows(self, dictionary_id: UUID) -> list[tuple[UUID, str, str]]:
+        rows = self.db.query(
+            EntryORM.id, EntryORM.original_text, EntryORM.translated_text
+        ).filter(EntryORM.dictionary_id == dictionary_id)
+        return [tuple(row) for row in rows]
+
+    def _index_added(self, dictionary_id: UUID, entries: list[Entry]) -> None:
+        self.prefix_indexes.apply(
+            dictionary_id,
+            partial(_add_prefixes, [entry.original_text for entry in entries]),
+        )
+        self.trigram_indexes.apply(
+            dictionary_id,
+            partial(
+                _add_rows,
+                [(e.id, e.original_text, e.translated_text) for e in entries],
+            ),
+        )
+
+    def _index_merged(self, entry: Entry) -> None:
+        # original_text при слиянии не меняется, перевод - может
+        self.trigram_indexes.apply(
+            entry.dictionary_id,
+            partial(
+                _replace_row, (entry.id, entry.original_text, entry.translated_text)
+            ),
+        )
+
+    def _adjust_entry_count(self, dictionary_id, delta: int) -> None:
+        self.db.query(DictionaryORM).filter(DictionaryORM.id == dictionary_id).update(
+            {
+                DictionaryORM.entry_count: DictionaryORM.entry_count + delta,
+                DictionaryORM.entries_version: DictionaryORM.entries_version + 1,
+                DictionaryORM.entries_updated_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+
     @staticmethod
+    @traced
     def _to_domain(orm_model: EntryORM) -> Entry:
-        from uuid import UUID
+        return Entry.from_storage(
+            orm_model.id,  # type: ignore
+            orm_model.dictionary_id,  # type: ignore
+            orm_model.original_text,  # type: ignore
+            orm_model.translated_text,  # type: ignore
+            orm_model.usage_example,  # type: ignore
+            orm_model.notes,  # type: ignore
+            orm_model.created_at,  # type: ignore
+            orm_model.updated_at,  # type: ignore
+        )
+
+    @staticmethod
+    def _stats_row(entry: Entry) -> StatsRow:
+        return (
+            entry.original_text,
+            entry.translated_text,
+            entry.usage_example,
+            entry.notes,
+            entry.created_at,
+        )
 
+    @staticmethod
+    def _insert_error(error: SQLAlchemyError, entries: list[Entry]) -> ValueError:
+        if isinstance(error, IntegrityError) and "normalized_key" in str(error.orig):
+            if len(entries) == 1:
+                return DuplicateEntryError(
+                    f"Entry '{entries[0].original_text}' already exists "
+                    f"in dictionary {entries[0].dictionary_id}"
+                )
+            return DuplicateEntryError(f"Failed to insert entries: {error.orig}")
+        return ValueError(f"Failed to insert entries: {error}")
+
+    @staticmethod
+    def _merged(first: Entry, later: Entry) -> Entry:
+        # Те же правила, что в ON CONFLICT DO UPDATE
         return Entry(
-            id=UUID(orm_model.id) if isinstance(orm_model.id, str) else orm_model.id,  # type: ignore
-            dictionary_id=UUID(orm_model.dictionary_id) if isinstance(orm_model.dictionary_id, str) else orm_model.dictionary_id,  # type: ignore
-            original_text=orm_model.original_text,  # type: ignore
-            translated_text=orm_model.translated_text,  # type: ignore
-            usage_example=orm_model.usage_example,  # type: ignore
-            notes=orm_model.notes,  # type: ignore
-            created_at=orm_model.created_at,  # type: ignore
-            updated_at=orm_model.updated_at,  # type: ignore
+            id=first.id,
+            dictionary_id=first.dictionary_id,
+            original_text=first.original_text,
+            translated_text=later.translated_text,
+            usage_example=later.usage_example or first.usage_example,
+            notes=later.notes or first.notes,
+            created_at=first.created_at,
+            updated_at=later.updated_at,
         )
 
     @staticmethod
-    def _to_orm(domain_model: Entry) -> EntryORM:
-        return EntryORM(
-            id=str(domain_model.id),
-            dictionary_id=str(domain_model.dictionary_id),
-            original_text=domain_model.original_text,
-            translated_text=domain_model.translated_text,
-            usage_example=domain_model.usage_example,
-            notes=domain_model.notes,
-            created_at=domain_model.created_at,
-            updated_at=domain_model.updated_at,
+    def _to_row(domain_model: Entry, dictionary_key: bytes) -> tuple:
+        # Тот же формат, в котором SQLAlchemy хранит BinaryUUID и DateTime
+        return (
+            domain_model.id.bytes,
+            dictionary_key,
+            domain_model.original_text,
+            domain_model.translated_text,
+            domain_model.usage_example,
+            domain_model.notes,
+            domain_model.created_at.isoformat(" ", "microseconds"),
+            domain_model.updated_at.isoformat(" ", "microseconds"),
+            domain_model.normalized_key,
         )
+
+
+# Изменения индексов - функции модуля с аргументами через partial, а не
+# замыкания: процесс-писатель пересылает их воркерам через pickle
+def _add_prefixes(texts: list[str], index: PrefixIndex) -> None:
+    for original_text in texts:
+        index.add(original_text)
+
+
+def _remove_prefix(original_text: str, index: PrefixIndex) -> None:
+    index.remove(original_text)
+
+
+def _add_rows(rows: list[tuple[UUID, str, str]], index: TrigramIndex) -> None:
+    for row in rows:
+        index.add(row)
+
+
+def _remove_row(entry_id: UUID, index: TrigramIndex) -> None:
+    index.remove(entry_id)
+
+
+def _replace_row(row: tuple[UUID, str, str], index: TrigramIndex) -> None:
+    index.remove(row[0])
+    index.add(row)
+
+
+def _group(entries: list[Entry]) -> dict[UUID, list[Entry]]:
+    groups: dict[UUID, list[Entry]] = {}
+    for entry in entries:
+        groups.setdefault(entry.dictionary_id, []).append(entry)
+    return groups
@@ -0,0 +1,59 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "8"))
+
+_DONE = object()
+
+
+class DatabaseExecutor:
+    """Выделенный ограниченный пул потоков для синхронных вызовов БД.
+
+    Обработчики FastAPI асинхронные, а сессия SQLAlchemy синхронная:
+    запрос к SQLite, выполненный прямо в обработчике, блокирует весь
+    event loop. Через этот пул блокируется только поток пула.
+    """
+
+    def __init__(self, max_workers: int = DB_EXECUTOR_WORKERS):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="db")
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        # Контекстные переменные запроса видны и внутри потока пула
+        context = contextvars.copy_context()
+        call = partial(context.run, fn, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, call)
+
+    async def iterate(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        try:
+            while True:
+                item = await self.run(next, iterator, _DONE)
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            # Закрытие генератора освобождает курсор; тоже в потоке пула
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self.run(close)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+db_executor = DatabaseExecutor()
+
+
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    return await db_executor.run(fn, *args, **kwargs)
+
+
+def iterate_db(iterator: Iterator[T]) -> AsyncIterator[T]:
+    return db_executor.iterate(iterator)
@@ -0,0 +1,107 @@
+import re
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import DDL, event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .models import EntryORM
+
+FTS_TABLE = "entries_fts"
+FTS_COLUMNS = ("original_text", "translated_text", "usage_example")
+
+# Словарь индексируется отдельным токеном, чтобы фильтр по нему
+# пересекался с результатами поиска внутри FTS5, а не после него
+_DICTIONARY_KEY = "'d' || lower(hex({row}.dictionary_id))"
+
+_CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{', '.join(FTS_COLUMNS)}, dictionary_key, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+# Веса BM25 по колонкам; ключ словаря в ранжировании не участвует
+_CONFIGURE_RANK = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) "
+    "VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 0.0)')"
+)
+
+
+def _insert_row(row: str) -> str:
+    values = ", ".join(f"{row}.{name}" for name in FTS_COLUMNS)
+    return (
+        f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}, dictionary_key) "
+        f"VALUES ({row}.rowid, {values}, {_DICTIONARY_KEY.format(row=row)});"
+    )
+
+
+_DELETE_OLD = f"DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;"
+
+_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON entries "
+    f"BEGIN {_insert_row('new')} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON entries "
+    f"BEGIN {_DELETE_OLD} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF "
+    f"{', '.join(FTS_COLUMNS)}, dictionary_id ON entries "
+    f"BEGIN {_DELETE_OLD} {_insert_row('new')} END",
+)
+
+_POPULATE = (
+    f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}, dictionary_key) "
+    f"SELECT rowid, {', '.join(FTS_COLUMNS)}, {_DICTIONARY_KEY.format(row='entries')} "
+    "FROM entries"
+)
+
+
+def install_fulltext(connection: Connection) -> None:
+    connection.exec_driver_sql(_CREATE_TABLE)
+    connection.exec_driver_sql(_CONFIGURE_RANK)
+    for trigger in _TRIGGERS:
+        connection.exec_driver_sql(trigger)
+
+
+def drop_fulltext_triggers(connection: Connection) -> None:
+    # Триггеры висят на entries и переживают DROP TABLE entries_fts
+    for suffix in ("ai", "ad", "au"):
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+
+
+def rebuild_fulltext(db: Session) -> int:
+    connection = db.connection()
+    drop_fulltext_triggers(connection)
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    install_fulltext(connection)
+    result = connection.exec_driver_sql(_POPULATE)
+    connection.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+    )
+    db.commit()
+    return result.rowcount
+
+
+def build_match_query(query: str, dictionary_id: Optional[UUID] = None) -> str:
+    # Пользовательский ввод не должен попадать в синтаксис FTS5:
+    # каждое слово берём в кавычки, последнее ищем по префиксу
+    tokens = re.findall(r"\w+", query)
+    if not tokens:
+        return ""
+
+    phrases = " ".join(f'"{token}"' for token in tokens) + "*"
+    match = f"{{{' '.join(FTS_COLUMNS)}}} : ({phrases})"
+    if dictionary_id is not None:
+        match = f'dictionary_key : "d{dictionary_id.hex}" AND {match}'
+    return match
+
+
+@event.listens_for(EntryORM.__table__, "after_create")
+def _create_fulltext(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        install_fulltext(connection)
+
+
+event.listen(
+    EntryORM.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+)
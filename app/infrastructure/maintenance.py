@@ -0,0 +1,206 @@
+"""Служебные команды обслуживания базы данных.
+
+Запуск: ``python -m app.infrastructure.maintenance <command>``
+"""
+
+import argparse
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.domain import normalize_key
+
+from .database import SessionLocal
+from .fulltext import drop_fulltext_triggers, install_fulltext, rebuild_fulltext
+from .models import DictionaryORM, EntryORM
+from .statistics import rebuild_dictionary_stats
+from .storage import checkpoint
+
+
+def rebuild_entry_counts(db: Session) -> int:
+    # Пересчёт счётчиков после сбоя: один коррелированный подзапрос по индексу
+    actual = (
+        select(func.count(EntryORM.id))
+        .where(EntryORM.dictionary_id == DictionaryORM.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(DictionaryORM).values(
+            entry_count=actual, entries_version=DictionaryORM.entries_version + 1
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _uuid_bytes(value):
+    return UUID(value).bytes if isinstance(value, str) else value
+
+
+def convert_uuid_keys(db: Session) -> int:
+    # Базы, созданные до BinaryUUID, хранят ключи строками VARCHAR(36).
+    # Колонки SQLite не типизированы строго, поэтому значения меняются
+    # на месте, без пересоздания таблиц; уже сконвертированные строки
+    # пропускаются. Ключ словаря в FTS5 при этом не меняется, но
+    # триггеры нужно пересоздать с новым выражением
+    connection = db.connection()
+    connection.connection.driver_connection.create_function(
+        "uuid_bytes", 1, _uuid_bytes, deterministic=True
+    )
+    drop_fulltext_triggers(connection)
+    # Ключ словаря и ссылки на него меняются разными UPDATE: при включённых
+    # внешних ключах проверка откладывается до коммита. Флаг живёт до конца
+    # транзакции, поэтому ставится после DDL, перед первым UPDATE
+    connection.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+    converted = 0
+    for table, columns in (
+        (DictionaryORM.__tablename__, ("id",)),
+        (EntryORM.__tablename__, ("id", "dictionary_id")),
+    ):
+        assignments = ", ".join(f"{name} = uuid_bytes({name})" for name in columns)
+        condition = " OR ".join(f"typeof({name}) = 'text'" for name in columns)
+        converted += connection.exec_driver_sql(
+            f"UPDATE {table} SET {assignments} WHERE {condition}"
+        ).rowcount
+    install_fulltext(connection)
+    db.commit()
+    # Освободившиеся страницы индексов возвращаются файлу базы
+    if converted:
+        connection = db.connection()
+        connection.exec_driver_sql("VACUUM")
+        db.commit()
+    return converted
+
+
+_DEDUP_INDEX = "ux_entries_dictionary_normalized_key"
+_DEDUP_SCAN_INDEX = "tmp_entries_dictionary_normalized_key"
+
+
+def dedup_entries(db: Session) -> int:
+    # Разовый проход для базы, созданной до normalized_key: колонка
+    # добавляется и заполняется, из повторов в словаре остаётся самая
+    # ранняя запись (пустые пример и заметки берутся у повторов), затем
+    # строится уникальный индекс и пересчитываются счётчики и статистика
+    connection = db.connection()
+    table = EntryORM.__tablename__
+    columns = {
+        row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")
+    }
+    if "normalized_key" not in columns:
+        connection.exec_driver_sql(
+            f"ALTER TABLE {table} ADD COLUMN normalized_key TEXT NOT NULL DEFAULT ''"
+        )
+    connection.connection.driver_connection.create_function(
+        "normalize_key", 1, normalize_key, deterministic=True
+    )
+    connection.exec_driver_sql(
+        f"UPDATE {table} SET normalized_key = normalize_key(original_text) "
+        "WHERE normalized_key IS NOT normalize_key(original_text)"
+    )
+
+    # Поиск повторов коррелированными подзапросами без индекса квадратичен;
+    # уникальный индекс строится только после чистки, поэтому до неё - временный
+    connection.exec_driver_sql(
+        f"CREATE INDEX IF NOT EXISTS {_DEDUP_SCAN_INDEX} "
+        f"ON {table} (dictionary_id, normalized_key)"
+    )
+    duplicate = (
+        f"FROM {table} AS d WHERE d.dictionary_id = {table}.dictionary_id "
+        f"AND d.normalized_key = {table}.normalized_key AND d.rowid != {table}.rowid"
+    )
+    connection.exec_driver_sql(
+        f"UPDATE {table} SET "
+        + ", ".join(
+            f"{name} = coalesce(nullif({name}, ''), (SELECT d.{name} {duplicate} "
+            f"AND coalesce(d.{name}, '') != '' ORDER BY d.created_at DESC LIMIT 1))"
+            for name in ("usage_example", "notes")
+        )
+        + f" WHERE EXISTS (SELECT 1 {duplicate})"
+    )
+    removed = connection.exec_driver_sql(
+        f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM ("
+        "SELECT rowid, row_number() OVER (PARTITION BY dictionary_id, normalized_key "
+        "ORDER BY created_at, id) AS position "
+        f"FROM {table}) WHERE position > 1)"
+    ).rowcount
+
+    index = next(i for i in EntryORM.__table__.indexes if i.name == _DEDUP_INDEX)
+    index.create(connection, checkfirst=True)
+    connection.exec_driver_sql(f"DROP INDEX {_DEDUP_SCAN_INDEX}")
+    db.commit()
+    rebuild_entry_counts(db)
+    rebuild_dictionary_stats(db)
+    return removed
+
+
+def run_migrations(db: Session) -> int:
+    # migrations сама собрана из команд этого модуля
+    from .migrations import migrate
+
+    return migrate(db)
+
+
+def truncate_wal(db: Session) -> int:
+    # Перенести весь WAL в базу и обрезать файл, например перед копированием
+    _, _, moved = checkpoint(db, "TRUNCATE")
+    return max(moved, 0)
+
+
+COMMANDS: dict[str, tuple[Callable[[Session], int], str]] = {
+    "migrate": (
+        run_migrations,
+        "Применить недостающие миграции схемы (то же делает запуск приложения)",
+    ),
+    "rebuild-counters": (
+        rebuild_entry_counts,
+        "Пересчитать dictionaries.entry_count по таблице entries",
+    ),
+    "convert-uuid-keys": (
+        convert_uuid_keys,
+        "Перевести UUID-ключи старой базы из строк в 16-байтовые BLOB",
+    ),
+    "rebuild-stats": (
+        rebuild_dictionary_stats,
+        "Пересчитать агрегаты статистики словарей по таблице entries",
+    ),
+    "dedup-entries": (
+        dedup_entries,
+        "Заполнить normalized_key и удалить повторы записей в словарях",
+    ),
+    "rebuild-search": (
+        rebuild_fulltext,
+        "Пересоздать полнотекстовый индекс entries_fts",
+    ),
+    "checkpoint": (
+        truncate_wal,
+        "Перенести WAL в файл базы и обрезать его до нуля",
+    ),
+}
+
+
+def main(
+    argv: Optional[list[str]] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.infrastructure.maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text)
+
+    args = parser.parse_args(argv)
+    command, _ = COMMANDS[args.command]
+
+    db = session_factory()
+    try:
+        affected = command(db)
+    finally:
+        db.close()
+
+    print(f"{args.command}: {affected} rows updated")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,373 @@
+import abc
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .cache import CacheBackend
+from .text_indexes import DictionaryIndexCache
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = tuple[str, ...]
+Sample = tuple[str, Labels, float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric(abc.ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """Тройки (имя серии, значения меток, значение) для render()."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labels, value in self.samples():
+            names = self.labelnames + (("le",) if name.endswith("_bucket") else ())
+            lines.append(
+                f"{name}{_format_labels(names, labels)} {_format_value(value)}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(f"{self.name}_total", labels, value) for labels, value in items]
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, labels, value) for labels, value in items]
+
+
+class Histogram(Metric):
+    """Гистограмма с фиксированными корзинами.
+
+    На горячем пути - поиск корзины и три сложения под блокировкой;
+    накопительные суммы по корзинам считаются только при выдаче.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Метки -> [счётчики по корзинам + переполнение, сумма]
+        self._series: dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            ]
+        samples: list[Sample] = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket = _format_value(bound)
+                samples.append((f"{self.name}_bucket", (*labels, bucket), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class CollectedMetric(Metric):
+    # Значения снимаются в момент выдачи: размеры пула, счётчики кэшей
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: str,
+        labelnames: Sequence[str] = (),
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.type = type
+        self._collectors: list[Callable[[], Iterable[tuple[Labels, float]]]] = []
+
+    def add_collector(
+        self, collector: Callable[[], Iterable[tuple[Labels, float]]]
+    ) -> None:
+        self._collectors.append(collector)
+
+    def samples(self) -> Iterable[Sample]:
+        name = f"{self.name}_total" if self.type == "counter" else self.name
+        return [
+            (name, labels, value)
+            for collector in self._collectors
+            for labels, value in collector()
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter(
+        "http_requests",
+        "HTTP requests by route and status code",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route, including the response body",
+        ("method", "route"),
+    )
+)
+http_requests_in_progress = registry.register(
+    Gauge("http_requests_in_progress", "HTTP requests being processed")
+)
+http_request_db_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements executed per HTTP request",
+        ("method", "route"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+http_request_db_duration = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent in SQL statements per HTTP request",
+        ("method", "route"),
+    )
+)
+db_query_duration = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "SQL statement execution time by operation",
+        ("operation",),
+    )
+)
+db_pool = registry.register(
+    CollectedMetric(
+        "db_pool_connections",
+        "Database connection pool usage",
+        "gauge",
+        ("engine", "state"),
+    )
+)
+cache_operations = registry.register(
+    CollectedMetric(
+        "cache_operations",
+        "Entity cache hits, misses, evictions, expirations and invalidations",
+        "counter",
+        ("cache", "result"),
+    )
+)
+index_cache_size = registry.register(
+    CollectedMetric(
+        "text_index_cache_bytes",
+        "Estimated memory held by per-dictionary text indexes",
+        "gauge",
+        ("cache",),
+    )
+)
+index_cache_indexes = registry.register(
+    CollectedMetric(
+        "text_index_cache_indexes",
+        "Per-dictionary text indexes currently loaded",
+        "gauge",
+        ("cache",),
+    )
+)
+
+
+@dataclass
+class QueryTally:
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Счётчик SQL текущего HTTP-запроса; run_db переносит контекст в поток пула
+request_queries: ContextVar[Optional[QueryTally]] = ContextVar(
+    "request_queries", default=None
+)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    operation = statement.lstrip()[:6].upper()
+    db_query_duration.observe(
+        elapsed, operation if operation in _OPERATIONS else "OTHER"
+    )
+    tally = request_queries.get()
+    if tally is not None:
+        tally.count += 1
+        tally.seconds += elapsed
+
+
+def instrument_queries() -> None:
+    # На классе Engine: учитываются все движки, в том числе подменённые в тестах
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def remove_query_instrumentation() -> None:
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_pool(name: str, engine: Engine) -> None:
+    pool = engine.pool
+
+    def collect() -> list[tuple[Labels, float]]:
+        states = {
+            "size": "size",
+            "checked_in": "checkedin",
+            "checked_out": "checkedout",
+            "overflow": "overflow",
+        }
+        # StaticPool и NullPool не ведут учёт соединений; overflow() у
+        # QueuePool отрицателен, пока занято меньше pool_size соединений
+        return [
+            ((name, state), max(getattr(pool, method)(), 0))
+            for state, method in states.items()
+            if hasattr(pool, method)
+        ]
+
+    db_pool.add_collector(collect)
+
+
+def instrument_cache(name: str, cache: CacheBackend) -> None:
+    def collect() -> list[tuple[Labels, float]]:
+        return [
+            ((name, result), value) for result, value in cache.stats.snapshot().items()
+        ]
+
+    cache_operations.add_collector(collect)
+
+
+def instrument_index_cache(name: str, cache: DictionaryIndexCache) -> None:
+    index_cache_size.add_collector(lambda: [((name,), cache.nbytes)])
+    index_cache_indexes.add_collector(lambda: [((name,), len(cache))])
@@ -0,0 +1,179 @@
+"""Версионированные миграции схемы SQLite.
+
+Версия схемы хранится в ``PRAGMA user_version``. Пустая база создаётся
+сразу в последней версии; база старше - проходит недостающие шаги по
+порядку, каждый шаг фиксируется отдельно. Шаги идемпотентны: база,
+созданная ``create_all`` до появления версий (версия 0), проходит их все
+без потерь, а прерванный шаг можно просто повторить. Одновременно
+стартующие воркеры мигрируют по очереди: версия перечитывается под
+блокировкой, и шаги выполняет только первый.
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+from typing import Callable, Iterator, NamedTuple
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .database import Base
+from .fulltext import rebuild_fulltext
+from .maintenance import convert_uuid_keys, dedup_entries, rebuild_entry_counts
+from .models import DictionaryDailyStatsORM, DictionaryORM, DictionaryStatsORM, EntryORM
+from .statistics import rebuild_dictionary_stats
+
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "1") == "1"
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Session], object]
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def _columns(connection: Connection, table: str) -> set[str]:
+    return {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+
+def _add_entry_counters(db: Session) -> None:
+    connection = db.connection()
+    table = DictionaryORM.__table__
+    existing = _columns(connection, table.name)
+    for name in ("entry_count", "entries_version", "entries_updated_at"):
+        if name not in existing:
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} "
+            ddl += column.type.compile(connection.dialect)
+            if column.server_default is not None:
+                ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+            connection.exec_driver_sql(ddl)
+    db.commit()
+    rebuild_entry_counts(db)
+
+
+def _create_listing_indexes(db: Session) -> None:
+    # Уникальный индекс по normalized_key строит шаг дедупликации
+    connection = db.connection()
+    for table in (DictionaryORM.__table__, EntryORM.__table__):
+        for index in table.indexes:
+            if not index.unique:
+                index.create(connection, checkfirst=True)
+    db.commit()
+
+
+def _create_stats_tables(db: Session) -> None:
+    connection = db.connection()
+    for model in (DictionaryStatsORM, DictionaryDailyStatsORM):
+        model.__table__.create(connection, checkfirst=True)
+    db.commit()
+    rebuild_dictionary_stats(db)
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "счётчики и версия записей словаря", _add_entry_counters),
+    Migration(2, "UUID-ключи в 16-байтовых BLOB", convert_uuid_keys),
+    Migration(3, "составные индексы листинга и поиска", _create_listing_indexes),
+    Migration(4, "агрегатные таблицы статистики", _create_stats_tables),
+    Migration(5, "normalized_key и уникальность записей", dedup_entries),
+    Migration(6, "полнотекстовый индекс entries_fts", rebuild_fulltext),
+)
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(connection: Connection) -> int:
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def _set_schema_version(db: Session, version: int) -> None:
+    # PRAGMA не принимает параметры; версия - всегда int из MIGRATIONS
+    db.connection().exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+    db.commit()
+
+
+@contextmanager
+def _migration_lock(db: Session) -> Iterator[None]:
+    # Блокировка - файл рядом с базой, а не транзакция SQLite: шаги
+    # миграций коммитят сами, а BEGIN IMMEDIATE в другом соединении
+    # заблокировал бы их же записи
+    database = db.get_bind().url.database
+    if not database or database == ":memory:":
+        yield
+        return
+    with open(f"{database}-migrate.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _checked_version(db: Session) -> int:
+    version = get_schema_version(db.connection())
+    db.commit()
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version {version} is newer than supported "
+            f"version {SCHEMA_VERSION}"
+        )
+    return version
+
+
+def migrate(db: Session) -> int:
+    """Доводит схему до SCHEMA_VERSION; возвращает число применённых шагов."""
+    # На актуальной базе - один PRAGMA без блокировки
+    if _checked_version(db) == SCHEMA_VERSION:
+        return 0
+    with _migration_lock(db):
+        # Пока ждали блокировку, другой воркер мог уже всё сделать
+        version = _checked_version(db)
+        if version == SCHEMA_VERSION:
+            return 0
+        return _apply_migrations(db, version)
+
+
+def _apply_migrations(db: Session, version: int) -> int:
+    connection = db.connection()
+    if version == 0 and not inspect(connection).has_table(DictionaryORM.__tablename__):
+        Base.metadata.create_all(bind=connection)
+        _set_schema_version(db, SCHEMA_VERSION)
+        return 1
+
+    db.commit()
+    applied = 0
+    for migration in MIGRATIONS:
+        if migration.version > version:
+            migration.apply(db)
+            _set_schema_version(db, migration.version)
+            applied += 1
+    return applied
+
+
+def check_schema(db: Session) -> None:
+    # Без автомиграции воркер только сверяет версию: миграции запускаются
+    # одним процессом до раскатки (maintenance migrate)
+    version = get_schema_version(db.connection())
+    db.commit()
+    if version != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version {version} does not match {SCHEMA_VERSION}; "
+            "run python -m app.infrastructure.maintenance migrate"
+        )
+
+
+def prepare_database(
+    session_factory: Callable[[], Session], migrate_schema: bool = DB_MIGRATE_ON_STARTUP
+) -> int:
+    db = session_factory()
+    try:
+        if migrate_schema:
+            return migrate(db)
+        check_schema(db)
+        return 0
+    finally:
+        db.close()
@@ -1,19 +1,64 @@
 import uuid
 from datetime import datetime
+from typing import Optional, Union
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
 
 from .database import Base
 
 
+class BinaryUUID(TypeDecorator):
+    """UUID в 16-байтовом BLOB вместо 36-символьной строки.
+
+    Параметры принимаются как UUID, строка или готовые 16 байт,
+    из БД всегда возвращается UUID.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: Union[uuid.UUID, str, bytes, None], dialect: Dialect
+    ) -> Optional[bytes]:
+        if value is None or isinstance(value, bytes):
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(value)
+        return value.bytes
+
+    def process_result_value(
+        self, value: Optional[bytes], dialect: Dialect
+    ) -> Optional[uuid.UUID]:
+        return None if value is None else uuid.UUID(bytes=value)
+
+
 class DictionaryORM(Base):
     __tablename__ = "dictionaries"
+    __table_args__ = (Index("ix_dictionaries_created_at_id", "created_at", "id"),)
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String, nullable=False, index=True)
+    id = Column(BinaryUUID, primary_key=True, default=uuid.uuid4)
+    name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     source_language = Column(String, nullable=False)
     target_language = Column(String, nullable=False)
+    # Поддерживается EntryRepository в той же транзакции, что и запись в entries
+    entry_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Версия и время последнего изменения записей словаря (для ETag и
+    # Last-Modified списка записей); меняются вместе с entry_count
+    entries_version = Column(Integer, nullable=False, default=0, server_default="0")
+    entries_updated_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -25,15 +70,32 @@ class DictionaryORM(Base):
 
 class EntryORM(Base):
     __tablename__ = "entries"
+    __table_args__ = (
+        # Листинг словаря с keyset-пагинацией
+        Index(
+            "ix_entries_dictionary_created_at_id", "dictionary_id", "created_at", "id"
+        ),
+        # Поиск записи по тексту внутри словаря
+        Index("ix_entries_dictionary_original_text", "dictionary_id", "original_text"),
+        # Дедупликация: одна запись на нормализованный original_text в словаре
+        Index(
+            "ux_entries_dictionary_normalized_key",
+            "dictionary_id",
+            "normalized_key",
+            unique=True,
+        ),
+    )
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(BinaryUUID, primary_key=True, default=uuid.uuid4)
     dictionary_id = Column(
-        String(36), ForeignKey("dictionaries.id", ondelete="CASCADE"), nullable=False
+        BinaryUUID, ForeignKey("dictionaries.id", ondelete="CASCADE"), nullable=False
     )
     original_text = Column(Text, nullable=False)
     translated_text = Column(Text, nullable=False)
     usage_example = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
+    # normalize_key(original_text), заполняется EntryRepository
+    normalized_key = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -41,3 +103,29 @@ class EntryORM(Base):
 
     def __repr__(self):
         return f"<EntryORM(id={self.id}, original='{self.original_text}')>"
+
+
+class DictionaryStatsORM(Base):
+    # Агрегаты по записям словаря для GET /dictionaries/{id}/stats;
+    # EntryRepository меняет их в той же транзакции, что и entries
+    __tablename__ = "dictionary_stats"
+
+    dictionary_id = Column(
+        BinaryUUID, ForeignKey("dictionaries.id", ondelete="CASCADE"), primary_key=True
+    )
+    with_example = Column(Integer, nullable=False, default=0, server_default="0")
+    with_notes = Column(Integer, nullable=False, default=0, server_default="0")
+    # Суммарная длина текстов в символах, для средних значений
+    original_length = Column(Integer, nullable=False, default=0, server_default="0")
+    translated_length = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class DictionaryDailyStatsORM(Base):
+    # Число записей словаря по дню создания (created_at, UTC)
+    __tablename__ = "dictionary_daily_stats"
+
+    dictionary_id = Column(
+        BinaryUUID, ForeignKey("dictionaries.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    added = Column(Integer, nullable=False, default=0, server_default="0")
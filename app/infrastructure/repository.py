@@ -1,28 +1,110 @@
-from typing import Optional
+from datetime import date, datetime
+from typing import Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import (
+    LargeBinary,
+    String,
+    Table,
+    Tuple,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    type_coerce,
+    update,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from app.domain import Dictionary
+from app.domain import Dictionary, DictionaryStats
 
-from .models import DictionaryORM
+from . import cache
+from .cache import CacheBackend, read_through
+from .models import (
+    BinaryUUID,
+    DictionaryDailyStatsORM,
+    DictionaryORM,
+    DictionaryStatsORM,
+)
+from .statistics import delete_dictionary_stats
+from .tracing import trace_methods, traced
 
 
+def dictionary_key(dictionary_id: UUID) -> str:
+    return f"dictionary:{dictionary_id}"
+
+
+def entry_key(entry_id: UUID) -> str:
+    return f"entry:{entry_id}"
+
+
+def deleted_dictionary_key(dictionary_id: UUID) -> str:
+    return f"dictionary-deleted:{dictionary_id}"
+
+
+def keyset_position(created_at: datetime, item_id: UUID) -> Tuple:
+    # Без явного типа UUID привязался бы как Uuid (CHAR(32) в SQLite)
+    return tuple_(created_at, literal(item_id, BinaryUUID))
+
+
+_DICTIONARY_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "source_language",
+    "target_language",
+    "created_at",
+    "updated_at",
+)
+
+
+def storage_columns(table: Table, names: Sequence[str]) -> list:
+    # Значения в формате хранения, без разбора: даты строкой, UUID байтами
+    columns = []
+    for name in names:
+        column = table.c[name]
+        if name.endswith("_at"):
+            column = type_coerce(column, String)
+        elif isinstance(column.type, BinaryUUID):
+            column = type_coerce(column, LargeBinary)
+        columns.append(column)
+    return columns
+
+
+@trace_methods
 class DictionaryRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, entity_cache: Optional[CacheBackend] = None):
         self.db = db
+        self.cache = entity_cache if entity_cache is not None else cache.entity_cache
 
     def create(self, dictionary: Dictionary) -> Dictionary:
-        db_dictionary = self._to_orm(dictionary)
-        self.db.add(db_dictionary)
+        # Один INSERT: все значения уже есть в доменном объекте,
+        # перечитывать строку после commit не нужно
+        self.db.execute(
+            insert(DictionaryORM.__table__).values(
+                id=dictionary.id,
+                created_at=dictionary.created_at,
+                **self._values(dictionary),
+            )
+        )
         self.db.commit()
-        self.db.refresh(db_dictionary)
-        return self._to_domain(db_dictionary)
+        self.cache.delete(dictionary_key(dictionary.id))
+        return dictionary
 
     def get_by_id(self, dictionary_id: UUID) -> Optional[Dictionary]:
+        return read_through(
+            self.cache,
+            dictionary_key(dictionary_id),
+            lambda: self._load(dictionary_id),
+        )
+
+    @traced
+    def _load(self, dictionary_id: UUID) -> Optional[Dictionary]:
         db_dictionary = (
             self.db.query(DictionaryORM)
-            .filter(DictionaryORM.id == str(dictionary_id))
+            .filter(DictionaryORM.id == dictionary_id)
             .first()
         )
 
@@ -31,61 +113,162 @@ class DictionaryRepository:
 
         return self._to_domain(db_dictionary)
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> list[Dictionary]:
-        db_dictionaries = self.db.query(DictionaryORM).offset(skip).limit(limit).all()
-        return [self._to_domain(db_dict) for db_dict in db_dictionaries]
+    def get_updated_at(self, dictionary_id: UUID) -> Optional[datetime]:
+        return (
+            self.db.query(DictionaryORM.updated_at)
+            .filter(DictionaryORM.id == dictionary_id)
+            .scalar()
+        )
 
-    def update(self, dictionary: Dictionary) -> Dictionary:
-        db_dictionary = (
-            self.db.query(DictionaryORM)
-            .filter(DictionaryORM.id == str(dictionary.id))
+    def get_stats(
+        self, dictionary_id: UUID, since: date, as_of: date
+    ) -> Optional[DictionaryStats]:
+        # Строка агрегатов по ключу и дни окна по первичному ключу:
+        # объём чтения не зависит от размера словаря
+        row = (
+            self.db.query(
+                DictionaryORM.entry_count,
+                DictionaryStatsORM.with_example,
+                DictionaryStatsORM.with_notes,
+                DictionaryStatsORM.original_length,
+                DictionaryStatsORM.translated_length,
+            )
+            .outerjoin(
+                DictionaryStatsORM,
+                DictionaryStatsORM.dictionary_id == DictionaryORM.id,
+            )
+            .filter(DictionaryORM.id == dictionary_id)
             .first()
         )
+        if row is None:
+            return None
 
-        if db_dictionary is None:
+        days = self.db.query(
+            DictionaryDailyStatsORM.day, DictionaryDailyStatsORM.added
+        ).filter(
+            DictionaryDailyStatsORM.dictionary_id == dictionary_id,
+            DictionaryDailyStatsORM.day >= since,
+            DictionaryDailyStatsORM.added > 0,
+        )
+        entry_count, *totals = row
+        return DictionaryStats(
+            as_of,
+            entry_count,
+            *(total or 0 for total in totals),
+            added_by_day=dict(days.all()),
+        )
+
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[Dictionary]:
+        return [
+            Dictionary.from_storage(*row) for row in self.get_rows(skip, limit, after)
+        ]
+
+    def get_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> Sequence[Row]:
+        # Страница словарей плоскими колонками без ORM
+        table = DictionaryORM.__table__
+        query = select(*storage_columns(table, _DICTIONARY_COLUMNS)).order_by(
+            table.c.created_at, table.c.id
+        )
+
+        if after is not None:
+            created_at, dictionary_id = after
+            query = query.where(
+                tuple_(table.c.created_at, table.c.id)
+                > keyset_position(created_at, dictionary_id)
+            )
+        else:
+            query = query.offset(skip)
+
+        return self.db.execute(query.limit(limit)).all()
+
+    def count(self) -> int:
+        return self.db.query(func.count(DictionaryORM.id)).scalar() or 0
+
+    def update(self, dictionary: Dictionary) -> Dictionary:
+        # UPDATE ... RETURNING: проверка существования, запись и чтение
+        # сохранённой строки одним запросом
+        table = DictionaryORM.__table__
+        row = self.db.execute(
+            update(table)
+            .where(table.c.id == dictionary.id)
+            .values(**self._values(dictionary))
+            .returning(*storage_columns(table, _DICTIONARY_COLUMNS))
+        ).first()
+
+        if row is None:
+            self.db.rollback()
             raise ValueError(f"Dictionary with id {dictionary.id} not found")
 
-        db_dictionary.name = dictionary.name  # type: ignore
-        db_dictionary.description = dictionary.description  # type: ignore
-        db_dictionary.source_language = dictionary.source_language  # type: ignore
-        db_dictionary.target_language = dictionary.target_language  # type: ignore
-        db_dictionary.updated_at = dictionary.updated_at  # type: ignore
+        self.db.commit()
+        self.cache.delete(dictionary_key(dictionary.id))
+        return Dictionary.from_storage(*row)
+
+    def update_fields(
+        self, dictionary_id: UUID, changes: dict[str, str]
+    ) -> Optional[Dictionary]:
+        # Один UPDATE только переданных колонок, без чтения строки: изменения
+        # других полей из другого воркера не перезаписываются. None - словаря нет
+        table = DictionaryORM.__table__
+        row = self.db.execute(
+            update(table)
+            .where(table.c.id == dictionary_id)
+            .values(**changes, updated_at=datetime.utcnow())
+            .returning(*storage_columns(table, _DICTIONARY_COLUMNS))
+        ).first()
+
+        if row is None:
+            self.db.rollback()
+            return None
 
         self.db.commit()
-        self.db.refresh(db_dictionary)
-        return self._to_domain(db_dictionary)
+        self.cache.delete(dictionary_key(dictionary_id))
+        return Dictionary.from_storage(*row)
 
     def delete(self, dictionary_id: UUID) -> bool:
+        # Записи словаря удаляются каскадом. Их копии в кэше не перечисляются
+        # (у большого словаря это сотни тысяч ключей): до истечения TTL их
+        # скрывает метка удаления, которую проверяет EntryRepository
         result = (
             self.db.query(DictionaryORM)
-            .filter(DictionaryORM.id == str(dictionary_id))
+            .filter(DictionaryORM.id == dictionary_id)
             .delete()
         )
+        delete_dictionary_stats(self.db, dictionary_id)
         self.db.commit()
+        self.cache.delete(dictionary_key(dictionary_id))
+        if result:
+            self.cache.set(deleted_dictionary_key(dictionary_id), True)
         return result > 0
 
     @staticmethod
+    @traced
     def _to_domain(orm_model: DictionaryORM) -> Dictionary:
-        from uuid import UUID
-
-        return Dictionary(
-            id=UUID(orm_model.id) if isinstance(orm_model.id, str) else orm_model.id,  # type: ignore
-            name=orm_model.name,  # type: ignore
-            description=orm_model.description,  # type: ignore
-            source_language=orm_model.source_language,  # type: ignore
-            target_language=orm_model.target_language,  # type: ignore
-            created_at=orm_model.created_at,  # type: ignore
-            updated_at=orm_model.updated_at,  # type: ignore
+        return Dictionary.from_storage(
+            orm_model.id,  # type: ignore
+            orm_model.name,  # type: ignore
+            orm_model.description,  # type: ignore
+            orm_model.source_language,  # type: ignore
+            orm_model.target_language,  # type: ignore
+            orm_model.created_at,  # type: ignore
+            orm_model.updated_at,  # type: ignore
         )
 
     @staticmethod
-    def _to_orm(domain_model: Dictionary) -> DictionaryORM:
-        return DictionaryORM(
-            id=str(domain_model.id),
-            name=domain_model.name,
-            description=domain_model.description,
-            source_language=domain_model.source_language,
-            target_language=domain_model.target_language,
-            created_at=domain_model.created_at,
-            updated_at=domain_model.updated_at,
-        )
+    def _values(domain_model: Dictionary) -> dict:
+        return {
+            "name": domain_model.name,
+            "description": domain_model.description,
+            "source_language": domain_model.source_language,
+            "target_language": domain_model.target_language,
+            "updated_at": domain_model.updated_at,
+        }
@@ -0,0 +1,141 @@
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Table, delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as upsert
+from sqlalchemy.orm import Session
+
+from .models import DictionaryDailyStatsORM, DictionaryORM, DictionaryStatsORM, EntryORM
+
+# (original_text, translated_text, usage_example, notes, created_at)
+StatsRow = tuple[str, str, Optional[str], Optional[str], datetime]
+
+_TOTALS = ("with_example", "with_notes", "original_length", "translated_length")
+
+
+def adjust_entry_stats(
+    db: Session,
+    dictionary_id: UUID,
+    rows: Iterable[StatsRow],
+    sign: int,
+    count_days: bool = True,
+) -> None:
+    # Приращения считаются в Python, в БД уходят два UPSERT на словарь
+    # (итоги и дни), а не по запросу на запись
+    totals = dict.fromkeys(_TOTALS, 0)
+    days: Counter = Counter()
+    for original_text, translated_text, usage_example, notes, created_at in rows:
+        totals["with_example"] += bool(usage_example)
+        totals["with_notes"] += bool(notes)
+        totals["original_length"] += len(original_text)
+        totals["translated_length"] += len(translated_text)
+        days[created_at.date()] += 1
+    if not days:
+        return
+
+    stats = DictionaryStatsORM.__table__
+    statement = upsert(stats).values(
+        dictionary_id=dictionary_id,
+        **{name: sign * value for name, value in totals.items()},
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[stats.c.dictionary_id],
+            set_={name: stats.c[name] + statement.excluded[name] for name in _TOTALS},
+        )
+    )
+
+    if not count_days:
+        return
+    daily = DictionaryDailyStatsORM.__table__
+    statement = upsert(daily).values(
+        [
+            {"dictionary_id": dictionary_id, "day": day, "added": sign * added}
+            for day, added in days.items()
+        ]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[daily.c.dictionary_id, daily.c.day],
+            set_={"added": daily.c.added + statement.excluded.added},
+        )
+    )
+
+
+def _total_columns(entries: Table) -> list:
+    # Те же правила, что в adjust_entry_stats, в виде агрегатов SQL
+    return [
+        func.coalesce(func.sum(func.coalesce(entries.c.usage_example, "") != ""), 0),
+        func.coalesce(func.sum(func.coalesce(entries.c.notes, "") != ""), 0),
+        func.coalesce(func.sum(func.length(entries.c.original_text)), 0),
+        func.coalesce(func.sum(func.length(entries.c.translated_text)), 0),
+    ]
+
+
+def subtract_entry_totals(
+    db: Session, dictionary_id: UUID, normalized_keys: Sequence[str]
+) -> None:
+    # Вклад существующих записей с этими ключами вычитается до того, как
+    # UPSERT их перезапишет: одним UPDATE внутри БД, без чтения строк
+    entries = EntryORM.__table__
+    stats = DictionaryStatsORM.__table__
+    matched = (
+        entries.c.dictionary_id == dictionary_id,
+        entries.c.normalized_key.in_(normalized_keys),
+    )
+    db.execute(
+        update(stats)
+        .where(stats.c.dictionary_id == dictionary_id)
+        .values(
+            {
+                name: stats.c[name] - select(total).where(*matched).scalar_subquery()
+                for name, total in zip(_TOTALS, _total_columns(entries))
+            }
+        )
+    )
+
+
+def rebuild_dictionary_stats(db: Session) -> int:
+    # Полный пересчёт по entries: для восстановления после сбоя
+    # или ручной правки базы
+    stats = DictionaryStatsORM.__table__
+    daily = DictionaryDailyStatsORM.__table__
+    entries = EntryORM.__table__
+    existing = entries.c.dictionary_id.in_(select(DictionaryORM.id))
+
+    db.execute(delete(daily))
+    db.execute(delete(stats))
+    result = db.execute(
+        insert(stats).from_select(
+            ["dictionary_id", *_TOTALS],
+            select(entries.c.dictionary_id, *_total_columns(entries))
+            .where(existing)
+            .group_by(entries.c.dictionary_id),
+        )
+    )
+    day = func.date(entries.c.created_at)
+    db.execute(
+        insert(daily).from_select(
+            ["dictionary_id", "day", "added"],
+            select(entries.c.dictionary_id, day, func.count())
+            .where(existing)
+            .group_by(entries.c.dictionary_id, day),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def delete_dictionary_stats(db: Session, dictionary_id: UUID) -> None:
+    db.execute(
+        delete(DictionaryStatsORM).where(
+            DictionaryStatsORM.dictionary_id == dictionary_id
+        )
+    )
+    db.execute(
+        delete(DictionaryDailyStatsORM).where(
+            DictionaryDailyStatsORM.dictionary_id == dictionary_id
+        )
+    )
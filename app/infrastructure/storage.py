@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .executor import run_db
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned")
+SQLITE_CHECKPOINT_INTERVAL_SECONDS = float(
+    os.getenv("SQLITE_CHECKPOINT_INTERVAL_SECONDS", "60")
+)
+SQLITE_OPTIMIZE_INTERVAL_SECONDS = float(
+    os.getenv("SQLITE_OPTIMIZE_INTERVAL_SECONDS", "3600")
+)
+# Сколько строк индекса читает ANALYZE внутри PRAGMA optimize: без лимита
+# на большой таблице он читает её целиком
+SQLITE_ANALYSIS_LIMIT = int(os.getenv("SQLITE_ANALYSIS_LIMIT", "1000"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """PRAGMA, выполняемые на каждом новом соединении.
+
+    ``None`` - оставить значение SQLite по умолчанию. Размеры кэша и mmap
+    задаются на соединение: при пуле из N соединений память умножается на N
+    (mmap делит страницы через кэш ОС и на деле не умножается).
+    """
+
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    busy_timeout_ms: Optional[int] = None
+    cache_size_kb: Optional[int] = None
+    mmap_size_mb: Optional[int] = None
+    temp_store: Optional[str] = None
+    foreign_keys: Optional[bool] = None
+
+    def __post_init__(self):
+        for name, allowed in _CHOICES.items():
+            value = getattr(self, name)
+            if value is not None and value.upper() not in allowed:
+                raise ValueError(f"Invalid SQLite {name}: {value!r}")
+
+    def pragmas(self) -> list[str]:
+        values = {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "busy_timeout": self.busy_timeout_ms,
+            # Отрицательное значение - размер в КиБ, а не в страницах
+            "cache_size": None if self.cache_size_kb is None else -self.cache_size_kb,
+            "mmap_size": None if self.mmap_size_mb is None else self.mmap_size_mb << 20,
+            "temp_store": self.temp_store,
+            "foreign_keys": None
+            if self.foreign_keys is None
+            else int(self.foreign_keys),
+        }
+        return [
+            f"PRAGMA {name} = {value}"
+            for name, value in values.items()
+            if value is not None
+        ]
+
+
+_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+PROFILES = {
+    # Значения SQLite по умолчанию: откат через журнал, читатели и писатель
+    # блокируют друг друга, внешние ключи не проверяются
+    "default": SQLiteProfile(),
+    # WAL: читатели не ждут писателя и наоборот. synchronous=NORMAL в WAL
+    # не портит базу при сбое, но последние транзакции могут откатиться
+    # при отключении питания (не при падении процесса)
+    "tuned": SQLiteProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        busy_timeout_ms=5000,
+        cache_size_kb=64 * 1024,
+        mmap_size_mb=256,
+        temp_store="MEMORY",
+        foreign_keys=True,
+    ),
+}
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "on", "yes")
+
+
+_CASTS: dict[str, Callable[[str], object]] = {
+    "busy_timeout_ms": int,
+    "cache_size_kb": int,
+    "mmap_size_mb": int,
+    "foreign_keys": _parse_bool,
+}
+
+
+def load_profile(name: Optional[str] = None) -> SQLiteProfile:
+    # Профиль по имени и поверх него отдельные SQLITE_<PRAGMA> из окружения
+    profile = PROFILES[name or SQLITE_PROFILE]
+    overrides = {}
+    for field in fields(SQLiteProfile):
+        value = os.getenv(f"SQLITE_{field.name.upper()}")
+        if value is not None:
+            overrides[field.name] = _CASTS.get(field.name, str)(value)
+    return replace(profile, **overrides)
+
+
+def install_profile(engine: Engine, profile: SQLiteProfile) -> None:
+    statements = profile.pragmas()
+    if not statements:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def checkpoint(db: Session, mode: str = "PASSIVE") -> tuple[int, int, int]:
+    # (занят ли, страниц в WAL, перенесено в базу); вне WAL - (0, -1, -1).
+    # PASSIVE не ждёт читателей и писателя, переносит сколько может
+    if mode.upper() not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+        raise ValueError(f"Invalid checkpoint mode: {mode!r}")
+    row = db.connection().exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+    db.commit()
+    return tuple(row)
+
+
+def optimize(db: Session) -> None:
+    # Статистика планировщика обновляется только для таблиц, которым она
+    # нужна по запросам этого соединения; с лимитом это миллисекунды
+    connection = db.connection()
+    connection.exec_driver_sql(f"PRAGMA analysis_limit = {int(SQLITE_ANALYSIS_LIMIT)}")
+    connection.exec_driver_sql("PRAGMA optimize")
+    db.commit()
+
+
+class StorageMaintenance:
+    """Фоновые checkpoint WAL и PRAGMA optimize по расписанию.
+
+    Автоматический checkpoint SQLite срабатывает внутри коммита, который
+    перевалил за 1000 страниц WAL, и не может перенести страницы, пока их
+    читают: под постоянной нагрузкой WAL растёт, а чтение из него
+    замедляется. Здесь checkpoint выполняется отдельно от запросов,
+    в потоке БД, раз в ``checkpoint_interval`` секунд.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        checkpoint_interval: float = SQLITE_CHECKPOINT_INTERVAL_SECONDS,
+        optimize_interval: float = SQLITE_OPTIMIZE_INTERVAL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.checkpoint_interval = checkpoint_interval
+        self.optimize_interval = optimize_interval
+        self.last_checkpoint: Optional[tuple[int, int, int]] = None
+        self.checkpoints = 0
+        self.optimizations = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        intervals = [
+            i for i in (self.checkpoint_interval, self.optimize_interval) if i > 0
+        ]
+        if intervals and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(min(intervals))
+            )
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Перед остановкой: статистика для следующего запуска и короткий WAL
+        await self.run_once(optimize_due=self.optimize_interval > 0)
+
+    async def run_once(self, optimize_due: bool) -> None:
+        await run_db(self._maintain, optimize_due)
+
+    def _maintain(self, optimize_due: bool) -> None:
+        db = self.session_factory()
+        try:
+            if self.checkpoint_interval > 0:
+                self.last_checkpoint = checkpoint(db)
+                self.checkpoints += 1
+            if optimize_due:
+                optimize(db)
+                self.optimizations += 1
+        finally:
+            db.close()
+
+    async def _run(self, tick: float) -> None:
+        next_optimize = time.monotonic() + self.optimize_interval
+        while True:
+            await asyncio.sleep(tick)
+            optimize_due = self.optimize_interval > 0 and (
+                time.monotonic() >= next_optimize
+            )
+            if optimize_due:
+                next_optimize = time.monotonic() + self.optimize_interval
+            try:
+                await self.run_once(optimize_due)
+            except Exception:
+                # Обслуживание не должно ронять приложение: повтор на следующем такте
+                logger.exception("SQLite maintenance failed")
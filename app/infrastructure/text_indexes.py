@@ -0,0 +1,411 @@
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+from uuid import UUID
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+class DictionaryIndex(Protocol):
+    nbytes: int
+
+
+IndexT = TypeVar("IndexT", bound=DictionaryIndex)
+R = TypeVar("R")
+
+
+class PrefixIndex:
+    """Отсортированный массив нормализованных строк для поиска по префиксу."""
+
+    __slots__ = ("_keys", "_texts", "nbytes")
+
+    def __init__(self, texts: Iterable[str] = ()):
+        pairs = sorted((self._key(text), text) for text in texts)
+        self._keys = [key for key, _ in pairs]
+        self._texts = [text for _, text in pairs]
+        self.nbytes = sum(self._item_size(k, t) for k, t in pairs)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, text: str) -> None:
+        key = self._key(text)
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._texts.insert(position, text)
+        self.nbytes += self._item_size(key, text)
+
+    def remove(self, text: str) -> None:
+        key = self._key(text)
+        position = bisect_left(self._keys, key)
+        while position < len(self._keys) and self._keys[position] == key:
+            if self._texts[position] == text:
+                del self._keys[position]
+                del self._texts[position]
+                self.nbytes -= self._item_size(key, text)
+                return
+            position += 1
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        prefix = normalize_text(prefix)
+        position = bisect_left(self._keys, prefix)
+        suggestions: list[str] = []
+        seen: set[str] = set()
+
+        while position < len(self._keys) and len(suggestions) < limit:
+            if not self._keys[position].startswith(prefix):
+                break
+            text = self._texts[position]
+            if text not in seen:
+                seen.add(text)
+                suggestions.append(text)
+            position += 1
+
+        return suggestions
+
+    @staticmethod
+    def _key(text: str) -> str:
+        key = normalize_text(text)
+        # Для уже нормализованных строк храним один объект вместо двух
+        return text if key == text else key
+
+    @staticmethod
+    def _item_size(key: str, text: str) -> int:
+        size = sys.getsizeof(text) + 2 * 8
+        return size if key is text else size + sys.getsizeof(key)
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Расстояние Дамерау-Левенштейна (OSA) или None, если оно больше порога."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+
+    # Общие префикс и суффикс на расстояние не влияют
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b)
+
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            value = previous[j - 1] + (char_a != char_b)
+            if current[j - 1] < value:
+                value = current[j - 1] + 1
+            if previous[j] < value:
+                value = previous[j] + 1
+            if (
+                i > 1
+                and j > 1
+                and char_a == b[j - 2]
+                and a[i - 2] == char_b
+                and previous2[j - 2] < value
+            ):
+                value = previous2[j - 2] + 1
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return None
+        previous2, previous = previous, current
+
+    distance = previous[-1]
+    return distance if distance <= max_distance else None
+
+
+class FuzzyMatch(NamedTuple):
+    entry_id: UUID
+    original_text: str
+    translated_text: str
+    field: str
+    distance: int
+    score: float
+
+
+# Строка индекса: (id записи, оригинал, перевод)
+IndexRow = tuple[UUID, str, str]
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм по оригиналу и переводу записей.
+
+    Триграммы только отбирают кандидатов; точный порядок задаёт
+    ограниченное расстояние редактирования, которое считается лишь
+    для кандидатов с достаточным числом общих триграмм.
+    """
+
+    FIELDS = ("original_text", "translated_text")
+
+    __slots__ = (
+        "_rows",
+        "_keys",
+        "_postings",
+        "_lengths",
+        "_positions",
+        "_dead",
+        "nbytes",
+    )
+
+    def __init__(self, rows: Iterable[IndexRow] = ()):
+        self._load(rows)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _load(self, rows: Iterable[IndexRow]) -> None:
+        self._rows: list[Optional[IndexRow]] = []
+        self._keys: list[str] = []
+        self._postings: dict[str, array] = {}
+        # Слоты по длине ключа: для коротких запросов, где триграмм мало
+        self._lengths: dict[int, array] = {}
+        self._positions: dict[UUID, int] = {}
+        self._dead = 0
+        self.nbytes = 0
+        for row in rows:
+            self.add(row)
+
+    @staticmethod
+    def key(text: str) -> str:
+        return " ".join(normalize_text(text).split())
+
+    @staticmethod
+    def trigrams(key: str) -> set[str]:
+        padded = f"  {key} "
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, row: IndexRow) -> None:
+        document = len(self._rows)
+        self._rows.append(row)
+        self._positions[row[0]] = document
+        self.nbytes += sys.getsizeof(row) + 8
+
+        # Слот = документ * 2 + номер поля
+        for field_no, text in enumerate(row[1:]):
+            key = self.key(text)
+            self._keys.append(key)
+            self.nbytes += sys.getsizeof(key) + 8
+            slot = document * 2 + field_no
+            for trigram in self.trigrams(key):
+                postings = self._postings.get(trigram)
+                if postings is None:
+                    postings = self._postings[trigram] = array("I")
+                    self.nbytes += sys.getsizeof(trigram) + 64
+                postings.append(slot)
+                self.nbytes += postings.itemsize
+            bucket = self._lengths.get(len(key))
+            if bucket is None:
+                bucket = self._lengths[len(key)] = array("I")
+                self.nbytes += 64
+            bucket.append(slot)
+            self.nbytes += bucket.itemsize
+
+    def remove(self, entry_id: UUID) -> None:
+        document = self._positions.pop(entry_id, None)
+        if document is None:
+            return
+        self._rows[document] = None
+        self._dead += 1
+        # Слоты удалённых записей остаются в списках; при большой доле
+        # мусора индекс пересобирается целиком
+        if self._dead * 2 > len(self._rows):
+            self._load([row for row in self._rows if row is not None])
+
+    def search(
+        self, query: str, limit: int = 10, max_distance: int = 2
+    ) -> list[FuzzyMatch]:
+        key = self.key(query)
+        if not key:
+            return []
+        grams = self.trigrams(key)
+
+        # q-граммная лемма: правка (включая перестановку соседних символов)
+        # портит не больше четырёх триграмм. Фильтр точен, пока кандидат
+        # обязан делить с запросом хотя бы одну триграмму; для коротких
+        # запросов кандидаты перебираются по длине ключа
+        if len(grams) - 4 * max_distance < 1:
+            candidates = self._scan_lengths(key, len(grams), max_distance)
+        else:
+            candidates = self._trigram_candidates(key, grams, max_distance)
+
+        # Кандидаты с большим числом общих триграмм проверяются первыми;
+        # нижняя граница расстояния остальных позволяет остановиться раньше
+        candidates.sort(reverse=True)
+        found = [0] * (max_distance + 1)
+        best: dict[int, FuzzyMatch] = {}
+        for count, slot, candidate in candidates:
+            lower_bound = -(-(len(grams) - count) // 4)
+            if sum(found[:lower_bound]) >= limit:
+                break
+            distance = bounded_edit_distance(key, candidate, max_distance)
+            if distance is None:
+                continue
+
+            document, field_no = divmod(slot, 2)
+            current = best.get(document)
+            if current is not None:
+                if current.distance <= distance:
+                    continue
+                found[current.distance] -= 1
+            score = 1 - distance / max(len(key), len(candidate))
+            row = self._rows[document]
+            best[document] = FuzzyMatch(*row, self.FIELDS[field_no], distance, score)
+            found[distance] += 1
+
+        return sorted(best.values(), key=lambda m: (m.distance, -m.score))[:limit]
+
+    def _scan_lengths(
+        self, key: str, grams: int, max_distance: int
+    ) -> list[tuple[int, int, str]]:
+        # Все живые ключи подходящей длины; число общих триграмм не
+        # считается, и ранняя остановка по нижней границе не срабатывает
+        candidates = []
+        for length in range(len(key) - max_distance, len(key) + max_distance + 1):
+            for slot in self._lengths.get(length, ()):
+                if self._rows[slot >> 1] is not None:
+                    candidates.append((grams, slot, self._keys[slot]))
+        return candidates
+
+    def _trigram_candidates(
+        self, key: str, grams: set[str], max_distance: int
+    ) -> list[tuple[int, int, str]]:
+        min_shared = len(grams) - 4 * max_distance
+
+        # Префиксная фильтрация: кандидат с min_shared общими триграммами
+        # обязательно встречается в одном из len - min_shared + 1 самых
+        # редких списков. Частые триграммы проверяются только у кандидатов
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        probe = len(grams) - min_shared + 1
+        rare, frequent = ordered[:probe], ordered[probe:]
+
+        shared: Counter[int] = Counter()
+        for trigram in rare:
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                shared.update(postings)
+
+        candidates: list[tuple[int, int, str]] = []
+        for slot, count in shared.items():
+            candidate = self._keys[slot]
+            if abs(len(candidate) - len(key)) > max_distance:
+                continue
+            if self._rows[slot >> 1] is None:
+                continue
+            if frequent:
+                padded = f"  {candidate} "
+                count += sum(trigram in padded for trigram in frequent)
+            if count >= min_shared:
+                candidates.append((count, slot, candidate))
+        return candidates
+
+
+class DictionaryIndexCache(Generic[IndexT]):
+    """LRU-кэш индексов по словарям с ограничением по памяти.
+
+    Индекс строится лениво при первом обращении. Изменения записей
+    применяются к уже загруженным индексам инкрементально; если запись
+    произошла во время построения, построенный индекс не кэшируется.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._indexes: OrderedDict[Hashable, IndexT] = OrderedDict()
+        self._generations: dict[Hashable, int] = {}
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._indexes
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, key: Hashable, build: Callable[[], IndexT]) -> IndexT:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+            generation = self._generations.get(key, 0)
+
+        # Построение идёт без блокировки: оно читает БД и может быть долгим
+        index = build()
+
+        with self._lock:
+            if self._generations.get(key, 0) == generation and key not in self:
+                self._indexes[key] = index
+                self._nbytes += index.nbytes
+                self._evict()
+            return self._indexes.get(key, index)
+
+    def read(
+        self, key: Hashable, build: Callable[[], IndexT], reader: Callable[[IndexT], R]
+    ) -> R:
+        index = self.get(key, build)
+        # Чтение под той же блокировкой, что и инкрементальные изменения
+        with self._lock:
+            return reader(index)
+
+    def apply(self, key: Hashable, change: Callable[[IndexT], None]) -> None:
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            index = self._indexes.get(key)
+            if index is None:
+                return
+
+            before = index.nbytes
+            change(index)
+            self._nbytes += index.nbytes - before
+            self._evict()
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            index = self._indexes.pop(key, None)
+            if index is not None:
+                self._nbytes -= index.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._indexes):
+                self.invalidate(key)
+
+    def _evict(self) -> None:
+        # Самый свежий индекс оставляем, даже если он один больше бюджета
+        while self._nbytes > self.max_bytes and len(self._indexes) > 1:
+            _, index = self._indexes.popitem(last=False)
+            self._nbytes -= index.nbytes
+
+
+prefix_indexes: DictionaryIndexCache[PrefixIndex] = DictionaryIndexCache(
+    max_bytes=64 * 1024 * 1024
+)
+trigram_indexes: DictionaryIndexCache[TrigramIndex] = DictionaryIndexCache(
+    max_bytes=256 * 1024 * 1024
+)
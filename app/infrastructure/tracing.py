@@ -0,0 +1,388 @@
+import functools
+import inspect
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Protocol, TypeVar
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+F = TypeVar("F", bound=Callable[..., Any])
+C = TypeVar("C", bound=type)
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "memory")
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "traces.jsonl")
+TRACE_JSONL_QUEUE_SIZE = int(os.getenv("TRACE_JSONL_QUEUE_SIZE", "10000"))
+TRACE_SLOW_REQUEST_MS = float(os.getenv("TRACE_SLOW_REQUEST_MS", "0"))
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "1000"))
+
+logger = logging.getLogger(__name__)
+
+
+class Trace:
+    __slots__ = ("trace_id", "sampled", "started_at", "max_spans", "spans", "dropped")
+
+    def __init__(self, sampled: bool, max_spans: int = TRACE_MAX_SPANS):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.max_spans = max_spans
+        self.spans = 0
+        self.dropped = 0
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "trace",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "children",
+        "start",
+        "end",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace: Trace,
+        parent: Optional["Span"] = None,
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        trace.spans += 1
+        self.name = name
+        self.trace = trace
+        self.span_id = trace.spans
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes if attributes is not None else {}
+        self.children: list[Span] = []
+        self.end: Optional[float] = None
+        self.start = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, "Span"]]:
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+# Текущий span запроса; run_db переносит его в поток пула вместе с контекстом
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    # Вне записываемой трассы - ничего, и это самый частый случай
+    parent = current_span.get()
+    if parent is None:
+        return None
+    trace = parent.trace
+    if trace.spans >= trace.max_spans:
+        trace.dropped += 1
+        return None
+    span = Span(name, trace, parent, attributes)
+    parent.children.append(span)
+    return span
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    opened = start_span(name, **attributes)
+    if opened is None:
+        yield None
+        return
+    token = current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.attributes["error"] = repr(e)
+        raise
+    finally:
+        opened.end = time.perf_counter()
+        current_span.reset(token)
+
+
+def traced(fn: F) -> F:
+    """Оборачивает функцию в span с именем ``Класс.метод``.
+
+    Вне трассы обёртка стоит одного чтения ContextVar. Функции-генераторы
+    не оборачиваются: их тело выполняется уже после возврата из вызова.
+    """
+    if inspect.isgeneratorfunction(fn) or inspect.isasyncgenfunction(fn):
+        return fn
+    name = fn.__qualname__
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            opened = start_span(name)
+            if opened is None:
+                return await fn(*args, **kwargs)
+            token = current_span.set(opened)
+            try:
+                return await fn(*args, **kwargs)
+            except BaseException as e:
+                opened.attributes["error"] = repr(e)
+                raise
+            finally:
+                opened.end = time.perf_counter()
+                current_span.reset(token)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        opened = start_span(name)
+        if opened is None:
+            return fn(*args, **kwargs)
+        token = current_span.set(opened)
+        try:
+            return fn(*args, **kwargs)
+        except BaseException as e:
+            opened.attributes["error"] = repr(e)
+            raise
+        finally:
+            opened.end = time.perf_counter()
+            current_span.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def trace_methods(cls: C) -> C:
+    # Публичные методы класса; внутренние помечаются @traced по одному
+    for name, value in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(value):
+            setattr(cls, name, traced(value))
+    return cls
+
+
+class SpanExporter(Protocol):
+    def export(self, root: Span) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class InMemoryExporter:
+    def __init__(self, max_traces: int = 1000):
+        self.traces: deque[Span] = deque(maxlen=max_traces)
+
+    def export(self, root: Span) -> None:
+        self.traces.append(root)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlExporter:
+    """Одна строка JSON на трассу: корень и плоский список span.
+
+    Сериализация и запись в файл идут в отдельном потоке: ``export``
+    вызывается из event loop в конце запроса и только кладёт трассу
+    в очередь. Если диск не успевает и очередь заполнена, трасса
+    отбрасывается (счётчик ``dropped``), а не задерживает ответ.
+    """
+
+    def __init__(self, path: Path, max_queue: int = TRACE_JSONL_QUEUE_SIZE):
+        self.path = Path(path)
+        self.dropped = 0
+        self._queue: queue.Queue[Optional[Span]] = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, root: Span) -> None:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(root)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Дождаться записи всех трасс, поставленных в очередь."""
+        self._queue.join()
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-jsonl-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        with self.path.open("ab") as file:
+            while True:
+                # Всё, что накопилось в очереди, пишется одним вызовом
+                batch = [self._queue.get()]
+                while len(batch) < self._queue.maxsize:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                roots = [root for root in batch if root is not None]
+                try:
+                    file.write(
+                        b"".join(
+                            orjson.dumps(trace_to_dict(root)) + b"\n" for root in roots
+                        )
+                    )
+                    file.flush()
+                except Exception:
+                    logger.exception("Failed to write traces to %s", self.path)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(roots) < len(batch):
+                    return
+
+
+def trace_to_dict(root: Span) -> dict[str, Any]:
+    trace = root.trace
+    return {
+        "trace_id": trace.trace_id,
+        "name": root.name,
+        "started_at": trace.started_at,
+        "duration_ms": round(root.duration * 1000, 3),
+        "dropped_spans": trace.dropped,
+        "spans": [
+            {
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "name": span.name,
+                "start_ms": round((span.start - root.start) * 1000, 3),
+                "duration_ms": round(span.duration * 1000, 3),
+                "attributes": span.attributes,
+            }
+            for _, span in root.walk()
+        ],
+    }
+
+
+def format_tree(root: Span) -> str:
+    lines = []
+    for depth, span in root.walk():
+        attributes = " ".join(f"{k}={v}" for k, v in span.attributes.items())
+        lines.append(
+            f"{'  ' * depth}{span.duration * 1000:9.3f} ms  {span.name}"
+            + (f"  {attributes}" if attributes else "")
+        )
+    if root.trace.dropped:
+        lines.append(f"... {root.trace.dropped} spans dropped")
+    return "\n".join(lines)
+
+
+class Tracer:
+    """Головное сэмплирование трасс запросов и журнал медленных запросов.
+
+    Решение о записи принимается в начале запроса: с вероятностью
+    ``sample_rate`` трасса пишется и уходит в экспортёр. Если задан порог
+    ``slow_request_ms``, записываются все запросы, но экспортируются
+    только сэмплированные; дерево span запроса дольше порога попадает
+    в журнал. Без сэмплирования и порога трассы не создаются вовсе.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        exporter: Optional[SpanExporter] = None,
+        slow_request_ms: float = TRACE_SLOW_REQUEST_MS,
+        max_spans: int = TRACE_MAX_SPANS,
+    ):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.slow_request_ms = slow_request_ms
+        self.max_spans = max_spans
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.slow_request_ms > 0
+
+    def start_trace(self, name: str, **attributes) -> Optional[Span]:
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        if not sampled and self.slow_request_ms <= 0:
+            return None
+        return Span(name, Trace(sampled, self.max_spans), attributes=attributes)
+
+    def finish(self, root: Span) -> None:
+        root.end = time.perf_counter()
+        if root.trace.sampled and self.exporter is not None:
+            self.exporter.export(root)
+        duration_ms = root.duration * 1000
+        if 0 < self.slow_request_ms <= duration_ms:
+            logger.warning(
+                "Slow request %s: %.1f ms (threshold %.1f ms), trace %s\n%s",
+                root.name,
+                duration_ms,
+                self.slow_request_ms,
+                root.trace.trace_id,
+                format_tree(root),
+            )
+
+
+def create_exporter() -> SpanExporter:
+    if TRACE_EXPORTER == "jsonl":
+        return JsonlExporter(Path(TRACE_JSONL_PATH))
+    return InMemoryExporter()
+
+
+tracer = Tracer(exporter=create_exporter())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Текст запроса разбирается только внутри записываемой трассы
+    if current_span.get() is None:
+        return
+    span = start_span(
+        f"SQL {statement.lstrip()[:6].upper()}",
+        statement=" ".join(statement.split())[:200],
+    )
+    if span is not None and executemany:
+        span.attributes["executemany"] = True
+    context._trace_span = span
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.end = time.perf_counter()
+
+
+def _handle_error(exception_context) -> None:
+    context = exception_context.execution_context
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.end = time.perf_counter()
+        span.attributes["error"] = repr(exception_context.original_exception)
+
+
+def instrument_queries() -> None:
+    # На классе Engine, как и метрики: учитываются все движки
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
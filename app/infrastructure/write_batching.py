@@ -0,0 +1,133 @@
+import asyncio
+import os
+from typing import Callable, Optional, Union
+
+from sqlalchemy.orm import Session
+
+from app.domain import Entry
+
+from .database import SessionLocal
+from .entry_repository import EntryRepository
+from .executor import run_db
+
+ENTRY_WRITE_BATCHING = os.getenv("ENTRY_WRITE_BATCHING", "0") == "1"
+ENTRY_BATCH_MAX_SIZE = int(os.getenv("ENTRY_BATCH_MAX_SIZE", "200"))
+ENTRY_BATCH_MAX_DELAY_MS = float(os.getenv("ENTRY_BATCH_MAX_DELAY_MS", "5"))
+
+_Pending = tuple[Entry, "asyncio.Future[Entry]"]
+
+
+class EntryWriteBatcher:
+    """Групповой коммит одиночных вставок записей.
+
+    Вставки из разных запросов собираются в очередь; одна задача-писатель
+    ждёт до ``max_delay`` секунд или ``max_size`` записей и пишет пачку
+    одной транзакцией через ``EntryRepository.bulk_create``. Пока пачка
+    пишется, следующая копится в очереди. Если транзакция пачки не прошла,
+    записи повторяются по одной, и каждый вызывающий получает свой
+    результат или свою ошибку.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_size: int = ENTRY_BATCH_MAX_SIZE,
+        max_delay: float = ENTRY_BATCH_MAX_DELAY_MS / 1000,
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.batches = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: "asyncio.Queue[_Pending]"
+        self._writer: Optional[asyncio.Task] = None
+
+    async def submit(self, entry: Entry) -> Entry:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Очередь и задача привязаны к event loop, в котором созданы
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._run())
+
+        future: "asyncio.Future[Entry]" = loop.create_future()
+        self._queue.put_nowait((entry, future))
+        return await future
+
+    async def close(self) -> None:
+        if self._writer is None:
+            return
+        # Писатель дописывает то, что уже в очереди, и останавливается
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._loop = self._writer = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_delay
+            while len(batch) < self.max_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await run_db(self._write, [entry for entry, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                self._queue.task_done()
+                # Вызывающий мог уйти (отмена запроса), запись при этом сделана
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _write(self, entries: list[Entry]) -> list[Union[Entry, Exception]]:
+        db = self.session_factory()
+        try:
+            results, grouped = write_entry_batch(EntryRepository(db), entries)
+            self.batches += grouped
+            return results
+        finally:
+            db.close()
+
+
+def write_entry_batch(
+    repository: EntryRepository, entries: list[Entry]
+) -> tuple[list[Union[Entry, Exception]], bool]:
+    # Пачка одной транзакцией; если она не прошла, записи повторяются
+    # по одной. Второй элемент - удался ли групповой коммит
+    try:
+        repository.bulk_create(entries)
+        return list(entries), True
+    except ValueError as e:
+        if len(entries) == 1:
+            return [e], False
+
+    results: list[Union[Entry, Exception]] = []
+    for entry in entries:
+        try:
+            repository.bulk_create([entry])
+            results.append(entry)
+        except ValueError as e:
+            results.append(e)
+    return results, False
+
+
+entry_batcher = EntryWriteBatcher(SessionLocal) if ENTRY_WRITE_BATCHING else None
+
+
+def get_entry_batcher() -> Optional[EntryWriteBatcher]:
+    return entry_batcher
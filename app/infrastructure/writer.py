@@ -0,0 +1,487 @@
+"""Отдельный процесс-писатель для нескольких воркеров над одной базой SQLite.
+
+Запуск: ``WRITER_SOCKET=/run/dictionary-library/writer.sock
+python -m app.infrastructure.writer``; воркерам задаётся тот же
+``WRITER_SOCKET``.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import pickle
+import signal
+import struct
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy.orm import Session
+
+from . import cache, text_indexes, tracing
+from .cache import CacheBackend
+from .database import SessionLocal
+from .entry_repository import EntryRepository
+from .executor import DatabaseExecutor
+from .migrations import prepare_database
+from .repository import DictionaryRepository
+from .storage import StorageMaintenance
+from .text_indexes import DictionaryIndexCache
+from .write_batching import ENTRY_BATCH_MAX_SIZE, write_entry_batch
+
+WRITER_SOCKET = os.getenv("WRITER_SOCKET")
+WRITER_QUEUE_SIZE = int(os.getenv("WRITER_QUEUE_SIZE", "1000"))
+WRITER_MAX_IN_FLIGHT = int(os.getenv("WRITER_MAX_IN_FLIGHT", "64"))
+WRITER_TIMEOUT_SECONDS = float(os.getenv("WRITER_TIMEOUT_SECONDS", "5"))
+
+# Методы репозиториев, которые воркер может выполнить в писателе
+WRITE_OPERATIONS = frozenset(
+    {
+        "DictionaryRepository.create",
+        "DictionaryRepository.update",
+        "DictionaryRepository.update_fields",
+        "DictionaryRepository.delete",
+        "EntryRepository.create",
+        "EntryRepository.bulk_create",
+        "EntryRepository.insert_new",
+        "EntryRepository.delete",
+    }
+)
+# Подряд идущие вставки записей коммитятся одной транзакцией
+_GROUPED = "EntryRepository.create"
+
+_HEADER = struct.Struct("!I")
+
+logger = logging.getLogger(__name__)
+
+
+class WriterUnavailableError(RuntimeError):
+    pass
+
+
+class WriterOverloadedError(WriterUnavailableError):
+    pass
+
+
+class WriterNoReplyError(WriterUnavailableError):
+    # Запрос уже отправлен: запись могла быть сделана, повторять её небезопасно
+    pass
+
+
+def encode_frame(message: Any) -> bytes:
+    # Кадр - длина и pickle: сокет локальный, с правами только владельца,
+    # и по обе стороны один и тот же код приложения
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+class ChangeLog:
+    def __init__(self):
+        self.keys: list[str] = []
+        self.dictionaries: set[Hashable] = set()
+        # Значения, которые запись сама кладёт в кэш (метки удаления)
+        self.marks: dict[str, Any] = {}
+        # Инкрементальные изменения индексов: (индекс, словарь, изменение)
+        self.index_changes: list[tuple[str, Hashable, Callable]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.keys or self.dictionaries or self.marks or self.index_changes)
+
+
+class _RecordingCache:
+    # Кэш писателя, который запоминает инвалидированные ключи для воркеров
+    def __init__(self, backend: CacheBackend, changes: ChangeLog):
+        self._backend = backend
+        self._changes = changes
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._backend, name)
+
+    def delete(self, *keys: str) -> None:
+        self._changes.keys.extend(keys)
+        self._backend.delete(*keys)
+
+    def set(self, key: str, value: Any, version: Optional[int] = None) -> None:
+        # Без версии кэш заполняет сама запись, а не чтение из БД
+        if version is None:
+            self._changes.marks[key] = value
+        self._backend.set(key, value, version)
+
+
+class _RecordingIndexes:
+    # Индексы автодополнения и нечёткого поиска в писателе не строятся:
+    # изменения записывают, чтобы воркеры применили их к своим индексам
+    def __init__(self, name: str, changes: ChangeLog):
+        self._name = name
+        self._changes = changes
+
+    def apply(self, key: Hashable, change: Callable) -> None:
+        self._changes.index_changes.append((self._name, key, change))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._changes.dictionaries.add(key)
+
+
+class WriterServer:
+    """Единственный писатель базы: принимает записи воркеров по Unix-сокету.
+
+    Все записи выполняются по очереди в одном потоке, и блокировка файла
+    SQLite не разыгрывается между процессами. Очередь ограничена: когда
+    она полна, запрос сразу получает отказ, и воркер отвечает 503, а не
+    копит ожидание. После каждой пачки всем воркерам рассылаются
+    инвалидированные ключи кэша и изменения индексов поиска.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        session_factory: Callable[[], Session] = SessionLocal,
+        queue_size: int = WRITER_QUEUE_SIZE,
+        max_batch: int = ENTRY_BATCH_MAX_SIZE,
+    ):
+        self.path = path
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rejected = 0
+        self._executor = DatabaseExecutor(max_workers=1)
+        # Соединение воркера -> задача, читающая его запросы
+        self._clients: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queue: "asyncio.Queue[tuple]"
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(self.queue_size)
+        Path(self.path).unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        os.chmod(self.path, 0o600)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        # Новые запросы не принимаются, принятые дописываются
+        self._server.close()
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        handlers = list(self._clients.values())
+        for client in list(self._clients):
+            client.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._executor.shutdown()
+        Path(self.path).unlink(missing_ok=True)
+        self._server = self._task = None
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_id, operation, args = await read_frame(reader)
+                if operation not in WRITE_OPERATIONS:
+                    error = WriterUnavailableError(f"Unknown write {operation}")
+                    self._send(writer, ("result", request_id, False, error))
+                    continue
+                try:
+                    self._queue.put_nowait((writer, request_id, operation, args))
+                except asyncio.QueueFull:
+                    self.rejected += 1
+                    error = WriterOverloadedError("Writer queue is full")
+                    self._send(writer, ("result", request_id, False, error))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # Без ожидания: в пачку идёт то, что накопилось, пока писалась
+            # предыдущая, поэтому одиночная запись не ждёт таймера
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            operations = [(operation, args) for _, _, operation, args in batch]
+            try:
+                results, changes = await self._executor.run(self._execute, operations)
+            except Exception as e:
+                results, changes = [(False, e)] * len(batch), ChangeLog()
+
+            # Рассылка уходит раньше ответов: воркер, сделавший запись,
+            # сбросит свой кэш до того, как его запрос завершится
+            if changes:
+                message = (
+                    "changes",
+                    changes.keys,
+                    changes.dictionaries,
+                    changes.marks,
+                    changes.index_changes,
+                )
+                for client in list(self._clients):
+                    self._send(client, message)
+            for (client, request_id, _, _), (ok, value) in zip(batch, results):
+                self._queue.task_done()
+                self._send(client, ("result", request_id, ok, value))
+
+    def _execute(
+        self, operations: list[tuple[str, tuple]]
+    ) -> tuple[list[tuple[bool, Any]], ChangeLog]:
+        changes = ChangeLog()
+        entity_cache = _RecordingCache(cache.entity_cache, changes)
+        db = self.session_factory()
+        repositories = {
+            "DictionaryRepository": DictionaryRepository(db, entity_cache=entity_cache),
+            "EntryRepository": EntryRepository(
+                db,
+                prefix_indexes=_RecordingIndexes("prefix", changes),
+                trigram_indexes=_RecordingIndexes("trigram", changes),
+                entity_cache=entity_cache,
+            ),
+        }
+        results: list[tuple[bool, Any]] = []
+        try:
+            for operation, group in groupby(operations, key=itemgetter(0)):
+                calls = [args for _, args in group]
+                if operation == _GROUPED:
+                    written, grouped = write_entry_batch(
+                        repositories["EntryRepository"], [args[0] for args in calls]
+                    )
+                    self.batches += grouped
+                    results.extend(
+                        (not isinstance(result, Exception), result)
+                        for result in written
+                    )
+                    continue
+
+                name, method = operation.split(".")
+                for args in calls:
+                    try:
+                        result = getattr(repositories[name], method)(*args)
+                    except Exception as e:
+                        db.rollback()
+                        results.append((False, e))
+                        continue
+                    results.append((True, result))
+                    if operation == "DictionaryRepository.delete" and result:
+                        # Индексы удалённого словаря воркеры сбрасывают целиком
+                        changes.dictionaries.add(args[0])
+        finally:
+            db.close()
+        return results, changes
+
+    def _send(self, client: asyncio.StreamWriter, message: tuple) -> None:
+        if client.is_closing():
+            return
+        try:
+            frame = encode_frame(message)
+        except Exception as e:
+            # Исключение, которое не сериализуется, передаётся текстом
+            kind, request_id, *_ = message
+            frame = encode_frame((kind, request_id, False, RuntimeError(repr(e))))
+        client.write(frame)
+
+
+class WriterClient:
+    """Соединение воркера с процессом-писателем.
+
+    Запросы идут по одному соединению, ответы сопоставляются по номеру.
+    Ответа одновременно ждут не больше ``max_in_flight`` запросов, остальные
+    ждут места до ``timeout`` секунд и получают WriterOverloadedError.
+    Рассылки писателя применяются к кэшу и индексам этого процесса.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_in_flight: int = WRITER_MAX_IN_FLIGHT,
+        timeout: float = WRITER_TIMEOUT_SECONDS,
+        entity_cache: Optional[CacheBackend] = None,
+        index_caches: Optional[dict[str, DictionaryIndexCache]] = None,
+    ):
+        self.path = path
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.entity_cache = entity_cache
+        self.index_caches = index_caches
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: asyncio.Semaphore
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        # При старте воркера писатель может быть ещё не готов: соединение
+        # откроет первый запрос на запись
+        self._bind_loop()
+        try:
+            await self._connection()
+        except WriterUnavailableError as e:
+            logger.warning("%s", e)
+
+    async def call(self, operation: str, *args: Any) -> Any:
+        loop = self._bind_loop()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise WriterOverloadedError(
+                f"{self.max_in_flight} writes are already waiting for the writer"
+            ) from None
+        try:
+            with tracing.span(f"writer {operation}"):
+                connection = await self._connection()
+                self._next_id += 1
+                request_id = self._next_id
+                future = self._pending[request_id] = loop.create_future()
+                connection.write(encode_frame((request_id, operation, args)))
+                try:
+                    ok, value = await asyncio.wait_for(future, self.timeout)
+                except asyncio.TimeoutError:
+                    raise WriterNoReplyError(
+                        f"No reply from writer in {self.timeout} s"
+                    ) from None
+                finally:
+                    self._pending.pop(request_id, None)
+        finally:
+            self._slots.release()
+        if not ok:
+            raise value
+        return value
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        self._loop = self._writer = self._reader_task = None
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Соединение и семафор привязаны к event loop, в котором созданы
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._pending = {}
+            self._writer = self._reader_task = None
+        return loop
+
+    async def _connection(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+        try:
+            reader, self._writer = await asyncio.open_unix_connection(self.path)
+        except OSError as e:
+            raise WriterUnavailableError(f"Writer is not reachable: {e}") from e
+        self._reader_task = self._loop.create_task(self._read(reader))
+        return self._writer
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message[0] == "changes":
+                    self._apply(*message[1:])
+                    continue
+                _, request_id, ok, value = message
+                future = self._pending.get(request_id)
+                if future is not None and not future.done():
+                    future.set_result((ok, value))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writer = None
+            error = WriterNoReplyError("Connection to writer lost")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    def _apply(
+        self,
+        keys: list[str],
+        dictionaries: set[Hashable],
+        marks: dict[str, Any],
+        index_changes: list[tuple[str, Hashable, Callable]],
+    ) -> None:
+        entity_cache = (
+            self.entity_cache if self.entity_cache is not None else cache.entity_cache
+        )
+        if keys:
+            entity_cache.delete(*keys)
+        for key, value in marks.items():
+            entity_cache.set(key, value)
+        index_caches = (
+            self.index_caches
+            if self.index_caches is not None
+            else {
+                "prefix": text_indexes.prefix_indexes,
+                "trigram": text_indexes.trigram_indexes,
+            }
+        )
+        # Как и в одном процессе, изменения применяются к загруженным
+        # индексам на месте, без перестроения из базы
+        for name, dictionary_id, change in index_changes:
+            index_cache = index_caches.get(name)
+            if index_cache is not None:
+                index_cache.apply(dictionary_id, change)
+        for dictionary_id in dictionaries:
+            for index_cache in index_caches.values():
+                index_cache.invalidate(dictionary_id)
+
+
+writer_client = WriterClient(WRITER_SOCKET) if WRITER_SOCKET else None
+
+
+def get_writer() -> Optional[WriterClient]:
+    return writer_client
+
+
+async def serve(path: str) -> None:
+    # Писатель сам готовит схему и обслуживает WAL; воркерам в этом
+    # режиме достаточно DB_MIGRATE_ON_STARTUP=0
+    prepare_database(SessionLocal, migrate_schema=True)
+    server = WriterServer(path)
+    storage = StorageMaintenance(SessionLocal)
+    await server.start()
+    storage.start()
+    logger.info("Writer listening on %s", path)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await stopped.wait()
+
+    await server.close()
+    await storage.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.infrastructure.writer")
+    parser.add_argument("--socket", default=WRITER_SOCKET, required=not WRITER_SOCKET)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.socket))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,63 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from app.api import dictionary_router
 from app.api.entry_routers import router as entry_router
-from app.infrastructure import Base, engine
+from app.api.fast_json import FastJSONResponse
+from app.api.metrics import MetricsMiddleware
+from app.api.metrics import router as metrics_router
+from app.api.tracing import TracingMiddleware
+from app.infrastructure import (
+    SessionLocal,
+    cache,
+    engine,
+    get_db,
+    metrics,
+    run_db,
+    text_indexes,
+    tracing,
+)
+from app.infrastructure.database import ping
+from app.infrastructure.migrations import prepare_database
+from app.infrastructure.storage import StorageMaintenance
+from app.infrastructure.write_batching import entry_batcher
+from app.infrastructure.writer import (
+    WriterNoReplyError,
+    WriterUnavailableError,
+    writer_client,
+)
+
+started_at = time.monotonic()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Схема готовится при старте, а не при импорте: импорт базу не трогает,
+    # а на актуальной базе проверка версии - один PRAGMA
+    await run_db(prepare_database, SessionLocal)
+    storage = StorageMaintenance(SessionLocal)
+    if writer_client is None:
+        storage.start()
+    else:
+        # WAL обслуживает процесс-писатель; недоступный писатель не мешает
+        # старту, чтение работает и без него
+        await writer_client.connect()
+    yield
+    if entry_batcher is not None:
+        await entry_batcher.close()
+    if writer_client is not None:
+        await writer_client.close()
+    await storage.close()
+    if tracing.tracer.exporter is not None:
+        # Дописать трассы из очереди экспортёра
+        await run_db(tracing.tracer.exporter.close)
+    engine.dispose()
 
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Personal Dictionary Library",
@@ -13,6 +65,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,6 +76,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Трассировка сама решает, записывать ли запрос (TRACE_SAMPLE_RATE,
+# TRACE_SLOW_REQUEST_MS); вне трассы хуки и обёртки почти ничего не стоят
+app.add_middleware(TracingMiddleware)
+tracing.instrument_queries()
+
+if metrics.METRICS_ENABLED:
+    # Последним добавленный middleware - внешний: время CORS тоже учитывается
+    app.add_middleware(MetricsMiddleware)
+    metrics.instrument_queries()
+    metrics.instrument_pool("main", engine)
+    metrics.instrument_cache("entity", cache.entity_cache)
+    metrics.instrument_index_cache("prefix", text_indexes.prefix_indexes)
+    metrics.instrument_index_cache("trigram", text_indexes.trigram_indexes)
+    app.include_router(metrics_router)
+
+
+@app.exception_handler(WriterUnavailableError)
+async def writer_unavailable(request: Request, exc: WriterUnavailableError):
+    # Писатель перегружен или недоступен: клиенту стоит повторить запрос
+    return FastJSONResponse(
+        {"detail": str(exc)},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(WriterNoReplyError)
+async def writer_no_reply(request: Request, exc: WriterNoReplyError):
+    # Запрос дошёл до писателя, но ответа нет: запись могла быть сделана,
+    # поэтому без Retry-After - слепой повтор может её задвоить
+    return FastJSONResponse(
+        {"detail": str(exc)}, status_code=status.HTTP_504_GATEWAY_TIMEOUT
+    )
+
+
 # Подключение роутеров
 app.include_router(dictionary_router)
 app.include_router(entry_router)
@@ -38,8 +126,23 @@ async def root():
 
 
 @app.get("/health", tags=["health"])
-async def health_check():
-    return {"status": "healthy", "database": "connected", "uptime": "running"}
+async def health_check(response: Response, db: Session = Depends(get_db)):
+    uptime = round(time.monotonic() - started_at, 1)
+    try:
+        latency = await run_db(ping, db)
+    except SQLAlchemyError as e:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {
+            "status": "unhealthy",
+            "database": {"status": "disconnected", "error": str(e)},
+            "uptime_seconds": uptime,
+        }
+
+    return {
+        "status": "healthy",
+        "database": {"status": "connected", "ping_ms": round(latency * 1000, 3)},
+        "uptime_seconds": uptime,
+    }
 
 
 if __name__ == "__main__":
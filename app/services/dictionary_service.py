@@ -1,13 +1,22 @@
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
 from uuid import UUID
 
-from app.domain import Dictionary
+from app.domain import Dictionary, DictionaryStats
+from app.domain.statistics import week_start
+from app.infrastructure.executor import run_db
 from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.tracing import trace_methods
+from app.infrastructure.writer import WriterClient
 
 
+@trace_methods
 class DictionaryService:
-    def __init__(self, repository: DictionaryRepository):
+    def __init__(
+        self, repository: DictionaryRepository, writer: Optional[WriterClient] = None
+    ):
         self.repository = repository
+        self.writer = writer
 
     def create_dictionary(
         self,
@@ -26,19 +35,67 @@ class DictionaryService:
         created = self.repository.create(dictionary)
         return created
 
+    async def add_dictionary(
+        self,
+        name: str,
+        source_language: str,
+        target_language: str,
+        description: Optional[str] = None,
+    ) -> Dictionary:
+        if self.writer is None:
+            return await run_db(
+                self.create_dictionary,
+                name=name,
+                source_language=source_language,
+                target_language=target_language,
+                description=description,
+            )
+
+        dictionary = Dictionary(
+            name=name,
+            description=description,
+            source_language=source_language,
+            target_language=target_language,
+        )
+        return await self.writer.call("DictionaryRepository.create", dictionary)
+
     def get_dictionary(self, dictionary_id: UUID) -> Optional[Dictionary]:
         result = self.repository.get_by_id(dictionary_id)
         return result
 
-    def get_all_dictionaries(self, skip: int = 0, limit: int = 100) -> list[Dictionary]:
-        if skip < 0:
-            skip = 0
-        if limit <= 0:
-            limit = 100
+    def get_dictionary_updated_at(self, dictionary_id: UUID) -> Optional[datetime]:
+        return self.repository.get_updated_at(dictionary_id)
 
-        dictionaries = self.repository.get_all(skip=skip, limit=limit)
+    def get_dictionary_stats(
+        self, dictionary_id: UUID, days: int = 30, weeks: int = 12
+    ) -> Optional[DictionaryStats]:
+        as_of = datetime.utcnow().date()
+        since = min(
+            as_of - timedelta(days=days - 1),
+            week_start(as_of) - timedelta(weeks=weeks - 1),
+        )
+        return self.repository.get_stats(dictionary_id, since, as_of)
+
+    def get_all_dictionaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[Dictionary]:
+        dictionaries = self.repository.get_all(skip=skip, limit=limit, after=after)
         return dictionaries
 
+    def get_all_dictionary_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> Sequence[Sequence]:
+        return self.repository.get_rows(skip=skip, limit=limit, after=after)
+
+    def count_dictionaries(self) -> int:
+        return self.repository.count()
+
     def update_dictionary(
         self,
         dictionary_id: UUID,
@@ -47,21 +104,48 @@ class DictionaryService:
         source_language: Optional[str] = None,
         target_language: Optional[str] = None,
     ) -> Optional[Dictionary]:
-        dictionary = self.repository.get_by_id(dictionary_id)
+        changes = Dictionary.validate_changes(
+            name=name,
+            description=description,
+            source_language=source_language,
+            target_language=target_language,
+        )
+        return self.repository.update_fields(dictionary_id, changes)
 
-        if dictionary is None:
-            return None
+    async def change_dictionary(
+        self,
+        dictionary_id: UUID,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        source_language: Optional[str] = None,
+        target_language: Optional[str] = None,
+    ) -> Optional[Dictionary]:
+        if self.writer is None:
+            return await run_db(
+                self.update_dictionary,
+                dictionary_id,
+                name=name,
+                description=description,
+                source_language=source_language,
+                target_language=target_language,
+            )
 
-        dictionary.update(
+        # Проверка полей в воркере: писатель получает готовый набор колонок
+        changes = Dictionary.validate_changes(
             name=name,
             description=description,
             source_language=source_language,
             target_language=target_language,
         )
-
-        updated = self.repository.update(dictionary)
-        return updated
+        return await self.writer.call(
+            "DictionaryRepository.update_fields", dictionary_id, changes
+        )
 
     def delete_dictionary(self, dictionary_id: UUID) -> bool:
         result = self.repository.delete(dictionary_id)
         return result
+
+    async def remove_dictionary(self, dictionary_id: UUID) -> bool:
+        if self.writer is not None:
+            return await self.writer.call("DictionaryRepository.delete", dictionary_id)
+        return await run_db(self.delete_dictionary, dictionary_id)
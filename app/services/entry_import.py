@@ -0,0 +1,161 @@
+import abc
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Any, Union
+
+IMPORT_FIELDS = ("original_text", "translated_text", "usage_example", "notes")
+# Тело без перевода строки иначе копилось бы в буфере целиком
+IMPORT_MAX_LINE_BYTES = 1 << 20
+# Сколько ошибок попадает в отчёт; остальные только считаются
+IMPORT_MAX_ERRORS = 1000
+
+# Номер строки во входных данных и либо распарсенная запись, либо текст ошибки
+ParsedRow = tuple[int, Union[dict[str, Any], str]]
+
+
+@dataclass
+class RowError:
+    line: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    # Строки, совпавшие с существующей записью (пропущены или слиты)
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    # Ошибки сверх IMPORT_MAX_ERRORS: учтены в failed, но не перечислены
+    errors_omitted: int = 0
+
+    def add_error(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append(RowError(line=line, error=error))
+        else:
+            self.errors_omitted += 1
+
+
+class _RowParser(abc.ABC):
+    """Инкрементальный разбор потока байтов на строки-записи."""
+
+    def __init__(self, max_line_bytes: int = IMPORT_MAX_LINE_BYTES) -> None:
+        self.max_line_bytes = max_line_bytes
+        self._buffer = b""
+        # Остаток слишком длинной строки отбрасывается до перевода строки
+        self._skipping = False
+        self.line_no = 0
+
+    def feed(self, chunk: bytes) -> list[ParsedRow]:
+        if self._skipping:
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                return []
+            chunk = chunk[newline + 1 :]
+            self._skipping = False
+
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        rows = self._consume(lines)
+        if len(self._buffer) > self.max_line_bytes:
+            self.line_no += 1
+            rows.append((self.line_no, self._too_long()))
+            self._buffer = b""
+            self._skipping = True
+        return rows
+
+    def close(self) -> list[ParsedRow]:
+        rest, self._buffer = self._buffer, b""
+        return self._consume([rest] if rest.strip() else [])
+
+    def _consume(self, lines: list[bytes]) -> list[ParsedRow]:
+        rows: list[ParsedRow] = []
+        for raw in lines:
+            self.line_no += 1
+            if len(raw) > self.max_line_bytes:
+                rows.append((self.line_no, self._too_long()))
+                continue
+            try:
+                line = raw.decode("utf-8").rstrip("\r")
+            except UnicodeDecodeError:
+                rows.append((self.line_no, "Invalid UTF-8"))
+                continue
+            row = self._parse_line(line)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def _too_long(self) -> str:
+        return f"Line exceeds {self.max_line_bytes} bytes"
+
+    @abc.abstractmethod
+    def _parse_line(self, line: str) -> Union[ParsedRow, None]:
+        """Строка без перевода строки -> запись, ошибка или None (пропуск)."""
+
+
+class NDJSONRowParser(_RowParser):
+    def _parse_line(self, line: str) -> Union[ParsedRow, None]:
+        if not line.strip():
+            return None
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            return self.line_no, f"Invalid JSON: {e}"
+        if not isinstance(row, dict):
+            return self.line_no, "Row must be a JSON object"
+        return self.line_no, row
+
+
+class CSVRowParser(_RowParser):
+    def __init__(self, max_line_bytes: int = IMPORT_MAX_LINE_BYTES) -> None:
+        super().__init__(max_line_bytes)
+        self._header: list[str] = []
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._start_line = 0
+
+    def close(self) -> list[ParsedRow]:
+        rows = super().close()
+        if self._pending:
+            rows.append((self._start_line, "Unterminated quoted field"))
+            self._pending = []
+        return rows
+
+    def _parse_line(self, line: str) -> Union[ParsedRow, None]:
+        if not self._pending:
+            self._start_line = self.line_no
+            self._pending_size = 0
+        self._pending.append(line)
+        self._pending_size += len(line)
+
+        # Нечётное число кавычек: поле в кавычках продолжается на следующей строке
+        record = "\n".join(self._pending)
+        if record.count('"') % 2:
+            if self._pending_size > self.max_line_bytes:
+                self._pending = []
+                return self._start_line, f"Record exceeds {self.max_line_bytes} bytes"
+            return None
+        self._pending = []
+
+        if not record.strip():
+            return None
+        values = next(csv.reader([record]))
+        if not self._header:
+            self._header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self._header):
+            return (
+                self._start_line,
+                f"Expected {len(self._header)} columns, got {len(values)}",
+            )
+        return self._start_line, {
+            name: value or None for name, value in zip(self._header, values)
+        }
+
+
+ROW_PARSERS: dict[str, type[_RowParser]] = {
+    "ndjson": NDJSONRowParser,
+    "csv": CSVRowParser,
+}
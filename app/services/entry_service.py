@@ -1,13 +1,31 @@
-from typing import Optional
+from datetime import datetime
+from typing import AsyncIterable, Iterator, Optional, Sequence
 from uuid import UUID
 
 from app.domain import Entry
-from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.entry_repository import EntryRepository, OnDuplicate
+from app.infrastructure.executor import run_db
+from app.infrastructure.text_indexes import FuzzyMatch
+from app.infrastructure.tracing import trace_methods
+from app.infrastructure.write_batching import EntryWriteBatcher
+from app.infrastructure.writer import WriterClient
 
+from .entry_import import IMPORT_FIELDS, ROW_PARSERS, ImportReport, ParsedRow
 
+IMPORT_BATCH_SIZE = 5000
+
+
+@trace_methods
 class EntryService:
-    def __init__(self, repository: EntryRepository):
+    def __init__(
+        self,
+        repository: EntryRepository,
+        batcher: Optional[EntryWriteBatcher] = None,
+        writer: Optional[WriterClient] = None,
+    ):
         self.repository = repository
+        self.batcher = batcher
+        self.writer = writer
 
     def create_entry(
         self,
@@ -28,19 +46,243 @@ class EntryService:
         created = self.repository.create(entry)
         return created
 
+    async def add_entry(
+        self,
+        dictionary_id: UUID,
+        original_text: str,
+        translated_text: str,
+        usage_example: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> Entry:
+        # С групповым коммитом запись уходит в общую транзакцию писателя,
+        # ошибки валидации по-прежнему возникают здесь
+        if self.batcher is None and self.writer is None:
+            return await run_db(
+                self.create_entry,
+                dictionary_id,
+                original_text,
+                translated_text,
+                usage_example,
+                notes,
+            )
+
+        entry = Entry(
+            dictionary_id=dictionary_id,
+            original_text=original_text,
+            translated_text=translated_text,
+            usage_example=usage_example,
+            notes=notes,
+        )
+        if self.writer is not None:
+            return await self.writer.call("EntryRepository.create", entry)
+        return await self.batcher.submit(entry)
+
+    async def remove_entry(self, entry_id: UUID) -> bool:
+        if self.writer is not None:
+            return await self.writer.call("EntryRepository.delete", entry_id)
+        return await run_db(self.delete_entry, entry_id)
+
+    async def import_entries(
+        self,
+        dictionary_id: UUID,
+        chunks: AsyncIterable[bytes],
+        format: str = "ndjson",
+        batch_size: int = IMPORT_BATCH_SIZE,
+        on_duplicate: OnDuplicate = "skip",
+    ) -> ImportReport:
+        parser = ROW_PARSERS[format]()
+        report = ImportReport()
+        pending: list[ParsedRow] = []
+
+        async for chunk in chunks:
+            pending.extend(parser.feed(chunk))
+            if len(pending) >= batch_size:
+                await self._import_pending(dictionary_id, pending, report, on_duplicate)
+                pending = []
+
+        pending.extend(parser.close())
+        await self._import_pending(dictionary_id, pending, report, on_duplicate)
+        return report
+
+    async def _import_pending(
+        self,
+        dictionary_id: UUID,
+        rows: list[ParsedRow],
+        report: ImportReport,
+        on_duplicate: OnDuplicate,
+    ) -> None:
+        if self.writer is None:
+            await run_db(self._import_batch, dictionary_id, rows, report, on_duplicate)
+            return
+
+        entries, lines = self._parse_batch(dictionary_id, rows, report)
+        try:
+            if on_duplicate == "error":
+                inserted = await self.writer.call("EntryRepository.insert_new", entries)
+            else:
+                imported = await self.writer.call(
+                    "EntryRepository.bulk_create", entries, on_duplicate
+                )
+        except ValueError as e:
+            for line in lines:
+                report.add_error(line, str(e))
+            return
+
+        if on_duplicate == "error":
+            self._report_conflicts(report, entries, lines, inserted)
+        else:
+            report.imported += imported
+            report.duplicates += len(entries) - imported
+
+    def _import_batch(
+        self,
+        dictionary_id: UUID,
+        rows: list[ParsedRow],
+        report: ImportReport,
+        on_duplicate: OnDuplicate = "skip",
+    ) -> None:
+        entries, lines = self._parse_batch(dictionary_id, rows, report)
+        try:
+            if on_duplicate == "error":
+                inserted = self.repository.insert_new(entries)
+            else:
+                imported = self.repository.bulk_create(entries, on_duplicate)
+        except ValueError as e:
+            for line in lines:
+                report.add_error(line, str(e))
+            return
+
+        if on_duplicate == "error":
+            self._report_conflicts(report, entries, lines, inserted)
+        else:
+            report.imported += imported
+            report.duplicates += len(entries) - imported
+
+    @staticmethod
+    def _report_conflicts(
+        report: ImportReport,
+        entries: list[Entry],
+        lines: list[int],
+        inserted: list[Entry],
+    ) -> None:
+        # Ошибкой считаются только строки, которых нет среди вставленных
+        inserted_ids = {entry.id for entry in inserted}
+        for line, entry in zip(lines, entries):
+            if entry.id not in inserted_ids:
+                report.add_error(
+                    line,
+                    f"Entry '{entry.original_text}' already exists "
+                    f"in dictionary {entry.dictionary_id}",
+                )
+        report.imported += len(inserted)
+
+    def _parse_batch(
+        self, dictionary_id: UUID, rows: list[ParsedRow], report: ImportReport
+    ) -> tuple[list[Entry], list[int]]:
+        entries: list[Entry] = []
+        lines: list[int] = []
+
+        for line, row in rows:
+            if isinstance(row, str):
+                report.add_error(line, row)
+                continue
+
+            values = {name: row.get(name) for name in IMPORT_FIELDS}
+            invalid = [
+                name
+                for name, value in values.items()
+                if value is not None and not isinstance(value, str)
+            ]
+            if invalid:
+                report.add_error(line, f"Field {invalid[0]} must be a string")
+                continue
+
+            try:
+                entries.append(Entry(dictionary_id=dictionary_id, **values))
+            except ValueError as e:
+                report.add_error(line, str(e))
+                continue
+            lines.append(line)
+        return entries, lines
+
+    def search_entries(
+        self, query: str, dictionary_id: Optional[UUID] = None, limit: int = 20
+    ) -> list[tuple[Entry, float, str]]:
+        if limit <= 0:
+            limit = 20
+
+        return self.repository.search(query, dictionary_id=dictionary_id, limit=limit)
+
+    def autocomplete(
+        self, dictionary_id: UUID, prefix: str, limit: int = 10
+    ) -> list[str]:
+        if limit <= 0:
+            limit = 10
+
+        return self.repository.autocomplete(dictionary_id, prefix, limit=limit)
+
+    def fuzzy_search(
+        self, dictionary_id: UUID, query: str, limit: int = 10, max_distance: int = 2
+    ) -> list[FuzzyMatch]:
+        if limit <= 0:
+            limit = 10
+
+        return self.repository.fuzzy_search(
+            dictionary_id, query, limit=limit, max_distance=max_distance
+        )
+
+    def export_entries(self, dictionary_id: UUID) -> Iterator[Sequence]:
+        return self.repository.iter_rows(dictionary_id)
+
+    def dictionary_exists(self, dictionary_id: UUID) -> bool:
+        return self.repository.dictionary_exists(dictionary_id)
+
     def get_entry(self, entry_id: UUID) -> Optional[Entry]:
         result = self.repository.get_by_id(entry_id)
         return result
 
+    def get_entries(self, entry_ids: Sequence[UUID]) -> tuple[list[Entry], list[UUID]]:
+        # Порядок запроса сохраняется, повторы ID отбрасываются
+        requested = list(dict.fromkeys(entry_ids))
+        found = self.repository.get_by_ids(requested)
+        entries = [found[i] for i in requested if i in found]
+        missing = [i for i in requested if i not in found]
+        return entries, missing
+
+    def delete_entry(self, entry_id: UUID) -> bool:
+        result = self.repository.delete(entry_id)
+        return result
+
+    def get_entries_version(
+        self, dictionary_id: UUID
+    ) -> Optional[tuple[int, datetime]]:
+        return self.repository.get_entries_version(dictionary_id)
+
+    def count_dictionary_entries(self, dictionary_id: UUID) -> int:
+        return self.repository.count_by_dictionary(dictionary_id)
+
     def get_dictionary_entries(
-        self, dictionary_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        dictionary_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
     ) -> list[Entry]:
-        if skip < 0:
-            skip = 0
-        if limit <= 0:
-            limit = 100
-
         entries = self.repository.get_by_dictionary(
-            dictionary_id, skip=skip, limit=limit
+            dictionary_id, skip=skip, limit=limit, after=after
         )
         return entries
+
+    def get_dictionary_entry_rows(
+        self,
+        dictionary_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> Sequence[Sequence]:
+        return self.repository.get_rows_by_dictionary(
+            dictionary_id, skip=skip, limit=limit, after=after
+        )
+
+    def find_entries(self, dictionary_id: UUID, original_text: str) -> list[Entry]:
+        return self.repository.get_by_original_text(dictionary_id, original_text)
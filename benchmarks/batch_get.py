@@ -0,0 +1,108 @@
+"""Сессия повторения карточек: N запросов GET /entries/{id} vs один batchGet.
+
+Каждый режим прогоняется с пустым кэшем сущностей (все записи читаются
+из БД) и с прогретым.
+
+Запуск: ``python -m benchmarks.batch_get --cards 300``
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base, get_db
+from app.infrastructure.cache import entity_cache
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.main import app
+
+
+def seed(session_factory, entries: int) -> list[str]:
+    rng = random.Random(1)
+    db = session_factory()
+    dictionary = DictionaryRepository(db).create(
+        Dictionary(name="bench", source_language="en", target_language="ru")
+    )
+    created = [
+        Entry(
+            dictionary_id=dictionary.id,
+            original_text="".join(rng.choices(string.ascii_lowercase, k=10)),
+            translated_text="".join(rng.choices(string.ascii_lowercase, k=12)),
+        )
+        for _ in range(entries)
+    ]
+    EntryRepository(db).bulk_create(created)
+    db.close()
+    return [str(entry.id) for entry in created]
+
+
+def one_by_one(client: TestClient, ids: list[str]) -> None:
+    for entry_id in ids:
+        assert client.get(f"/api/v1/entries/{entry_id}").status_code == 200
+
+
+def batched(client: TestClient, ids: list[str]) -> None:
+    response = client.post("/api/v1/entries:batchGet", json={"ids": ids})
+    assert len(response.json()["entries"]) == len(ids)
+
+
+def measure(run: Callable[[], None], cold: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            entity_cache.clear()
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--cards", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        ids = random.Random(2).sample(seed(session_factory, args.entries), args.cards)
+        client = TestClient(app)
+
+        print(f"cards={args.cards}")
+        for cold in (True, False):
+            single = measure(lambda: one_by_one(client, ids), cold, args.repeat)
+            batch = measure(lambda: batched(client, ids), cold, args.repeat)
+            print(
+                f"{'cold' if cold else 'warm'} cache: "
+                f"{args.cards} x GET {single * 1000:8.1f} ms, "
+                f"batchGet {batch * 1000:7.1f} ms ({single / batch:.0f}x)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""p50/p99 задержки лёгких запросов под конкурентной нагрузкой.
+
+Лёгкие клиенты читают запись по ID, тяжёлые параллельно выполняют
+полнотекстовый поиск по короткому префиксу. Режим ``inline`` вызывает
+репозитории прямо в event loop (как было до выделенного пула),
+режим ``executor`` - через ``app.infrastructure.executor``.
+
+Запуск: ``python -m benchmarks.concurrent_latency --entries 100000``
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import string
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base, executor, get_db
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.main import app
+
+
+class InlineExecutor(executor.DatabaseExecutor):
+    async def run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+def seed(session_factory, entries: int):
+    rng = random.Random(1)
+    db = session_factory()
+    dictionary = DictionaryRepository(db).create(
+        Dictionary(name="bench", source_language="en", target_language="ru")
+    )
+    repository = EntryRepository(db)
+    ids = []
+    for start in range(0, entries, 10_000):
+        batch = [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text="".join(rng.choices(string.ascii_lowercase, k=8)),
+                translated_text="".join(rng.choices(string.ascii_lowercase, k=8)),
+            )
+            for _ in range(min(10_000, entries - start))
+        ]
+        repository.bulk_create(batch)
+        ids.extend(entry.id for entry in batch)
+    db.close()
+    return dictionary.id, ids
+
+
+async def run_load(dictionary_id, entry_ids, args) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + args.duration
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def light():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(
+                    f"/api/v1/entries/{random.choice(entry_ids)}"
+                )
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+
+        async def heavy():
+            while time.perf_counter() < deadline:
+                response = await client.get(
+                    "/api/v1/search",
+                    params={
+                        "q": random.choice(string.ascii_lowercase),
+                        "dictionary_id": str(dictionary_id),
+                    },
+                )
+                assert response.status_code == 200
+
+        await asyncio.gather(
+            *(light() for _ in range(args.light_clients)),
+            *(heavy() for _ in range(args.heavy_clients)),
+        )
+    return latencies
+
+
+def report(mode: str, latencies: list[float], duration: float) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{mode:>9}: {len(latencies) / duration:8.0f} req/s  "
+        f"p50 {quantiles[49] * 1000:7.2f} ms  "
+        f"p99 {quantiles[98] * 1000:7.2f} ms  "
+        f"max {max(latencies) * 1000:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--light-clients", type=int, default=4)
+    parser.add_argument("--heavy-clients", type=int, default=2)
+    parser.add_argument(
+        "--mode", choices=["inline", "executor", "both"], default="both"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+            pool_size=executor.DB_EXECUTOR_WORKERS,
+            max_overflow=-1,
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        dictionary_id, entry_ids = seed(session_factory, args.entries)
+
+        modes = ["inline", "executor"] if args.mode == "both" else [args.mode]
+        for mode in modes:
+            if mode == "inline":
+                executor.db_executor = InlineExecutor(max_workers=1)
+            else:
+                executor.db_executor = executor.DatabaseExecutor()
+            latencies = asyncio.run(run_load(dictionary_id, entry_ids, args))
+            report(mode, latencies, args.duration)
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Синтетическая база словарей для бенчмарков.
+
+``--entries`` записей раскладываются по ``--dictionaries`` словарям
+с размерами по закону Ципфа: несколько больших словарей и длинный
+хвост маленьких. Исходные слова - уникальные псевдослова из слогов,
+даты создания разбросаны по последнему году, у части записей есть
+пример и заметка. Записи пишутся через репозитории, поэтому счётчики,
+статистика и FTS-индекс заполнены так же, как в рабочей базе.
+
+Готовая база кэшируется в ``--cache-dir`` под именем из параметров
+генерации и переиспользуется следующими запусками.
+
+Запуск: ``python -m benchmarks.dataset --entries 1000000 --dictionaries 1000``
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+
+# Меняется вместе со схемой или распределением данных: старые базы в кэше
+# перестают подходить
+DATASET_VERSION = 1
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "dictionary-benchmarks"
+CHUNK_SIZE = 5000
+
+SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+RU_SYLLABLES = [c + v for c in "бвгдзклмнпрст" for v in "аеиоу"]
+WORD_SPACE = len(SYLLABLES) ** 4
+# Взаимно просто с WORD_SPACE: i -> i * _MULTIPLIER - перестановка номеров
+_MULTIPLIER = 2654435761
+
+
+def word(number: int, syllables: list[str]) -> str:
+    parts = []
+    while True:
+        number, digit = divmod(number, len(syllables))
+        parts.append(syllables[digit])
+        if not number:
+            return "".join(parts)
+
+
+def dictionary_sizes(entries: int, dictionaries: int, rng: random.Random) -> list[int]:
+    weights = [1 / rank for rank in range(1, dictionaries + 1)]
+    total = sum(weights)
+    sizes = [int(entries * weight / total) for weight in weights]
+    for i in range(entries - sum(sizes)):
+        sizes[i % dictionaries] += 1
+    rng.shuffle(sizes)
+    return sizes
+
+
+def generate(path: Path, entries: int, dictionaries: int, seed: int = 1) -> None:
+    if entries > WORD_SPACE:
+        raise ValueError(f"At most {WORD_SPACE} unique entries can be generated")
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(seed)
+    offset = rng.randrange(WORD_SPACE)
+    now = datetime.utcnow().replace(microsecond=0)
+    year = 365 * 24 * 3600
+
+    # Свои кэши: генерация не должна греть кэши процесса бенчмарка
+    dictionary_repository = DictionaryRepository(db, entity_cache=LRUCache())
+    entry_repository = EntryRepository(db, entity_cache=LRUCache())
+
+    started = time.perf_counter()
+    number = written = 0
+    for index, size in enumerate(dictionary_sizes(entries, dictionaries, rng)):
+        dictionary = dictionary_repository.create(
+            Dictionary(
+                name=f"Словарь {index}",
+                description=f"{size} записей",
+                source_language="en",
+                target_language="ru",
+                created_at=now - timedelta(seconds=year),
+            )
+        )
+        for start in range(0, size, CHUNK_SIZE):
+            batch = []
+            for _ in range(min(CHUNK_SIZE, size - start)):
+                original = word((number + offset) * _MULTIPLIER % WORD_SPACE, SYLLABLES)
+                created_at = now - timedelta(seconds=rng.randrange(year))
+                batch.append(
+                    Entry(
+                        dictionary_id=dictionary.id,
+                        original_text=original,
+                        translated_text=word(rng.randrange(10**6), RU_SYLLABLES),
+                        usage_example=(
+                            f"The {original} is here" if rng.random() < 0.3 else None
+                        ),
+                        notes="заметка" if rng.random() < 0.1 else None,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+                number += 1
+            entry_repository.bulk_create(batch)
+
+            if number - written >= 100_000:
+                written = number
+                print(
+                    f"  {number}/{entries} entries, "
+                    f"{number / (time.perf_counter() - started):.0f} entries/s"
+                )
+
+    db.execute(text("ANALYZE"))
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+def dataset_path(
+    entries: int, dictionaries: int, seed: int = 1, cache_dir: Path = DEFAULT_CACHE_DIR
+) -> Path:
+    name = f"v{DATASET_VERSION}-entries{entries}-dictionaries{dictionaries}-seed{seed}"
+    return cache_dir / f"{name}.db"
+
+
+def ensure_dataset(
+    entries: int, dictionaries: int, seed: int = 1, cache_dir: Path = DEFAULT_CACHE_DIR
+) -> Path:
+    path = dataset_path(entries, dictionaries, seed, cache_dir)
+    if path.exists():
+        return path
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Прерванная генерация не должна оставить в кэше неполную базу
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+    print(f"Generating {path.name}")
+    started = time.perf_counter()
+    generate(partial, entries, dictionaries, seed)
+    partial.rename(path)
+    print(f"Generated in {time.perf_counter() - started:.1f} s")
+    return path
+
+
+def sample_entries(
+    db: Session, count: int, rng: random.Random, dictionary_id: Optional[UUID] = None
+) -> list[tuple[UUID, UUID, str]]:
+    # Случайные rowid вместо ORDER BY random(): без полного прохода по таблице
+    condition = "WHERE dictionary_id = :dictionary_id" if dictionary_id else ""
+    low, high = db.execute(
+        text(f"SELECT min(rowid), max(rowid) FROM entries {condition}"),
+        {"dictionary_id": dictionary_id.bytes if dictionary_id else None},
+    ).one()
+    if low is None:
+        return []
+
+    found: dict[bytes, tuple] = {}
+    for _ in range(10):
+        rowids = [rng.randint(low, high) for _ in range(count)]
+        rows = db.execute(
+            text(
+                "SELECT id, dictionary_id, original_text FROM entries "
+                f"WHERE rowid IN ({', '.join(map(str, rowids))})"
+                + (" AND dictionary_id = :dictionary_id" if dictionary_id else "")
+            ),
+            {"dictionary_id": dictionary_id.bytes if dictionary_id else None},
+        )
+        found.update((row[0], row) for row in rows)
+        if len(found) >= count:
+            break
+
+    return [
+        (UUID(bytes=entry_id), UUID(bytes=dictionary), original)
+        for entry_id, dictionary, original in list(found.values())[:count]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--dictionaries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    path = ensure_dataset(args.entries, args.dictionaries, args.seed, args.cache_dir)
+    print(f"{path} ({path.stat().st_size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
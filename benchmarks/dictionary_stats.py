@@ -0,0 +1,108 @@
+"""Чтение статистики словаря: агрегаты vs пересчёт по entries.
+
+Для словарей разного размера сравнивается ``DictionaryRepository.get_stats``
+(строка агрегатов и дни за окно) с тем же расчётом агрегатными функциями
+по всем записям словаря.
+
+Запуск: ``python -m benchmarks.dictionary_stats --sizes 1000 10000 100000``
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import EntryORM
+from app.infrastructure.repository import DictionaryRepository
+
+
+def seed(db, size: int):
+    rng = random.Random(size)
+    dictionary = DictionaryRepository(db).create(
+        Dictionary(name=f"d{size}", source_language="en", target_language="ru")
+    )
+    start = datetime(2024, 1, 1)
+    repo = EntryRepository(db)
+    for offset in range(0, size, 10_000):
+        repo.bulk_create(
+            [
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text="".join(rng.choices(string.ascii_lowercase, k=8)),
+                    translated_text="".join(rng.choices(string.ascii_lowercase, k=9)),
+                    usage_example="example" if rng.random() < 0.3 else None,
+                    created_at=start + timedelta(minutes=rng.randrange(365 * 1440)),
+                )
+                for _ in range(min(10_000, size - offset))
+            ]
+        )
+    return dictionary.id
+
+
+def full_scan(db, dictionary_id, since: date) -> None:
+    entries = EntryORM.__table__
+    in_dictionary = entries.c.dictionary_id == dictionary_id
+    db.execute(
+        select(
+            func.count(),
+            func.sum(func.coalesce(entries.c.usage_example, "") != ""),
+            func.sum(func.coalesce(entries.c.notes, "") != ""),
+            func.avg(func.length(entries.c.original_text)),
+            func.avg(func.length(entries.c.translated_text)),
+        ).where(in_dictionary)
+    ).one()
+    day = func.date(entries.c.created_at)
+    db.execute(
+        select(day, func.count())
+        .where(in_dictionary, day >= since.isoformat())
+        .group_by(day)
+    ).all()
+
+
+def measure(run: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    as_of = date(2024, 12, 31)
+    since = as_of - timedelta(days=83)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        dictionaries = {size: seed(db, size) for size in args.sizes}
+        repo = DictionaryRepository(db)
+
+        print(f"{'entries':>10} {'aggregates':>12} {'full scan':>12}")
+        for size, dictionary_id in dictionaries.items():
+            stats = measure(
+                lambda: repo.get_stats(dictionary_id, since, as_of), args.repeat
+            )
+            scan = measure(lambda: full_scan(db, dictionary_id, since), args.repeat)
+            print(f"{size:>10} {stats * 1000:10.2f}ms {scan * 1000:10.2f}ms")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
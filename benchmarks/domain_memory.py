@@ -0,0 +1,192 @@
+"""Память и время загрузки списка записей словаря в доменные объекты.
+
+Режим ``legacy`` - прежние классы с ``__dict__``: ORM-объект, затем
+конструктор с валидацией, ``datetime.utcnow()`` и готовыми UUID/датами.
+Режим ``slots`` - текущий ``EntryRepository.get_by_dictionary``: строки
+БД -> ``Entry.from_storage`` без валидации, разбор полей при чтении.
+Строка ``slots, parsed`` - те же объекты после чтения всех полей.
+
+Запуск: ``python -m benchmarks.domain_memory --entries 100000``
+"""
+
+import argparse
+import gc
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import EntryORM
+from app.infrastructure.repository import DictionaryRepository
+
+
+class LegacyEntry:
+    def __init__(
+        self,
+        dictionary_id: UUID,
+        original_text: str,
+        translated_text: str,
+        usage_example: Optional[str] = None,
+        notes: Optional[str] = None,
+        id: Optional[UUID] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+    ):
+        self.id = id or uuid4()
+        self.dictionary_id = dictionary_id
+        self.original_text = self._validate_text(original_text, "Original text")
+        self.translated_text = self._validate_text(translated_text, "Translated text")
+        self.usage_example = usage_example
+        self.notes = notes
+        self.created_at = created_at or datetime.utcnow()
+        self.updated_at = updated_at or datetime.utcnow()
+
+    @staticmethod
+    def _validate_text(text: str, field_name: str) -> str:
+        if not text or not text.strip():
+            raise ValueError(f"{field_name} cannot be empty")
+        return text.strip()
+
+
+def load_legacy(db, dictionary_id: UUID, limit: int) -> list:
+    rows = (
+        db.query(EntryORM)
+        .filter(EntryORM.dictionary_id == dictionary_id)
+        .order_by(EntryORM.created_at, EntryORM.id)
+        .limit(limit)
+        .all()
+    )
+    entries = [
+        LegacyEntry(
+            # BinaryUUID уже возвращает UUID
+            id=row.id,
+            dictionary_id=row.dictionary_id,
+            original_text=row.original_text,
+            translated_text=row.translated_text,
+            usage_example=row.usage_example,
+            notes=row.notes,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        for row in rows
+    ]
+    db.expunge_all()
+    return entries
+
+
+def load_slots(db, dictionary_id: UUID, limit: int) -> list:
+    return EntryRepository(db).get_by_dictionary(dictionary_id, limit=limit)
+
+
+def touch(entries: list) -> None:
+    for entry in entries:
+        entry.id, entry.dictionary_id, entry.created_at, entry.updated_at
+
+
+def seed(session_factory, entries: int) -> UUID:
+    rng = random.Random(1)
+    db = session_factory()
+    dictionary = DictionaryRepository(db).create(
+        Dictionary(name="bench", source_language="en", target_language="ru")
+    )
+
+    def text(k: int) -> str:
+        return "".join(rng.choices(string.ascii_lowercase, k=k))
+
+    EntryRepository(db).bulk_create(
+        [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text=text(8),
+                translated_text=text(10),
+                usage_example=None if i % 3 else text(40),
+            )
+            for i in range(entries)
+        ]
+    )
+    db.close()
+    return dictionary.id
+
+
+def measure(
+    session_factory, load: Callable, dictionary_id: UUID, limit: int, parse: bool
+) -> tuple[float, int]:
+    # Время - отдельным прогоном: tracemalloc сильно замедляет аллокации
+    db = session_factory()
+    started = time.perf_counter()
+    entries = load(db, dictionary_id, limit)
+    if parse:
+        touch(entries)
+    elapsed = time.perf_counter() - started
+    db.close()
+    del entries
+
+    db = session_factory()
+    gc.collect()
+    tracemalloc.start()
+    entries = load(db, dictionary_id, limit)
+    if parse:
+        touch(entries)
+    db.close()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(entries) == limit
+    return elapsed, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        dictionary_id = seed(session_factory, args.entries)
+
+        results = [
+            (
+                "legacy",
+                *measure(
+                    session_factory, load_legacy, dictionary_id, args.entries, False
+                ),
+            ),
+            (
+                "slots",
+                *measure(
+                    session_factory, load_slots, dictionary_id, args.entries, False
+                ),
+            ),
+            (
+                "slots, parsed",
+                *measure(
+                    session_factory, load_slots, dictionary_id, args.entries, True
+                ),
+            ),
+        ]
+        print(f"entries={args.entries}")
+        baseline = results[0][2]
+        for name, elapsed, retained in results:
+            print(
+                f"{name:>14}: load {elapsed * 1000:8.1f} ms, "
+                f"{retained / args.entries:6.0f} B/entry "
+                f"({retained / baseline:.0%} of legacy)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Нагрузочный тест: одновременные POST /entries с групповым коммитом и без.
+
+«Класс» из ``--writers`` пользователей одновременно добавляет по
+``--entries`` слов; каждый следующий запрос пользователь шлёт после
+ответа на предыдущий. База - файл SQLite, каждый коммит - fsync.
+Считаются вставки в секунду, задержки и ответы с ошибкой (в том числе
+``database is locked`` по истечении ``--busy-timeout``).
+
+Запуск: ``python -m benchmarks.entry_write_batching --writers 30 --entries 20``
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary
+from app.infrastructure import Base, get_db
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.write_batching import EntryWriteBatcher, get_entry_batcher
+from app.main import app
+
+
+async def writer(
+    client: httpx.AsyncClient, url: str, student: int, entries: int
+) -> tuple[list[float], int]:
+    latencies, errors = [], 0
+    for i in range(entries):
+        started = time.perf_counter()
+        response = await client.post(
+            url,
+            json={"original_text": f"s{student}w{i}", "translated_text": "слово"},
+        )
+        latencies.append(time.perf_counter() - started)
+        errors += response.status_code != 201
+    return latencies, errors
+
+
+async def run(
+    path: Path, batched: bool, writers: int, entries: int, busy_timeout: float
+) -> None:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": busy_timeout},
+        pool_size=writers,
+        max_overflow=-1,
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    dictionary = DictionaryRepository(db).create(
+        Dictionary(name="class", source_language="en", target_language="ru")
+    )
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    batcher: Optional[EntryWriteBatcher] = (
+        EntryWriteBatcher(session_factory) if batched else None
+    )
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_entry_batcher] = lambda: batcher
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    url = f"/api/v1/dictionaries/{dictionary.id}/entries"
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(writer(c, url, student, entries) for student in range(writers))
+        )
+        elapsed = time.perf_counter() - started
+    if batcher is not None:
+        await batcher.close()
+    engine.dispose()
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(errors for _, errors in results)
+    inserted = len(latencies) - errors
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{'batched' if batched else 'direct':>8}: {inserted / elapsed:7.0f} inserts/s, "
+        f"p50 {statistics.median(latencies) * 1000:6.1f} ms, "
+        f"p95 {p95 * 1000:6.1f} ms, errors {errors}"
+        + (f", transactions {batcher.batches}" if batcher is not None else "")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=30)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--busy-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"writers={args.writers}, entries per writer={args.entries}")
+        for batched in (False, True):
+            path = Path(directory) / f"{'batched' if batched else 'direct'}.db"
+            asyncio.run(
+                run(path, batched, args.writers, args.entries, args.busy_timeout)
+            )
+
+
+if __name__ == "__main__":
+    main()
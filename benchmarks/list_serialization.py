@@ -0,0 +1,130 @@
+"""Сериализация списка записей: доменные + Pydantic-модели vs плоские колонки.
+
+Режим ``models`` - прежний код обработчика (ORM -> Entry -> EntryResponse,
+затем проверка по response_model), подключённый на отдельный маршрут.
+Режим ``rows`` - текущий GET /dictionaries/{id}/entries (колонки -> orjson).
+
+Запуск: ``python -m benchmarks.list_serialization --limit 1000``
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+from uuid import UUID
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.entry_routers import get_entry_service
+from app.api.entry_schemas import EntryListResponse, EntryResponse
+from app.api.pagination import encode_cursor
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base, get_db
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.main import app
+from app.services.entry_service import EntryService
+
+
+@app.get("/benchmark/{dictionary_id}/entries", response_model=EntryListResponse)
+async def entries_via_models(
+    dictionary_id: UUID,
+    limit: int = 100,
+    service: EntryService = Depends(get_entry_service),
+) -> EntryListResponse:
+    entries = service.get_dictionary_entries(dictionary_id, limit=limit)
+    return EntryListResponse(
+        entries=[EntryResponse.from_domain(e) for e in entries],
+        total=service.count_dictionary_entries(dictionary_id),
+        next_cursor=(
+            encode_cursor(entries[-1].created_at, entries[-1].id)
+            if len(entries) == limit
+            else None
+        ),
+    )
+
+
+def seed(session_factory, entries: int) -> UUID:
+    rng = random.Random(1)
+    db = session_factory()
+    dictionary = DictionaryRepository(db).create(
+        Dictionary(name="bench", source_language="en", target_language="ru")
+    )
+
+    def text(k: int) -> str:
+        return "".join(rng.choices(string.ascii_lowercase + " ", k=k))
+
+    EntryRepository(db).bulk_create(
+        [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text=text(12),
+                translated_text=text(16),
+                usage_example=text(60),
+                notes=None if i % 2 else text(20),
+            )
+            for i in range(entries)
+        ]
+    )
+    db.close()
+    return dictionary.id
+
+
+def measure(client: TestClient, url: str, repeat: int) -> tuple[float, bytes]:
+    body = client.get(url).content
+    started = time.perf_counter()
+    for _ in range(repeat):
+        client.get(url)
+    return (time.perf_counter() - started) / repeat, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        dictionary_id = seed(session_factory, args.entries)
+        client = TestClient(app)
+
+        models, models_body = measure(
+            client,
+            f"/benchmark/{dictionary_id}/entries?limit={args.limit}",
+            args.repeat,
+        )
+        rows, rows_body = measure(
+            client,
+            f"/api/v1/dictionaries/{dictionary_id}/entries?limit={args.limit}",
+            args.repeat,
+        )
+
+        print(f"limit={args.limit}, identical bodies: {models_body == rows_body}")
+        print(f"models: {models * 1000:8.2f} ms/request")
+        print(f"  rows: {rows * 1000:8.2f} ms/request  ({models / rows:.1f}x)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
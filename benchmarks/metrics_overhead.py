@@ -0,0 +1,148 @@
+"""Цена метрик на горячем пути: запросы с middleware и хуками SQL и без них.
+
+Один клиент последовательно читает запись по ID (ответ из кэша, самый
+дешёвый запрос - накладные расходы видны сильнее всего) и страницу
+записей словаря (несколько SQL-запросов). Режимы чередуются раундами,
+чтобы дрейф машины не попадал в разницу. Отдельно меряется
+``SELECT 1`` с хуками SQLAlchemy и без.
+
+Запуск: ``python -m benchmarks.metrics_overhead --requests 2000``
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.api.metrics import MetricsMiddleware
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base, get_db, metrics
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.main import app
+
+ROUNDS = 5
+METRICS_MIDDLEWARE = next(
+    middleware
+    for middleware in app.user_middleware
+    if middleware.cls is MetricsMiddleware
+)
+
+
+def set_metrics(enabled: bool) -> None:
+    app.user_middleware = [
+        middleware
+        for middleware in app.user_middleware
+        if middleware is not METRICS_MIDDLEWARE
+    ]
+    if enabled:
+        app.user_middleware.insert(0, METRICS_MIDDLEWARE)
+        metrics.instrument_queries()
+    else:
+        metrics.remove_query_instrumentation()
+    # Стек middleware пересобирается при следующем запросе
+    app.middleware_stack = None
+
+
+async def measure(client: httpx.AsyncClient, urls: list[str], requests: int) -> float:
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        response = await client.get(urls[i % len(urls)])
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return statistics.median(latencies)
+
+
+async def run_http(urls: dict[str, list[str]], requests: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    results: dict[tuple[str, bool], list[float]] = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(ROUNDS):
+            for enabled in (False, True):
+                set_metrics(enabled)
+                for name, paths in urls.items():
+                    median = await measure(c, paths, requests // ROUNDS)
+                    results.setdefault((name, enabled), []).append(median)
+    set_metrics(True)
+
+    for name in urls:
+        off = statistics.median(results[(name, False)]) * 1e6
+        on = statistics.median(results[(name, True)]) * 1e6
+        print(
+            f"{name:>14}: without {off:7.1f} us, with {on:7.1f} us, "
+            f"overhead {on - off:+6.1f} us ({on / off - 1:+.1%})"
+        )
+
+
+def run_queries(session_factory, requests: int) -> None:
+    db = session_factory()
+    for enabled in (False, True):
+        set_metrics(enabled)
+        # Внутри HTTP-запроса хук ещё и пополняет счётчик запроса
+        token = metrics.request_queries.set(metrics.QueryTally())
+        started = time.perf_counter()
+        for _ in range(requests):
+            db.execute(text("SELECT 1"))
+        elapsed = (time.perf_counter() - started) / requests
+        metrics.request_queries.reset(token)
+        print(
+            f"{'SELECT 1':>14}: {'with' if enabled else 'without'} hooks "
+            f"{elapsed * 1e6:6.1f} us"
+        )
+    db.close()
+    set_metrics(True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        db = session_factory()
+        dictionary = DictionaryRepository(db).create(
+            Dictionary(name="bench", source_language="en", target_language="ru")
+        )
+        entries = [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text=f"word{i}",
+                translated_text="слово",
+            )
+            for i in range(1000)
+        ]
+        EntryRepository(db).bulk_create(entries)
+        db.close()
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        urls = {
+            "entry by id": [f"/api/v1/entries/{entry.id}" for entry in entries[:100]],
+            "entries page": [f"/api/v1/dictionaries/{dictionary.id}/entries?limit=20"],
+        }
+        asyncio.run(run_http(urls, args.requests))
+        run_queries(session_factory, args.requests * 5)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
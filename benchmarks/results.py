@@ -0,0 +1,154 @@
+"""Результаты ``benchmarks.suite`` в JSON и сравнение с базовым запуском.
+
+Файл результатов: ``meta`` (коммит, версии, параметры запуска),
+``micro`` (время вызова метода в микросекундах) и ``http`` (пропускная
+способность и задержки эндпоинта в миллисекундах). При сравнении
+регрессией считается ухудшение медианы вызова, ``rps``, p50 или p95
+больше чем на ``--threshold`` (доля) и больше шумового порога в
+абсолютных единицах; p99 и max только печатаются.
+
+Запуск: ``python -m benchmarks.results baseline.json results.json``
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+DEFAULT_THRESHOLD = 0.2
+
+# Поле -> (больше - лучше, шумовой порог абсолютной разницы)
+COMPARED_FIELDS = {
+    "micro": {"median_us": (False, 2.0)},
+    "http": {"rps": (True, 5.0), "p50_ms": (False, 0.2), "p95_ms": (False, 0.5)},
+}
+
+
+@dataclass
+class Change:
+    section: str
+    name: str
+    field: str
+    baseline: float
+    current: float
+    higher_is_better: bool
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline == 0:
+            return float("inf") if self.current else 1.0
+        return self.current / self.baseline
+
+    @property
+    def worse(self) -> bool:
+        if self.higher_is_better:
+            return self.current < self.baseline
+        return self.current > self.baseline
+
+    def __str__(self) -> str:
+        return (
+            f"{self.section:>5} {self.name} {self.field}: "
+            f"{self.baseline:.1f} -> {self.current:.1f} ({self.ratio - 1:+.0%})"
+        )
+
+
+def run_metadata(params: dict[str, Any]) -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "params": params,
+    }
+
+
+def save(path: Path, results: dict[str, Any]) -> None:
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+
+
+def load(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> tuple[list[Change], list[Change], list[str]]:
+    regressions: list[Change] = []
+    improvements: list[Change] = []
+    unmatched: list[str] = []
+
+    for section, fields in COMPARED_FIELDS.items():
+        before = baseline.get(section, {})
+        after = current.get(section, {})
+        unmatched += [
+            f"{section} {name}: only in baseline"
+            for name in before.keys() - after.keys()
+        ]
+        unmatched += [f"{section} {name}: new" for name in after.keys() - before.keys()]
+
+        for name in sorted(before.keys() & after.keys()):
+            for field, (higher_is_better, noise) in fields.items():
+                if field not in before[name] or field not in after[name]:
+                    continue
+                change = Change(
+                    section,
+                    name,
+                    field,
+                    before[name][field],
+                    after[name][field],
+                    higher_is_better,
+                )
+                if abs(change.current - change.baseline) <= noise:
+                    continue
+                if abs(change.ratio - 1) <= threshold:
+                    continue
+                (regressions if change.worse else improvements).append(change)
+
+    return regressions, improvements, sorted(unmatched)
+
+
+def report(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> int:
+    regressions, improvements, unmatched = compare(baseline, current, threshold)
+    print(
+        f"baseline {baseline['meta'].get('commit')} vs current "
+        f"{current['meta'].get('commit')}, threshold {threshold:.0%}"
+    )
+    if baseline["meta"].get("params") != current["meta"].get("params"):
+        print("warning: runs used different parameters, results are not comparable")
+    for title, items in (("Regressions", regressions), ("Improvements", improvements)):
+        print(f"{title}: {len(items)}")
+        for change in items:
+            print(f"  {change}")
+    for line in unmatched:
+        print(f"  {line}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    sys.exit(report(load(args.baseline), load(args.current), args.threshold))
+
+
+if __name__ == "__main__":
+    main()
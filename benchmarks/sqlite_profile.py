@@ -0,0 +1,184 @@
+"""Профили SQLite под одновременной нагрузкой чтения и записи.
+
+Читатели в своих потоках листают страницы записей и считают записи
+словаря, писатели добавляют записи по одной транзакции на запись.
+Каждый профиль получает свою копию одной и той же базы:
+
+- ``default`` - настройки SQLite по умолчанию (журнал отката);
+- ``wal-full`` - WAL, но ``synchronous=FULL``: вклад самого WAL;
+- ``tuned`` - профиль приложения по умолчанию.
+
+Выводятся чтения и записи в секунду, p50/p99 задержки и ошибки
+«database is locked».
+
+Запуск: ``python -m benchmarks.sqlite_profile --entries 50000 --seconds 10``
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base
+from app.infrastructure.database import create_db_engine
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.storage import PROFILES
+
+BENCH_PROFILES = {
+    "default": PROFILES["default"],
+    "wal-full": replace(PROFILES["tuned"], synchronous="FULL"),
+    "tuned": PROFILES["tuned"],
+}
+
+
+def create_database(path: Path, entries: int, dictionaries: int) -> list:
+    engine = create_db_engine(f"sqlite:///{path}", profile=PROFILES["default"])
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    ids = []
+    for d in range(dictionaries):
+        dictionary = DictionaryRepository(db).create(
+            Dictionary(name=f"bench{d}", source_language="en", target_language="ru")
+        )
+        EntryRepository(db).bulk_create(
+            [
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text=f"word{d}-{i}",
+                    translated_text="слово",
+                    usage_example="example" if i % 3 else None,
+                )
+                for i in range(entries // dictionaries)
+            ]
+        )
+        ids.append(dictionary.id)
+    db.close()
+    engine.dispose()
+    return ids
+
+
+class Load:
+    def __init__(self, session_factory, dictionary_ids, seconds: float):
+        self.session_factory = session_factory
+        self.dictionary_ids = dictionary_ids
+        self.deadline = time.perf_counter() + seconds
+        self.reads: list[float] = []
+        self.writes: list[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def reader(self, seed: int) -> None:
+        rng = random.Random(seed)
+        db = self.session_factory()
+        entries = EntryRepository(db)
+        while time.perf_counter() < self.deadline:
+            dictionary_id = rng.choice(self.dictionary_ids)
+            started = time.perf_counter()
+            try:
+                entries.get_by_dictionary(
+                    dictionary_id, skip=rng.randrange(500), limit=20
+                )
+                entries.count_by_dictionary(dictionary_id)
+                db.commit()
+            except OperationalError:
+                db.rollback()
+                with self._lock:
+                    self.errors += 1
+                continue
+            with self._lock:
+                self.reads.append(time.perf_counter() - started)
+        db.close()
+
+    def writer(self, seed: int) -> None:
+        rng = random.Random(seed)
+        db = self.session_factory()
+        entries = EntryRepository(db)
+        i = 0
+        while time.perf_counter() < self.deadline:
+            i += 1
+            entry = Entry(
+                dictionary_id=rng.choice(self.dictionary_ids),
+                original_text=f"new{seed}-{i}",
+                translated_text="новое",
+            )
+            started = time.perf_counter()
+            try:
+                entries.create(entry)
+            except OperationalError:
+                db.rollback()
+                with self._lock:
+                    self.errors += 1
+                continue
+            with self._lock:
+                self.writes.append(time.perf_counter() - started)
+        db.close()
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    return statistics.quantiles(values, n=100)[p - 1] if len(values) > 1 else values[0]
+
+
+def run(name, template: Path, directory: Path, dictionary_ids, args) -> None:
+    path = directory / f"{name}.db"
+    shutil.copy(template, path)
+    engine = create_db_engine(
+        f"sqlite:///{path}",
+        pool_size=args.readers + args.writers,
+        profile=BENCH_PROFILES[name],
+    )
+    load = Load(sessionmaker(bind=engine), dictionary_ids, args.seconds)
+    threads = [
+        threading.Thread(target=load.reader, args=(i,)) for i in range(args.readers)
+    ] + [
+        threading.Thread(target=load.writer, args=(1000 + i,))
+        for i in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(
+        f"{name:>9}: reads {len(load.reads) / args.seconds:7.0f}/s "
+        f"(p50 {percentile(load.reads, 50) * 1000:6.2f} ms, "
+        f"p99 {percentile(load.reads, 99) * 1000:7.2f} ms), "
+        f"writes {len(load.writes) / args.seconds:6.0f}/s "
+        f"(p50 {percentile(load.writes, 50) * 1000:6.2f} ms, "
+        f"p99 {percentile(load.writes, 99) * 1000:7.2f} ms), "
+        f"errors {load.errors}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--dictionaries", type=int, default=10)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--profiles", nargs="+", default=list(BENCH_PROFILES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        template = directory / "template.db"
+        dictionary_ids = create_database(template, args.entries, args.dictionaries)
+        for name in args.profiles:
+            run(name, template, directory, dictionary_ids, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Холодный старт воркера: импорт приложения и подготовка базы в lifespan.
+
+Каждый замер - отдельный интерпретатор, как у нового воркера под
+автоскейлером. Внутри меряются импорт ``app.main`` и запуск lifespan
+(миграции или проверка версии схемы) до готовности принимать запросы.
+Базы:
+
+- ``empty`` - файла нет, схема создаётся сразу в последней версии;
+- ``current`` - схема актуальна, старт стоит одного ``PRAGMA user_version``;
+- ``legacy`` - база до версионирования с ``--entries`` записями,
+  проходит все миграции (разовая цена, остальные воркеры её не платят).
+
+Запуск: ``python -m benchmarks.startup_time --runs 10 --entries 10000``
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def start():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(start())
+print(json.dumps({"import": imported - started, "startup": ready - imported}))
+"""
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE dictionaries (id VARCHAR(36) NOT NULL PRIMARY KEY, "
+    "name VARCHAR NOT NULL, description VARCHAR, source_language VARCHAR NOT NULL, "
+    "target_language VARCHAR NOT NULL, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL)",
+    "CREATE TABLE entries (id VARCHAR(36) NOT NULL PRIMARY KEY, "
+    "dictionary_id VARCHAR(36) NOT NULL REFERENCES dictionaries (id), "
+    "original_text TEXT NOT NULL, translated_text TEXT NOT NULL, "
+    "usage_example TEXT, notes TEXT, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL)",
+)
+
+
+def create_legacy(path: Path, entries: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    now = "2024-01-01 00:00:00.000000"
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "INSERT INTO dictionaries VALUES "
+            "('00000000-0000-4000-8000-000000000000', 'legacy', NULL, 'en', 'ru', ?, ?)",
+            (now, now),
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO entries VALUES (?, '00000000-0000-4000-8000-000000000000', "
+            "?, 'слово', NULL, NULL, ?, ?)",
+            [
+                (f"00000000-0000-4000-8000-{i:012d}", f"word{i}", now, now)
+                for i in range(1, entries + 1)
+            ],
+        )
+    engine.dispose()
+
+
+def start_worker(database: Path) -> dict[str, float]:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run(name: str, runs: int, prepare) -> None:
+    imports, startups = [], []
+    for _ in range(runs):
+        database = prepare()
+        timings = start_worker(database)
+        imports.append(timings["import"])
+        startups.append(timings["startup"])
+    total = [i + s for i, s in zip(imports, startups)]
+    print(
+        f"{name:>8}: import {statistics.median(imports) * 1000:7.1f} ms, "
+        f"startup {statistics.median(startups) * 1000:8.1f} ms, "
+        f"ready {statistics.median(total) * 1000:8.1f} ms (max {max(total) * 1000:.1f})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--entries", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        database = directory / "bench.db"
+
+        def empty() -> Path:
+            database.unlink(missing_ok=True)
+            return database
+
+        def current() -> Path:
+            return database
+
+        template = directory / "legacy.db"
+        create_legacy(template, args.entries)
+
+        def legacy() -> Path:
+            shutil.copy(template, database)
+            return database
+
+        run("empty", args.runs, empty)
+        run("current", args.runs, current)
+        run("legacy", max(1, args.runs // 5), legacy)
+
+
+if __name__ == "__main__":
+    main()
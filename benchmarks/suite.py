@@ -0,0 +1,769 @@
+"""Сквозной набор бенчмарков на синтетической базе ``benchmarks.dataset``.
+
+Микробенчмарки вызывают каждый публичный метод DictionaryRepository,
+EntryRepository, DictionaryService и EntryService. Методы с кэшем
+меряются дважды: с прогретым кэшем и с пустым (суффикс ``[cold]``);
+подготовка аргументов и сброс кэша в замер не входят. Пишущие методы
+работают с отдельным словарём-черновиком. Затем ``--concurrency``
+асинхронных клиентов в течение ``--duration`` секунд нагружают каждый
+эндпоинт приложения через ASGI; считаются запросы в секунду и
+p50/p95/p99 задержки.
+
+Бенчмарки работают с копией закэшированной базы. Результаты пишутся
+в JSON (``--output``); с ``--baseline`` сразу сравниваются с сохранённым
+запуском, код возврата 1 при регрессии (см. ``benchmarks.results``).
+
+Запуск: ``python -m benchmarks.suite --entries 100000 --output results.json``
+"""
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+import httpx
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import executor, get_db
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import DictionaryORM
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.text_indexes import DictionaryIndexCache
+from app.main import app
+from app.services.dictionary_service import DictionaryService
+from app.services.entry_service import EntryService
+from benchmarks import results
+from benchmarks.dataset import DEFAULT_CACHE_DIR, ensure_dataset, sample_entries
+
+BENCHMARKED_CLASSES = (
+    DictionaryRepository,
+    EntryRepository,
+    DictionaryService,
+    EntryService,
+)
+BATCH = 100
+
+
+@dataclass
+class Case:
+    name: str
+    call: Callable[..., Any]
+    # Вне замера: возвращает аргументы для call
+    prepare: Callable[[], tuple] = tuple
+
+
+@dataclass
+class Endpoint:
+    name: str
+    # (результат setup) -> (метод, URL, параметры httpx)
+    build: Callable[[Any], tuple[str, str, dict]]
+    expected: int = 200
+    # Вне замера: например, создать запись, которую запрос удалит
+    setup: Optional[Callable[[httpx.AsyncClient], Awaitable[Any]]] = None
+
+
+class Workload:
+    """Данные для вызовов: словари разных размеров, выборка записей,
+    генераторы новых словарей и записей для пишущих методов."""
+
+    def __init__(self, db: Session, seed: int):
+        self.db = db
+        self.rng = random.Random(seed)
+        dictionaries = (
+            db.execute(
+                select(DictionaryORM.id).order_by(DictionaryORM.entry_count.desc())
+            )
+            .scalars()
+            .all()
+        )
+        self.dictionary_ids: list[UUID] = list(dictionaries)
+        # Самый большой словарь и словарь медианного размера
+        self.large = dictionaries[0]
+        self.typical = dictionaries[len(dictionaries) // 2]
+        self.samples = sample_entries(db, 1000, self.rng)
+        self.large_samples = sample_entries(db, 1000, self.rng, self.large)
+        self.scratch = DictionaryRepository(db).create(
+            Dictionary(name="Черновик", source_language="en", target_language="ru")
+        )
+        self._numbers = itertools.count()
+        self.duplicates = [self.new_entry() for _ in range(BATCH)]
+        EntryRepository(db).bulk_create(self.duplicates)
+
+    def new_dictionary(self) -> Dictionary:
+        return Dictionary(
+            name=f"bench {next(self._numbers)}",
+            source_language="en",
+            target_language="ru",
+        )
+
+    def new_entry(self, dictionary_id: Optional[UUID] = None) -> Entry:
+        return Entry(
+            dictionary_id=dictionary_id or self.scratch.id,
+            original_text=f"scratch {next(self._numbers)}",
+            translated_text="черновик",
+        )
+
+    def copies_of_duplicates(self) -> list[Entry]:
+        return [
+            Entry(
+                dictionary_id=entry.dictionary_id,
+                original_text=entry.original_text,
+                translated_text=f"перевод {self.rng.random()}",
+                usage_example="example",
+            )
+            for entry in self.duplicates
+        ]
+
+    def dictionary_id(self) -> UUID:
+        return self.rng.choice(self.dictionary_ids)
+
+    def entry_id(self) -> UUID:
+        return self.rng.choice(self.samples)[0]
+
+    def entry_ids(self) -> list[UUID]:
+        return [entry_id for entry_id, _, _ in self.rng.sample(self.samples, BATCH)]
+
+    def word(self) -> str:
+        return self.rng.choice(self.large_samples)[2]
+
+    def ndjson(self) -> bytes:
+        return b"".join(
+            json.dumps(
+                {"original_text": entry.original_text, "translated_text": "импорт"}
+            ).encode()
+            + b"\n"
+            for entry in (self.new_entry() for _ in range(BATCH))
+        )
+
+
+def cold_dictionaries(db: Session) -> DictionaryRepository:
+    return DictionaryRepository(db, entity_cache=LRUCache())
+
+
+def cold_entries(db: Session) -> EntryRepository:
+    return EntryRepository(
+        db,
+        prefix_indexes=DictionaryIndexCache(max_bytes=64 * 1024 * 1024),
+        trigram_indexes=DictionaryIndexCache(max_bytes=256 * 1024 * 1024),
+        entity_cache=LRUCache(),
+    )
+
+
+async def chunks(data: bytes):
+    yield data
+
+
+def consume(rows) -> None:
+    for _ in rows:
+        pass
+
+
+def micro_cases(db: Session, w: Workload) -> list[Case]:
+    dictionaries = DictionaryRepository(db)
+    entries = EntryRepository(db)
+    dictionary_service = DictionaryService(dictionaries)
+    entry_service = EntryService(entries)
+    as_of = datetime.utcnow().date()
+    since = as_of - timedelta(days=83)
+
+    def scratch_copy() -> Dictionary:
+        dictionary = dictionaries.get_by_id(w.scratch.id)
+        dictionary.update(description=str(w.rng.random()))
+        return dictionary
+
+    # Прогрев: тёплые варианты должны попадать в кэш с первого вызова
+    entries.get_by_ids([entry_id for entry_id, _, _ in w.samples])
+    for dictionary_id in w.dictionary_ids:
+        dictionaries.get_by_id(dictionary_id)
+
+    # Тёплые вызовы по словарю идут к самому большому словарю, холодные -
+    # к типичному: иначе построение индекса на крупной базе займёт весь прогон
+    return [
+        # DictionaryRepository
+        Case(
+            "DictionaryRepository.create",
+            dictionaries.create,
+            lambda: (w.new_dictionary(),),
+        ),
+        Case(
+            "DictionaryRepository.get_by_id",
+            dictionaries.get_by_id,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "DictionaryRepository.get_by_id[cold]",
+            lambda repository, i: repository.get_by_id(i),
+            lambda: (cold_dictionaries(db), w.dictionary_id()),
+        ),
+        Case(
+            "DictionaryRepository.get_updated_at",
+            dictionaries.get_updated_at,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "DictionaryRepository.get_stats",
+            dictionaries.get_stats,
+            lambda: (w.large, since, as_of),
+        ),
+        Case("DictionaryRepository.get_all", lambda: dictionaries.get_all(limit=100)),
+        Case("DictionaryRepository.get_rows", lambda: dictionaries.get_rows(limit=100)),
+        Case("DictionaryRepository.count", dictionaries.count),
+        Case(
+            "DictionaryRepository.update",
+            dictionaries.update,
+            lambda: (scratch_copy(),),
+        ),
+        Case(
+            "DictionaryRepository.delete",
+            dictionaries.delete,
+            lambda: (dictionaries.create(w.new_dictionary()).id,),
+        ),
+        # EntryRepository
+        Case("EntryRepository.create", entries.create, lambda: (w.new_entry(),)),
+        Case(
+            f"EntryRepository.bulk_create[{BATCH}]",
+            entries.bulk_create,
+            lambda: ([w.new_entry() for _ in range(BATCH)],),
+        ),
+        Case(
+            f"EntryRepository.bulk_create[{BATCH},skip]",
+            entries.bulk_create,
+            lambda: (w.copies_of_duplicates(), "skip"),
+        ),
+        Case(
+            f"EntryRepository.bulk_create[{BATCH},merge]",
+            entries.bulk_create,
+            lambda: (w.copies_of_duplicates(), "merge"),
+        ),
+        Case(
+            "EntryRepository.delete",
+            entries.delete,
+            lambda: (entries.create(w.new_entry()).id,),
+        ),
+        Case(
+            "EntryRepository.autocomplete",
+            entries.autocomplete,
+            lambda: (w.large, w.word()[:2]),
+        ),
+        Case(
+            "EntryRepository.autocomplete[cold]",
+            lambda repository, i, prefix: repository.autocomplete(i, prefix),
+            lambda: (cold_entries(db), w.typical, w.word()[:2]),
+        ),
+        Case(
+            "EntryRepository.fuzzy_search",
+            entries.fuzzy_search,
+            lambda: (w.large, w.word()[::-1]),
+        ),
+        Case(
+            "EntryRepository.fuzzy_search[cold]",
+            lambda repository, i, query: repository.fuzzy_search(i, query),
+            lambda: (cold_entries(db), w.typical, w.word()[::-1]),
+        ),
+        Case(
+            "EntryRepository.dictionary_exists",
+            entries.dictionary_exists,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "EntryRepository.count_by_dictionary",
+            entries.count_by_dictionary,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "EntryRepository.get_entries_version",
+            entries.get_entries_version,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case("EntryRepository.get_by_id", entries.get_by_id, lambda: (w.entry_id(),)),
+        Case(
+            "EntryRepository.get_by_id[cold]",
+            lambda repository, i: repository.get_by_id(i),
+            lambda: (cold_entries(db), w.entry_id()),
+        ),
+        Case(
+            f"EntryRepository.get_by_ids[{BATCH}]",
+            entries.get_by_ids,
+            lambda: (w.entry_ids(),),
+        ),
+        Case(
+            f"EntryRepository.get_by_ids[{BATCH},cold]",
+            lambda repository, ids: repository.get_by_ids(ids),
+            lambda: (cold_entries(db), w.entry_ids()),
+        ),
+        Case(
+            "EntryRepository.get_by_dictionary",
+            entries.get_by_dictionary,
+            lambda: (w.large,),
+        ),
+        Case(
+            "EntryRepository.get_rows_by_dictionary",
+            entries.get_rows_by_dictionary,
+            lambda: (w.large,),
+        ),
+        Case(
+            "EntryRepository.iter_rows",
+            lambda i: consume(entries.iter_rows(i)),
+            lambda: (w.typical,),
+        ),
+        Case("EntryRepository.search", entries.search, lambda: (w.word()[:4],)),
+        Case(
+            "EntryRepository.search[dictionary]",
+            entries.search,
+            lambda: (w.word()[:4], w.large),
+        ),
+        Case(
+            "EntryRepository.get_by_original_text",
+            entries.get_by_original_text,
+            lambda: (w.large, w.word()),
+        ),
+        # DictionaryService
+        Case(
+            "DictionaryService.create_dictionary",
+            lambda d: dictionary_service.create_dictionary(
+                d.name, d.source_language, d.target_language
+            ),
+            lambda: (w.new_dictionary(),),
+        ),
+        Case(
+            "DictionaryService.get_dictionary",
+            dictionary_service.get_dictionary,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "DictionaryService.get_dictionary_updated_at",
+            dictionary_service.get_dictionary_updated_at,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "DictionaryService.get_dictionary_stats",
+            dictionary_service.get_dictionary_stats,
+            lambda: (w.large,),
+        ),
+        Case(
+            "DictionaryService.get_all_dictionaries",
+            dictionary_service.get_all_dictionaries,
+        ),
+        Case(
+            "DictionaryService.get_all_dictionary_rows",
+            dictionary_service.get_all_dictionary_rows,
+        ),
+        Case(
+            "DictionaryService.count_dictionaries",
+            dictionary_service.count_dictionaries,
+        ),
+        Case(
+            "DictionaryService.update_dictionary",
+            lambda: dictionary_service.update_dictionary(
+                w.scratch.id, description=str(w.rng.random())
+            ),
+        ),
+        Case(
+            "DictionaryService.delete_dictionary",
+            dictionary_service.delete_dictionary,
+            lambda: (dictionaries.create(w.new_dictionary()).id,),
+        ),
+        # EntryService
+        Case(
+            "EntryService.create_entry",
+            lambda e: entry_service.create_entry(
+                e.dictionary_id, e.original_text, e.translated_text
+            ),
+            lambda: (w.new_entry(),),
+        ),
+        Case(
+            "EntryService.add_entry",
+            lambda e: entry_service.add_entry(
+                e.dictionary_id, e.original_text, e.translated_text
+            ),
+            lambda: (w.new_entry(),),
+        ),
+        Case(
+            f"EntryService.import_entries[{BATCH}]",
+            lambda data: entry_service.import_entries(w.scratch.id, chunks(data)),
+            lambda: (w.ndjson(),),
+        ),
+        Case(
+            "EntryService.search_entries",
+            entry_service.search_entries,
+            lambda: (w.word()[:4],),
+        ),
+        Case(
+            "EntryService.autocomplete",
+            entry_service.autocomplete,
+            lambda: (w.large, w.word()[:2]),
+        ),
+        Case(
+            "EntryService.fuzzy_search",
+            entry_service.fuzzy_search,
+            lambda: (w.large, w.word()[::-1]),
+        ),
+        Case(
+            "EntryService.export_entries",
+            lambda i: consume(entry_service.export_entries(i)),
+            lambda: (w.typical,),
+        ),
+        Case(
+            "EntryService.dictionary_exists",
+            entry_service.dictionary_exists,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "EntryService.get_entry", entry_service.get_entry, lambda: (w.entry_id(),)
+        ),
+        Case(
+            f"EntryService.get_entries[{BATCH}]",
+            entry_service.get_entries,
+            lambda: (w.entry_ids(),),
+        ),
+        Case(
+            "EntryService.delete_entry",
+            entry_service.delete_entry,
+            lambda: (entries.create(w.new_entry()).id,),
+        ),
+        Case(
+            "EntryService.get_entries_version",
+            entry_service.get_entries_version,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "EntryService.count_dictionary_entries",
+            entry_service.count_dictionary_entries,
+            lambda: (w.dictionary_id(),),
+        ),
+        Case(
+            "EntryService.get_dictionary_entries",
+            entry_service.get_dictionary_entries,
+            lambda: (w.large,),
+        ),
+        Case(
+            "EntryService.get_dictionary_entry_rows",
+            entry_service.get_dictionary_entry_rows,
+            lambda: (w.large,),
+        ),
+        Case(
+            "EntryService.find_entries",
+            entry_service.find_entries,
+            lambda: (w.large, w.word()),
+        ),
+    ]
+
+
+def uncovered_methods(cases: list[Case]) -> list[str]:
+    covered = {case.name.split("[")[0] for case in cases}
+    return [
+        f"{cls.__name__}.{name}"
+        for cls in BENCHMARKED_CLASSES
+        for name, _ in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_") and f"{cls.__name__}.{name}" not in covered
+    ]
+
+
+async def measure(case: Case, min_time: float, max_iterations: int) -> dict[str, Any]:
+    timings: list[float] = []
+    warmup = 2
+    deadline = None
+    while len(timings) < 5 or (
+        time.perf_counter() < deadline and len(timings) < max_iterations
+    ):
+        args = case.prepare()
+        started = time.perf_counter()
+        result = case.call(*args)
+        if inspect.isawaitable(result):
+            await result
+        elapsed = time.perf_counter() - started
+
+        if warmup:
+            warmup -= 1
+            if not warmup:
+                deadline = time.perf_counter() + min_time
+            continue
+        timings.append(elapsed * 1e6)
+
+    timings.sort()
+    return {
+        "iterations": len(timings),
+        "median_us": round(statistics.median(timings), 2),
+        "p95_us": round(timings[int(len(timings) * 0.95) - 1], 2),
+        "mean_us": round(statistics.fmean(timings), 2),
+    }
+
+
+def http_endpoints(w: Workload) -> list[Endpoint]:
+    dictionaries = "/api/v1/dictionaries"
+
+    async def created_entry(client: httpx.AsyncClient) -> str:
+        entry = w.new_entry()
+        response = await client.post(
+            f"{dictionaries}/{w.scratch.id}/entries",
+            json={"original_text": entry.original_text, "translated_text": "x"},
+        )
+        return response.json()["id"]
+
+    return [
+        Endpoint(
+            "POST /dictionaries",
+            lambda _: (
+                "POST",
+                f"{dictionaries}/",
+                {
+                    "json": {
+                        "name": w.new_dictionary().name,
+                        "source_language": "en",
+                        "target_language": "ru",
+                    }
+                },
+            ),
+            expected=201,
+        ),
+        Endpoint(
+            "GET /dictionaries/{id}",
+            lambda _: ("GET", f"{dictionaries}/{w.dictionary_id()}", {}),
+        ),
+        Endpoint(
+            "GET /dictionaries/{id}/stats",
+            lambda _: ("GET", f"{dictionaries}/{w.large}/stats", {}),
+        ),
+        Endpoint(
+            "GET /dictionaries",
+            lambda _: ("GET", f"{dictionaries}/", {"params": {"limit": 100}}),
+        ),
+        Endpoint(
+            "POST /dictionaries/{id}/entries",
+            lambda _: (
+                "POST",
+                f"{dictionaries}/{w.scratch.id}/entries",
+                {
+                    "json": {
+                        "original_text": w.new_entry().original_text,
+                        "translated_text": "x",
+                    }
+                },
+            ),
+            expected=201,
+        ),
+        Endpoint(
+            f"POST /dictionaries/{{id}}/entries/import[{BATCH}]",
+            lambda _: (
+                "POST",
+                f"{dictionaries}/{w.scratch.id}/entries/import",
+                {
+                    "content": w.ndjson(),
+                    "headers": {"content-type": "application/x-ndjson"},
+                },
+            ),
+        ),
+        Endpoint(
+            "GET /dictionaries/{id}/entries/export",
+            lambda _: ("GET", f"{dictionaries}/{w.typical}/entries/export", {}),
+        ),
+        Endpoint(
+            "GET /dictionaries/{id}/autocomplete",
+            lambda _: (
+                "GET",
+                f"{dictionaries}/{w.large}/autocomplete",
+                {"params": {"prefix": w.word()[:2]}},
+            ),
+        ),
+        Endpoint(
+            "GET /dictionaries/{id}/fuzzy",
+            lambda _: (
+                "GET",
+                f"{dictionaries}/{w.large}/fuzzy",
+                {"params": {"q": w.word()[::-1]}},
+            ),
+        ),
+        Endpoint(
+            "GET /dictionaries/{id}/entries",
+            lambda _: (
+                "GET",
+                f"{dictionaries}/{w.large}/entries",
+                {"params": {"limit": 100}},
+            ),
+        ),
+        Endpoint(
+            "GET /entries/{id}",
+            lambda _: ("GET", f"/api/v1/entries/{w.entry_id()}", {}),
+        ),
+        Endpoint(
+            f"POST /entries:batchGet[{BATCH}]",
+            lambda _: (
+                "POST",
+                "/api/v1/entries:batchGet",
+                {"json": {"ids": [str(i) for i in w.entry_ids()]}},
+            ),
+        ),
+        Endpoint(
+            "DELETE /entries/{id}",
+            lambda entry_id: ("DELETE", f"/api/v1/entries/{entry_id}", {}),
+            expected=204,
+            setup=created_entry,
+        ),
+        Endpoint(
+            "GET /search",
+            lambda _: ("GET", "/api/v1/search", {"params": {"q": w.word()[:4]}}),
+        ),
+    ]
+
+
+async def load_endpoint(
+    client: httpx.AsyncClient, endpoint: Endpoint, concurrency: int, duration: float
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(deadline: float) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            value = await endpoint.setup(client) if endpoint.setup else None
+            method, url, kwargs = endpoint.build(value)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code != endpoint.expected
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(started + duration) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    # Подготовка (setup) занимает часть времени клиентов: пропускная
+    # способность считается по времени, потраченному на сами запросы
+    busy = sum(latencies) / concurrency if endpoint.setup else elapsed
+    quantiles = (
+        statistics.quantiles(latencies, n=100)
+        if len(latencies) > 1
+        else [latencies[0]] * 99
+    )
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / busy, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+async def run_suite(session_factory, args) -> dict[str, Any]:
+    output: dict[str, Any] = {"micro": {}, "http": {}}
+    db = session_factory()
+    workload = Workload(db, args.seed)
+
+    if not args.skip_micro:
+        cases = micro_cases(db, workload)
+        for method in uncovered_methods(cases):
+            print(f"warning: no benchmark for {method}", file=sys.stderr)
+        for case in cases:
+            if args.filter and args.filter not in case.name:
+                continue
+            output["micro"][case.name] = measurement = await measure(
+                case, args.min_time, args.max_iterations
+            )
+            print(
+                f"{case.name:<48} {measurement['median_us']:>11.1f} us  "
+                f"p95 {measurement['p95_us']:>11.1f} us  "
+                f"n={measurement['iterations']}"
+            )
+
+    if not args.skip_http:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            for endpoint in http_endpoints(workload):
+                if args.filter and args.filter not in endpoint.name:
+                    continue
+                output["http"][endpoint.name] = measurement = await load_endpoint(
+                    client, endpoint, args.concurrency, args.duration
+                )
+                print(
+                    f"{endpoint.name:<48} {measurement['rps']:>8.0f} req/s  "
+                    f"p50 {measurement['p50_ms']:7.2f}  "
+                    f"p95 {measurement['p95_ms']:7.2f}  "
+                    f"p99 {measurement['p99_ms']:7.2f} ms  "
+                    f"errors {measurement['errors']}"
+                )
+
+    db.close()
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--dictionaries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--max-iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--filter", help="только бенчмарки с этой подстрокой")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=results.DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    dataset = ensure_dataset(args.entries, args.dictionaries, args.seed, args.cache_dir)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.db"
+        shutil.copyfile(dataset, path)
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+            pool_size=executor.DB_EXECUTOR_WORKERS + 1,
+            max_overflow=-1,
+        )
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        output = asyncio.run(run_suite(session_factory, args))
+        engine.dispose()
+
+    params = {
+        name: getattr(args, name)
+        for name in (
+            "entries",
+            "dictionaries",
+            "seed",
+            "min_time",
+            "max_iterations",
+            "concurrency",
+            "duration",
+        )
+    }
+    output = {"meta": results.run_metadata(params), **output}
+    if args.output:
+        results.save(args.output, output)
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        sys.exit(results.report(results.load(args.baseline), output, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
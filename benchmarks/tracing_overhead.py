@@ -0,0 +1,138 @@
+"""Цена трассировки: запросы без трасс, со всеми трассами и с журналом медленных.
+
+Один клиент последовательно читает запись по ID (ответ из кэша) и страницу
+записей словаря (несколько SQL-запросов). Режимы чередуются раундами,
+чтобы дрейф машины не попадал в разницу:
+
+- ``off`` - трассировка выключена (по умолчанию);
+- ``slow-log`` - пишутся все запросы, но ничего не экспортируется;
+- ``sampled`` - каждый запрос сэмплирован и уходит в экспортёр в памяти.
+
+Отдельно меряется вызов метода с обёрткой ``@traced`` вне трассы против
+вызова исходной функции.
+
+Запуск: ``python -m benchmarks.tracing_overhead --requests 2000``
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base, get_db, tracing
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.main import app
+
+ROUNDS = 5
+MODES = {
+    "off": lambda: tracing.Tracer(sample_rate=0, slow_request_ms=0),
+    # Порог недостижим: дерево строится, но в журнал не пишется
+    "slow-log": lambda: tracing.Tracer(sample_rate=0, slow_request_ms=60_000),
+    "sampled": lambda: tracing.Tracer(
+        sample_rate=1, exporter=tracing.InMemoryExporter(max_traces=100)
+    ),
+}
+
+
+async def measure(client: httpx.AsyncClient, urls: list[str], requests: int) -> float:
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        response = await client.get(urls[i % len(urls)])
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return statistics.median(latencies)
+
+
+async def run_http(urls: dict[str, list[str]], requests: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    results: dict[tuple[str, str], list[float]] = {}
+    previous = tracing.tracer
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(ROUNDS):
+            for mode, make_tracer in MODES.items():
+                tracing.tracer = make_tracer()
+                for name, paths in urls.items():
+                    median = await measure(c, paths, requests // ROUNDS)
+                    results.setdefault((name, mode), []).append(median)
+    tracing.tracer = previous
+
+    for name in urls:
+        off = statistics.median(results[(name, "off")]) * 1e6
+        line = f"{name:>14}: off {off:7.1f} us"
+        for mode in list(MODES)[1:]:
+            on = statistics.median(results[(name, mode)]) * 1e6
+            line += f", {mode} {on:7.1f} us ({on / off - 1:+.1%})"
+        print(line)
+
+
+def run_wrapper(session_factory, dictionary_id, calls: int) -> None:
+    db = session_factory()
+    repository = DictionaryRepository(db)
+    repository.get_by_id(dictionary_id)
+    wrapped = DictionaryRepository.get_by_id
+    plain = wrapped.__wrapped__
+    for name, fn in (("plain", plain), ("@traced", wrapped)):
+        elapsed = min(
+            timeit.repeat(lambda: fn(repository, dictionary_id), number=calls, repeat=5)
+        )
+        print(f"{'get_by_id':>14}: {name:>8} {elapsed / calls * 1e6:6.2f} us")
+    db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        db = session_factory()
+        dictionary = DictionaryRepository(db).create(
+            Dictionary(name="bench", source_language="en", target_language="ru")
+        )
+        entries = [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text=f"word{i}",
+                translated_text="слово",
+            )
+            for i in range(1000)
+        ]
+        EntryRepository(db).bulk_create(entries)
+        db.close()
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        urls = {
+            "entry by id": [f"/api/v1/entries/{entry.id}" for entry in entries[:100]],
+            "entries page": [f"/api/v1/dictionaries/{dictionary.id}/entries?limit=20"],
+        }
+        asyncio.run(run_http(urls, args.requests))
+        # Чтение из кэша: стоимость самой обёртки видна сильнее всего
+        run_wrapper(session_factory, dictionary.id, args.requests * 50)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
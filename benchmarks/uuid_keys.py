@@ -0,0 +1,168 @@
+"""Размер таблиц и индексов и скорость выборок: UUID-ключи строкой vs BLOB.
+
+База заполняется через репозитории (ключи - 16-байтовые BLOB), затем
+копия переводится в старый формат (ключи строками VARCHAR(36)) и
+обратно командой ``convert-uuid-keys``; время миграции тоже выводится.
+
+Запуск: ``python -m benchmarks.uuid_keys --entries 1000000``
+"""
+
+import argparse
+import random
+import shutil
+import sqlite3
+import string
+import tempfile
+import time
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.fulltext import FTS_TABLE
+from app.infrastructure.maintenance import convert_uuid_keys
+from app.infrastructure.repository import DictionaryRepository
+
+JOIN_QUERY = (
+    "SELECT d.name, count(*) FROM entries e "
+    "JOIN dictionaries d ON d.id = e.dictionary_id GROUP BY d.id"
+)
+LOOKUP_QUERY = "SELECT original_text FROM entries WHERE id = ?"
+
+
+def seed(path: Path, dictionaries: int, entries: int) -> None:
+    rng = random.Random(1)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    dictionary_ids = [
+        DictionaryRepository(db)
+        .create(Dictionary(name=f"d{i}", source_language="en", target_language="ru"))
+        .id
+        for i in range(dictionaries)
+    ]
+    repo = EntryRepository(db)
+    for start in range(0, entries, 10_000):
+        repo.bulk_create(
+            [
+                Entry(
+                    dictionary_id=rng.choice(dictionary_ids),
+                    original_text="".join(rng.choices(string.ascii_lowercase, k=8)),
+                    translated_text="".join(rng.choices(string.ascii_lowercase, k=8)),
+                )
+                for _ in range(min(10_000, entries - start))
+            ]
+        )
+    db.close()
+    engine.dispose()
+    connection = sqlite3.connect(path)
+    connection.execute("VACUUM")
+    connection.close()
+
+
+def to_text_keys(path: Path) -> None:
+    connection = sqlite3.connect(path)
+    connection.create_function(
+        "uuid_text", 1, lambda value: str(UUID(bytes=value)), deterministic=True
+    )
+    for suffix in ("ai", "ad", "au"):
+        connection.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+    connection.execute("UPDATE dictionaries SET id = uuid_text(id)")
+    connection.execute(
+        "UPDATE entries SET id = uuid_text(id), dictionary_id = uuid_text(dictionary_id)"
+    )
+    connection.commit()
+    connection.execute("VACUUM")
+    connection.close()
+
+
+def sizes(path: Path) -> dict[str, int]:
+    connection = sqlite3.connect(path)
+    rows = connection.execute(
+        "SELECT name, sum(pgsize) FROM dbstat "
+        "WHERE name IN (SELECT name FROM sqlite_schema WHERE tbl_name = 'entries') "
+        "GROUP BY name"
+    ).fetchall()
+    connection.close()
+    return dict(rows)
+
+
+def timings(path: Path, lookups: int) -> tuple[float, float]:
+    connection = sqlite3.connect(path)
+    ids = [row[0] for row in connection.execute("SELECT id FROM entries")]
+    sample = random.Random(2).sample(ids, min(lookups, len(ids)))
+
+    join = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        connection.execute(JOIN_QUERY).fetchall()
+        join = min(join, time.perf_counter() - started)
+
+    lookup = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for entry_id in sample:
+            connection.execute(LOOKUP_QUERY, (entry_id,)).fetchone()
+        lookup = min(lookup, (time.perf_counter() - started) / len(sample))
+    connection.close()
+    return join, lookup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--dictionaries", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary = Path(directory) / "binary.db"
+        text = Path(directory) / "text.db"
+        seed(binary, args.dictionaries, args.entries)
+        shutil.copy(binary, text)
+        to_text_keys(text)
+        text_sizes, binary_sizes = sizes(text), sizes(binary)
+        text_timings = timings(text, args.lookups)
+        binary_timings = timings(binary, args.lookups)
+
+        migrated = Path(directory) / "migrated.db"
+        shutil.copy(text, migrated)
+        engine = create_engine(f"sqlite:///{migrated}")
+        db = sessionmaker(bind=engine)()
+        started = time.perf_counter()
+        converted = convert_uuid_keys(db)
+        migration = time.perf_counter() - started
+        db.close()
+        engine.dispose()
+
+        print(f"entries={args.entries}, dictionaries={args.dictionaries}")
+        print(f"{'':>40} {'text':>10} {'blob':>10}")
+        for name in sorted(text_sizes):
+            print(
+                f"{name:>40} {text_sizes[name] / 2**20:8.1f}MB "
+                f"{binary_sizes[name] / 2**20:8.1f}MB"
+            )
+        print(
+            f"{'file':>40} {text.stat().st_size / 2**20:8.1f}MB "
+            f"{binary.stat().st_size / 2**20:8.1f}MB"
+        )
+        print(
+            f"{'join + group by':>40} {text_timings[0] * 1000:8.1f}ms "
+            f"{binary_timings[0] * 1000:8.1f}ms"
+        )
+        print(
+            f"{'lookup by id':>40} {text_timings[1] * 1e6:8.1f}us "
+            f"{binary_timings[1] * 1e6:8.1f}us"
+        )
+        print(
+            f"convert-uuid-keys: {converted} rows in {migration:.1f} s, "
+            f"file {migrated.stat().st_size / 2**20:.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
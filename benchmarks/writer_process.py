@@ -0,0 +1,214 @@
+"""Несколько воркеров пишут в одну базу: напрямую или через процесс-писатель.
+
+Запускается ``--workers`` процессов, в каждом ``--concurrency`` одновременных
+записей (как запросы одного воркера uvicorn). Режимы:
+
+- ``direct`` - каждый воркер пишет сам, по транзакции на запись
+  (профиль ``tuned``): процессы соревнуются за блокировку файла SQLite;
+- ``writer`` - все записи идут через ``python -m app.infrastructure.writer``
+  по Unix-сокету и коммитятся им пачками.
+
+Выводятся записи в секунду, p50/p99 задержки, ошибки «database is locked»
+и отказы писателя (503 в API).
+
+Запуск: ``python -m benchmarks.writer_process --workers 4 --concurrency 8 --seconds 10``
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure.database import create_db_engine
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.migrations import migrate
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.writer import WriterClient, WriterUnavailableError
+
+from .sqlite_profile import percentile
+
+
+def create_database(path: Path, dictionaries: int) -> list:
+    engine = create_db_engine(f"sqlite:///{path}")
+    db = sessionmaker(bind=engine)()
+    migrate(db)
+    ids = [
+        DictionaryRepository(db)
+        .create(
+            Dictionary(name=f"bench{d}", source_language="en", target_language="ru")
+        )
+        .id
+        for d in range(dictionaries)
+    ]
+    db.close()
+    engine.dispose()
+    return ids
+
+
+def make_entry(dictionary_ids, worker: int, i: int) -> Entry:
+    return Entry(
+        dictionary_id=dictionary_ids[i % len(dictionary_ids)],
+        original_text=f"new{worker}-{i}",
+        translated_text="новое",
+    )
+
+
+def direct_worker(worker, path, dictionary_ids, args, start, results) -> None:
+    engine = create_db_engine(f"sqlite:///{path}", pool_size=args.concurrency)
+    session_factory = sessionmaker(bind=engine)
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    start.wait()
+    deadline = time.perf_counter() + args.seconds
+
+    def write(thread: int) -> None:
+        nonlocal errors
+        db = session_factory()
+        entries = EntryRepository(db)
+        i = thread
+        while time.perf_counter() < deadline:
+            i += args.concurrency
+            started = time.perf_counter()
+            try:
+                entries.create(make_entry(dictionary_ids, worker, i))
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+        db.close()
+
+    threads = [
+        threading.Thread(target=write, args=(t,)) for t in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    results.put((latencies, errors, 0))
+
+
+def writer_worker(worker, socket, dictionary_ids, args, start, results) -> None:
+    latencies: list[float] = []
+    errors = rejected = 0
+
+    async def write(client: WriterClient, task: int, deadline: float) -> None:
+        nonlocal errors, rejected
+        i = task
+        while time.perf_counter() < deadline:
+            i += args.concurrency
+            started = time.perf_counter()
+            try:
+                await client.call(
+                    "EntryRepository.create", make_entry(dictionary_ids, worker, i)
+                )
+            except WriterUnavailableError:
+                rejected += 1
+                continue
+            except OperationalError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    async def run() -> None:
+        client = WriterClient(socket)
+        await client.connect()
+        start.wait()
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(write(client, t, deadline) for t in range(args.concurrency))
+        )
+        await client.close()
+
+    asyncio.run(run())
+    results.put((latencies, errors, rejected))
+
+
+def start_writer(path: Path, socket: str) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.infrastructure.writer", "--socket", socket],
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    while not os.path.exists(socket):
+        if process.poll() is not None:
+            raise RuntimeError("Writer process exited on startup")
+        time.sleep(0.05)
+    return process
+
+
+def run(mode: str, directory: Path, args) -> None:
+    path = directory / f"{mode}.db"
+    dictionary_ids = create_database(path, args.dictionaries)
+    socket = str(directory / "writer.sock")
+    writer = start_writer(path, socket) if mode == "writer" else None
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    target, address = (
+        (direct_worker, path) if mode == "direct" else (writer_worker, socket)
+    )
+    workers = [
+        context.Process(
+            target=target, args=(w, address, dictionary_ids, args, start, results)
+        )
+        for w in range(args.workers)
+    ]
+    for process in workers:
+        process.start()
+    # Отсчёт начинается, когда все процессы запущены и подключены
+    time.sleep(1)
+    start.set()
+    latencies: list[float] = []
+    errors = rejected = 0
+    for _ in workers:
+        worker_latencies, worker_errors, worker_rejected = results.get()
+        latencies += worker_latencies
+        errors += worker_errors
+        rejected += worker_rejected
+    for process in workers:
+        process.join()
+    if writer is not None:
+        writer.terminate()
+        writer.wait()
+
+    print(
+        f"{mode:>6}: writes {len(latencies) / args.seconds:7.0f}/s "
+        f"(p50 {percentile(latencies, 50) * 1000:7.2f} ms, "
+        f"p99 {percentile(latencies, 99) * 1000:8.2f} ms), "
+        f"locked {errors}, rejected {rejected}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--dictionaries", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--modes", nargs="+", default=["direct", "writer"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes:
+            run(mode, Path(directory), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ setup(
         "uvicorn==0.24.0",
         "sqlalchemy==2.0.23",
         "pydantic==2.5.0",
+        "orjson==3.9.10",
     ],
     extras_require={
         "dev": [
@@ -1,10 +1,19 @@
+from datetime import datetime
+from uuid import UUID
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.infrastructure import Base, get_db
+from app.api.entry_schemas import BATCH_GET_MAX_IDS, EntryListResponse, EntryResponse
+from app.api.pagination import encode_cursor
+from app.api.schemas import DictionaryListResponse, DictionaryResponse
+from app.domain import Entry
+from app.infrastructure import Base, DictionaryRepository, EntryRepository, get_db
 from app.main import app
+from app.services import DictionaryService
+from app.services.entry_service import EntryService
 
 # Создаём тестовую БД в памяти
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -135,9 +144,632 @@ class TestDictionaryAPI:
         assert response.status_code == 200
         data = response.json()
         assert len(data["dictionaries"]) == 2
+        assert data["total"] == 5
 
     def test_health_check(self):
         response = client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
+
+    def test_get_dictionaries_with_cursor(self):
+        for i in range(5):
+            client.post(
+                "/api/v1/dictionaries/",
+                json={
+                    "name": f"Dictionary {i}",
+                    "source_language": "en",
+                    "target_language": "ru",
+                },
+            )
+
+        first = client.get("/api/v1/dictionaries/?limit=2").json()
+        second = client.get(
+            f"/api/v1/dictionaries/?limit=2&cursor={first['next_cursor']}"
+        ).json()
+        third = client.get(
+            f"/api/v1/dictionaries/?limit=2&cursor={second['next_cursor']}"
+        ).json()
+
+        names = [
+            d["name"] for page in (first, second, third) for d in page["dictionaries"]
+        ]
+        assert names == [f"Dictionary {i}" for i in range(5)]
+        assert third["next_cursor"] is None
+
+    @pytest.mark.parametrize("query", ["limit=0", "limit=-1", "limit=1001", "skip=-1"])
+    def test_list_pagination_parameters_are_validated(self, query):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Bounds", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+
+        listing = client.get(f"/api/v1/dictionaries/?{query}")
+        entries = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries?{query}")
+
+        assert listing.status_code == 422
+        assert entries.status_code == 422
+
+    def test_get_dictionaries_with_invalid_cursor(self):
+        response = client.get("/api/v1/dictionaries/?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+
+class TestDictionaryStatsAPI:
+    def test_stats_reflect_entries(self):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Stats", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+        for original, example in (("cat", "A cat"), ("horse", None)):
+            client.post(
+                f"/api/v1/dictionaries/{dictionary_id}/entries",
+                json={
+                    "original_text": original,
+                    "translated_text": "зверь",
+                    "usage_example": example,
+                },
+            )
+
+        response = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}/stats?days=7&weeks=2"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["dictionary_id"] == dictionary_id
+        assert data["entry_count"] == 2
+        assert data["with_example_share"] == 0.5
+        assert data["with_notes_share"] == 0.0
+        assert data["average_original_length"] == 4.0
+        assert data["average_translated_length"] == 5.0
+        assert len(data["added_per_day"]) == 7
+        assert data["added_per_day"][-1] == {
+            "day": datetime.utcnow().date().isoformat(),
+            "count": 2,
+        }
+        assert [week["count"] for week in data["added_per_week"]] == [0, 2]
+
+    def test_stats_for_missing_dictionary(self):
+        response = client.get(
+            "/api/v1/dictionaries/123e4567-e89b-12d3-a456-426614174000/stats"
+        )
+
+        assert response.status_code == 404
+
+    def test_stats_window_is_validated(self):
+        response = client.get(
+            "/api/v1/dictionaries/123e4567-e89b-12d3-a456-426614174000/stats?days=0"
+        )
+
+        assert response.status_code == 422
+
+
+class TestEntryAPI:
+    def _create_dictionary(self) -> str:
+        response = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Words", "source_language": "en", "target_language": "ru"},
+        )
+        return response.json()["id"]
+
+    def test_create_and_get_entry(self):
+        dictionary_id = self._create_dictionary()
+
+        response = client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={"original_text": "Hello", "translated_text": "Привет"},
+        )
+
+        assert response.status_code == 201
+        entry_id = response.json()["id"]
+
+        response = client.get(f"/api/v1/entries/{entry_id}")
+        assert response.status_code == 200
+        assert response.json()["original_text"] == "Hello"
+
+    def test_duplicate_entry_is_rejected(self):
+        dictionary_id = self._create_dictionary()
+        url = f"/api/v1/dictionaries/{dictionary_id}/entries"
+
+        first = client.post(
+            url, json={"original_text": "Hello", "translated_text": "A"}
+        )
+        second = client.post(
+            url, json={"original_text": " hello", "translated_text": "B"}
+        )
+
+        assert first.status_code == 201
+        assert second.status_code == 409
+        listing = client.get(url).json()
+        assert listing["total"] == 1
+
+    def test_get_nonexistent_entry(self):
+        response = client.get("/api/v1/entries/123e4567-e89b-12d3-a456-426614174000")
+
+        assert response.status_code == 404
+
+    def test_get_entries_with_cursor(self):
+        dictionary_id = self._create_dictionary()
+        for i in range(5):
+            client.post(
+                f"/api/v1/dictionaries/{dictionary_id}/entries",
+                json={"original_text": f"Word{i}", "translated_text": f"Слово{i}"},
+            )
+
+        url = f"/api/v1/dictionaries/{dictionary_id}/entries?limit=2"
+        words = []
+        cursor = None
+        while True:
+            page = client.get(url + (f"&cursor={cursor}" if cursor else "")).json()
+            words.extend(e["original_text"] for e in page["entries"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert words == [f"Word{i}" for i in range(5)]
+        assert page["total"] == 5
+
+    def test_delete_entry_updates_total(self):
+        dictionary_id = self._create_dictionary()
+        entry_ids = [
+            client.post(
+                f"/api/v1/dictionaries/{dictionary_id}/entries",
+                json={"original_text": f"Word{i}", "translated_text": f"Слово{i}"},
+            ).json()["id"]
+            for i in range(3)
+        ]
+
+        response = client.delete(f"/api/v1/entries/{entry_ids[0]}")
+        assert response.status_code == 204
+
+        response = client.delete(f"/api/v1/entries/{entry_ids[0]}")
+        assert response.status_code == 404
+
+        data = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}/entries?limit=1"
+        ).json()
+        assert len(data["entries"]) == 1
+        assert data["total"] == 2
+
+    def test_get_entries_with_invalid_cursor(self):
+        dictionary_id = self._create_dictionary()
+
+        response = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}/entries?cursor=%%%"
+        )
+
+        assert response.status_code == 400
+
+
+class TestBatchGetAPI:
+    def _create_entries(self, count: int) -> list[str]:
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Cards", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+        return [
+            client.post(
+                f"/api/v1/dictionaries/{dictionary_id}/entries",
+                json={"original_text": f"Word{i}", "translated_text": f"Слово{i}"},
+            ).json()["id"]
+            for i in range(count)
+        ]
+
+    def test_preserves_request_order_and_reports_missing(self):
+        first, second, third = self._create_entries(3)
+        unknown = "123e4567-e89b-12d3-a456-426614174000"
+
+        response = client.post(
+            "/api/v1/entries:batchGet",
+            json={"ids": [third, unknown, first, third]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [entry["id"] for entry in data["entries"]] == [third, first]
+        assert data["entries"][1]["original_text"] == "Word0"
+        assert data["entries"][0] == client.get(f"/api/v1/entries/{third}").json()
+        assert data["missing"] == [unknown]
+
+    def test_lookup_spans_several_chunks(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.entry_repository.IN_CHUNK_SIZE", 2)
+        ids = self._create_entries(5)
+
+        response = client.post("/api/v1/entries:batchGet", json={"ids": ids[::-1]})
+
+        assert [entry["id"] for entry in response.json()["entries"]] == ids[::-1]
+
+    def test_rejects_too_many_ids(self):
+        ids = ["123e4567-e89b-12d3-a456-426614174000"] * (BATCH_GET_MAX_IDS + 1)
+
+        response = client.post("/api/v1/entries:batchGet", json={"ids": ids})
+
+        assert response.status_code == 422
+
+    def test_empty_request(self):
+        response = client.post("/api/v1/entries:batchGet", json={"ids": []})
+
+        assert response.json() == {"entries": [], "missing": []}
+
+
+class TestEntryImportAPI:
+    def _create_dictionary(self) -> str:
+        response = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Words", "source_language": "en", "target_language": "ru"},
+        )
+        return response.json()["id"]
+
+    def test_import_ndjson_with_errors(self):
+        dictionary_id = self._create_dictionary()
+        body = "\n".join(
+            [
+                '{"original_text": "Hello", "translated_text": "Привет"}',
+                '{"original_text": "", "translated_text": "Пусто"}',
+                '{"original_text": 1, "translated_text": "Число"}',
+                '{"original_text": "Bye", "translated_text": "Пока", "notes": "n"}',
+            ]
+        )
+
+        response = client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries/import",
+            content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == 2
+        assert report["failed"] == 2
+        assert [e["line"] for e in report["errors"]] == [2, 3]
+
+        listing = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries").json()
+        assert listing["total"] == 2
+        assert [e["original_text"] for e in listing["entries"]] == ["Hello", "Bye"]
+
+    def test_import_csv(self):
+        dictionary_id = self._create_dictionary()
+        body = "original_text,translated_text\nHello,Привет\nBye,Пока\n"
+
+        response = client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries/import",
+            content=body.encode(),
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.json() == {
+            "imported": 2,
+            "duplicates": 0,
+            "failed": 0,
+            "errors": [],
+            "errors_omitted": 0,
+        }
+
+    def test_repeated_import_skips_duplicates(self):
+        dictionary_id = self._create_dictionary()
+        url = f"/api/v1/dictionaries/{dictionary_id}/entries/import?format=csv"
+        body = b"original_text,translated_text\nHello,hi\n"
+
+        client.post(url, content=body)
+        response = client.post(url, content=body.replace(b"Hello", b"HELLO "))
+
+        assert response.json()["imported"] == 0
+        assert response.json()["duplicates"] == 1
+        listing = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries").json()
+        assert listing["total"] == 1
+
+    def test_import_merge_updates_translation(self):
+        dictionary_id = self._create_dictionary()
+        url = f"/api/v1/dictionaries/{dictionary_id}/entries/import?format=csv"
+        client.post(url, content=b"original_text,translated_text\nHello,old\n")
+
+        response = client.post(
+            f"{url}&on_duplicate=merge",
+            content=b"original_text,translated_text\nhello,new\n",
+        )
+
+        assert response.json()["duplicates"] == 1
+        listing = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries").json()
+        assert [e["translated_text"] for e in listing["entries"]] == ["new"]
+
+    def test_import_error_mode_reports_only_conflicting_rows(self):
+        dictionary_id = self._create_dictionary()
+        url = f"/api/v1/dictionaries/{dictionary_id}/entries/import?format=csv"
+        client.post(url, content=b"original_text,translated_text\nHello,hi\n")
+
+        response = client.post(
+            f"{url}&on_duplicate=error",
+            content=b"original_text,translated_text\nNew,new\nhello,dup\nOther,x\n",
+        )
+
+        report = response.json()
+        assert report["imported"] == 2
+        assert report["failed"] == 1
+        assert [e["line"] for e in report["errors"]] == [3]
+        assert "already exists" in report["errors"][0]["error"]
+        listing = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries").json()
+        assert listing["total"] == 3
+
+    def test_import_into_missing_dictionary(self):
+        response = client.post(
+            "/api/v1/dictionaries/123e4567-e89b-12d3-a456-426614174000"
+            "/entries/import?format=csv",
+            content=b"original_text,translated_text\nA,B\n",
+        )
+
+        assert response.status_code == 404
+
+
+class TestEntryExportAPI:
+    def _create_dictionary_with_entries(self) -> str:
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Words", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+        client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={
+                "original_text": "Hello",
+                "translated_text": "Привет",
+                "usage_example": 'Say "hi",\nplease',
+            },
+        )
+        client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={"original_text": "Bye", "translated_text": "Пока"},
+        )
+        return dictionary_id
+
+    def test_export_ndjson_matches_api_representation(self):
+        import json
+
+        dictionary_id = self._create_dictionary_with_entries()
+
+        response = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        listed = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries").json()
+        assert exported == listed["entries"]
+
+    def test_export_csv(self):
+        import csv
+        import io
+
+        dictionary_id = self._create_dictionary_with_entries()
+
+        response = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}/entries/export?format=csv"
+        )
+
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [r["original_text"] for r in rows] == ["Hello", "Bye"]
+        assert rows[0]["usage_example"] == 'Say "hi",\nplease'
+
+    def test_export_empty_dictionary_csv_has_header(self):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Empty", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+
+        response = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}/entries/export?format=csv"
+        )
+
+        assert response.text.startswith("id,dictionary_id,original_text")
+
+    def test_export_missing_dictionary(self):
+        response = client.get(
+            "/api/v1/dictionaries/123e4567-e89b-12d3-a456-426614174000/entries/export"
+        )
+
+        assert response.status_code == 404
+
+
+class TestSearchAPI:
+    def test_search_entries(self):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Idioms", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+        client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={"original_text": "break the ice", "translated_text": "разрядить"},
+        )
+
+        response = client.get(f"/api/v1/search?q=ice&dictionary_id={dictionary_id}")
+
+        assert response.status_code == 200
+        [hit] = response.json()["hits"]
+        assert hit["entry"]["original_text"] == "break the ice"
+        assert hit["snippet"] == "break the <mark>ice</mark>"
+
+    def test_search_requires_query(self):
+        assert client.get("/api/v1/search").status_code == 422
+
+
+class TestAutocompleteAPI:
+    def test_autocomplete(self):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Idioms", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+        for text in ("break the ice", "breakfast", "bread"):
+            client.post(
+                f"/api/v1/dictionaries/{dictionary_id}/entries",
+                json={"original_text": text, "translated_text": "..."},
+            )
+
+        response = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}/autocomplete?prefix=brea&limit=2"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"suggestions": ["bread", "break the ice"]}
+
+
+class TestFuzzySearchAPI:
+    def test_fuzzy_search(self):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Spelling", "source_language": "en", "target_language": "ru"},
+        ).json()["id"]
+        entry_id = client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={"original_text": "receive", "translated_text": "получать"},
+        ).json()["id"]
+
+        response = client.get(f"/api/v1/dictionaries/{dictionary_id}/fuzzy?q=recieve")
+
+        assert response.status_code == 200
+        [match] = response.json()["matches"]
+        assert match["entry_id"] == entry_id
+        assert match["distance"] == 1
+
+
+class TestConditionalRequests:
+    def _create_dictionary(self) -> str:
+        response = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Polled", "source_language": "en", "target_language": "ru"},
+        )
+        return response.json()["id"]
+
+    def test_dictionary_etag_and_304(self):
+        dictionary_id = self._create_dictionary()
+
+        response = client.get(f"/api/v1/dictionaries/{dictionary_id}")
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        assert etag.startswith('"') and last_modified.endswith("GMT")
+        cached = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}", headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        since = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}",
+            headers={"If-Modified-Since": last_modified},
+        )
+        assert since.status_code == 304
+
+    def test_dictionary_etag_changes_after_update(self):
+        dictionary_id = self._create_dictionary()
+        etag = client.get(f"/api/v1/dictionaries/{dictionary_id}").headers["ETag"]
+
+        db = TestingSessionLocal()
+        service = DictionaryService(DictionaryRepository(db))
+        service.update_dictionary(UUID(dictionary_id), name="Renamed")
+        db.close()
+
+        response = client.get(
+            f"/api/v1/dictionaries/{dictionary_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["name"] == "Renamed"
+        assert response.headers["ETag"] != etag
+
+    def test_mismatched_or_invalid_validators_return_full_response(self):
+        dictionary_id = self._create_dictionary()
+        url = f"/api/v1/dictionaries/{dictionary_id}"
+
+        assert client.get(url, headers={"If-None-Match": '"0"'}).status_code == 200
+        assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+        assert (
+            client.get(url, headers={"If-Modified-Since": "garbage"}).status_code == 200
+        )
+        assert (
+            client.get(
+                url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+            ).status_code
+            == 200
+        )
+        missing = "/api/v1/dictionaries/123e4567-e89b-12d3-a456-426614174000"
+        assert client.get(missing, headers={"If-None-Match": "*"}).status_code == 404
+
+    def test_entry_list_etag_follows_content_version(self):
+        dictionary_id = self._create_dictionary()
+        url = f"/api/v1/dictionaries/{dictionary_id}/entries"
+
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        entry_id = client.post(
+            f"{url}", json={"original_text": "Hello", "translated_text": "Привет"}
+        ).json()["id"]
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+        etag = response.headers["ETag"]
+        client.delete(f"/api/v1/entries/{entry_id}")
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+class TestListSerialization:
+    def test_entry_list_matches_response_model_bytes(self):
+        dictionary_id = client.post(
+            "/api/v1/dictionaries/",
+            json={
+                "name": 'Кавычки "и" 😀',
+                "source_language": "en",
+                "target_language": "ru",
+            },
+        ).json()["id"]
+        db = TestingSessionLocal()
+        repository = EntryRepository(db)
+        repository.create(
+            Entry(
+                dictionary_id=UUID(dictionary_id),
+                original_text="ровно\tв полдень",
+                translated_text="at noon  ",
+                notes="\x00",
+                created_at=datetime(2024, 1, 1, 12, 0, 0),
+                updated_at=datetime(2024, 1, 1, 12, 0, 0),
+            )
+        )
+        client.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={"original_text": "Hello", "translated_text": "Привет"},
+        )
+
+        response = client.get(f"/api/v1/dictionaries/{dictionary_id}/entries?limit=2")
+
+        entries = EntryService(repository).get_dictionary_entries(
+            UUID(dictionary_id), limit=2
+        )
+        expected = EntryListResponse(
+            entries=[EntryResponse.from_domain(e) for e in entries],
+            total=2,
+            next_cursor=encode_cursor(entries[-1].created_at, entries[-1].id),
+        )
+        db.close()
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == expected.model_dump_json().encode()
+
+    def test_dictionary_list_matches_response_model_bytes(self):
+        for name in ["Первый", 'Второй "словарь"']:
+            client.post(
+                "/api/v1/dictionaries/",
+                json={"name": name, "source_language": "en", "target_language": "ru"},
+            )
+
+        response = client.get("/api/v1/dictionaries/?limit=5")
+
+        db = TestingSessionLocal()
+        dictionaries = DictionaryService(DictionaryRepository(db)).get_all_dictionaries(
+            limit=5
+        )
+        db.close()
+        expected = DictionaryListResponse(
+            dictionaries=[DictionaryResponse.from_domain(d) for d in dictionaries],
+            total=2,
+        )
+        assert response.content == expected.model_dump_json().encode()
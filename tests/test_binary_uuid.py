@@ -0,0 +1,146 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entry import Entry
+from app.infrastructure import maintenance
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.fulltext import FTS_TABLE, drop_fulltext_triggers
+from app.infrastructure.models import BinaryUUID
+from app.infrastructure.repository import DictionaryRepository
+
+# Триггер FTS5 из схемы со строковыми ключами
+LEGACY_INSERT_TRIGGER = (
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON entries BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, original_text, translated_text, "
+    "usage_example, dictionary_key) VALUES (new.rowid, new.original_text, "
+    "new.translated_text, new.usage_example, "
+    "'d' || replace(new.dictionary_id, '-', '')); END"
+)
+
+
+class TestBinaryUUID:
+    def test_binds_uuid_string_and_bytes(self):
+        column_type = BinaryUUID()
+        value = uuid4()
+
+        assert column_type.process_bind_param(value, None) == value.bytes
+        assert column_type.process_bind_param(str(value), None) == value.bytes
+        assert column_type.process_bind_param(value.bytes, None) == value.bytes
+        assert column_type.process_bind_param(None, None) is None
+
+    def test_keys_are_stored_as_16_byte_blobs(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+        Base.metadata.create_all(bind=engine)
+
+        with engine.connect() as connection:
+            columns = {
+                (table, row[1]): row[2]
+                for table in ("dictionaries", "entries")
+                for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")
+            }
+
+        assert columns[("dictionaries", "id")] == "BLOB"
+        assert columns[("entries", "id")] == "BLOB"
+        assert columns[("entries", "dictionary_id")] == "BLOB"
+
+
+class TestConvertUUIDKeys:
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        Base.metadata.create_all(bind=engine)
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    @pytest.fixture
+    def legacy(self, session_factory):
+        # Данные в формате старой схемы: ключи строками, старый триггер FTS5
+        dictionary_id, entry_ids = uuid4(), [uuid4(), uuid4()]
+        now = datetime(2024, 1, 1).isoformat(" ", "microseconds")
+        db = session_factory()
+        connection = db.connection()
+        drop_fulltext_triggers(connection)
+        connection.exec_driver_sql(LEGACY_INSERT_TRIGGER)
+        connection.exec_driver_sql(
+            "INSERT INTO dictionaries (id, name, source_language, target_language, "
+            "entry_count, entries_version, created_at, updated_at) "
+            "VALUES (?, 'Legacy', 'en', 'ru', 2, 0, ?, ?)",
+            (str(dictionary_id), now, now),
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO entries (id, dictionary_id, original_text, translated_text, "
+            "normalized_key, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'перевод', ?, ?, ?)",
+            [
+                (
+                    str(entry_id),
+                    str(dictionary_id),
+                    f"legacy{i}",
+                    f"legacy{i}",
+                    now,
+                    now,
+                )
+                for i, entry_id in enumerate(entry_ids)
+            ],
+        )
+        db.commit()
+        db.close()
+        return dictionary_id, entry_ids
+
+    def test_converts_keys_in_place(self, session_factory, legacy):
+        dictionary_id, entry_ids = legacy
+        db = session_factory()
+
+        assert maintenance.convert_uuid_keys(db) == 3
+
+        types = db.connection().exec_driver_sql(
+            "SELECT typeof(id), typeof(dictionary_id) FROM entries"
+        )
+        assert set(types) == {("blob", "blob")}
+        entries = EntryRepository(db)
+        assert DictionaryRepository(db).get_by_id(dictionary_id).name == "Legacy"
+        assert entries.get_by_id(entry_ids[0]).dictionary_id == dictionary_id
+        assert [e.id for e in entries.get_by_dictionary(dictionary_id)] == sorted(
+            entry_ids, key=lambda entry_id: entry_id.bytes
+        )
+        db.close()
+
+    def test_search_keeps_working_after_conversion(self, session_factory, legacy):
+        dictionary_id, _ = legacy
+        db = session_factory()
+        maintenance.convert_uuid_keys(db)
+        entries = EntryRepository(db)
+
+        entries.create(
+            Entry(
+                dictionary_id=dictionary_id,
+                original_text="legacyfresh",
+                translated_text="новое",
+            )
+        )
+
+        found = entries.search("legacy", dictionary_id=dictionary_id)
+        assert sorted(entry.original_text for entry, _, _ in found) == [
+            "legacy0",
+            "legacy1",
+            "legacyfresh",
+        ]
+        db.close()
+
+    def test_second_run_is_noop(self, session_factory, legacy, capsys):
+        assert maintenance.main(["convert-uuid-keys"], session_factory) == 0
+        assert maintenance.main(["convert-uuid-keys"], session_factory) == 0
+
+        assert "convert-uuid-keys: 0 rows updated" in capsys.readouterr().out
+
+    def test_conversion_parses_text_keys_only(self):
+        value = uuid4()
+
+        assert maintenance._uuid_bytes(str(value)) == value.bytes
+        assert maintenance._uuid_bytes(value.bytes) == value.bytes
+        assert UUID(bytes=maintenance._uuid_bytes(str(value))) == value
@@ -0,0 +1,375 @@
+import sys
+import types
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domain.dictionary import Dictionary
+from app.domain.entry import Entry
+from app.infrastructure import cache
+from app.infrastructure.cache import (
+    MISSING,
+    CacheStats,
+    InMemoryKeyValueStore,
+    LRUCache,
+    SharedCache,
+    read_through,
+    read_through_many,
+)
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache:
+    def test_hits_and_misses(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+
+        assert lru.get("a") is MISSING
+        lru.set("a", 1)
+
+        assert lru.get("a") == 1
+        assert lru.stats.snapshot() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(max_entries=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+
+        lru.set("c", 3)
+
+        assert lru.get("b") is MISSING
+        assert lru.get("a") == 1
+        assert len(lru) == 2
+        assert lru.stats.evictions == 1
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        lru = LRUCache(max_entries=10, ttl=5, clock=clock)
+        lru.set("a", 1)
+
+        clock.now = 4.9
+        assert lru.get("a") == 1
+        clock.now = 5
+        assert lru.get("a") is MISSING
+        assert lru.stats.expirations == 1
+
+    def test_invalidation_discards_stale_set(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+        version = lru.version()
+
+        lru.delete("a")
+        lru.set("a", "stale", version)
+
+        assert lru.get("a") is MISSING
+        lru.set("a", "fresh", lru.version())
+        lru.delete("a", "missing")
+        assert lru.stats.invalidations == 1
+
+    def test_get_many(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+        lru.set("a", 1)
+
+        assert lru.get_many(["a", "b"]) == [1, MISSING]
+        assert lru.stats.hits == 1 and lru.stats.misses == 1
+
+    def test_peek_many_does_not_touch_stats(self):
+        clock = FakeClock()
+        lru = LRUCache(max_entries=10, ttl=5, clock=clock)
+        lru.set("a", 1)
+        lru.set("b", 2)
+
+        assert lru.peek_many(["a", "c"]) == [1, MISSING]
+        clock.now = 5
+        assert lru.peek_many(["a"]) == [MISSING]
+        assert lru.stats == CacheStats()
+
+    def test_clear(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+        lru.set("a", 1)
+
+        lru.clear()
+
+        assert len(lru) == 0
+
+
+class TestSharedCache:
+    def test_roundtrip_through_store(self):
+        clock = FakeClock()
+        store = InMemoryKeyValueStore(clock=clock)
+        shared = SharedCache(store, ttl=2.5, prefix="t:")
+
+        assert shared.get("a") is MISSING
+        shared.set("a", {"x": 1})
+        assert shared.get("a") == {"x": 1}
+        assert shared.stats.hits == 1 and shared.stats.misses == 1
+
+        clock.now = 3
+        assert shared.get("a") is MISSING
+
+    def test_get_many_uses_single_mget(self):
+        store = InMemoryKeyValueStore()
+        shared = SharedCache(store)
+        shared.set("a", {"x": 1})
+        calls = []
+        mget = store.mget
+        store.mget = lambda names: calls.append(names) or mget(names)
+
+        assert shared.get_many([]) == []
+        assert shared.get_many(["a", "b"]) == [{"x": 1}, MISSING]
+        assert len(calls) == 1
+        assert shared.stats.hits == 1 and shared.stats.misses == 1
+
+    def test_peek_many_does_not_touch_stats(self):
+        shared = SharedCache(InMemoryKeyValueStore())
+        shared.set("a", {"x": 1})
+
+        assert shared.peek_many([]) == []
+        assert shared.peek_many(["a", "b"]) == [{"x": 1}, MISSING]
+        assert shared.stats == CacheStats()
+
+    def test_workers_share_invalidation(self):
+        store = InMemoryKeyValueStore()
+        first, second = SharedCache(store), SharedCache(store)
+        first.set("a", 1)
+        store.set("unrelated", b"1")
+
+        second.delete("a")
+        second.delete()
+
+        assert first.get("a") is MISSING
+        assert second.stats.invalidations == 1
+
+        first.set("b", 2)
+        first.clear()
+        first.clear()
+        assert first.get("b") is MISSING
+        assert store.get("unrelated") == b"1"
+
+
+class TestReadThrough:
+    def test_loads_once_and_returns_copies(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+        loads = []
+        dictionary = Dictionary(name="D", source_language="en", target_language="ru")
+
+        def load():
+            loads.append(1)
+            return dictionary
+
+        first = read_through(lru, "d", load)
+        first.name = "changed"
+        second = read_through(lru, "d", load)
+
+        assert loads == [1]
+        assert second.name == "D"
+        assert second is not first
+
+    def test_many_loads_only_misses(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+        lru.set("k1", "cached")
+        loads = []
+
+        def load(ids):
+            loads.append(ids)
+            return {i: f"loaded{i}" for i in ids if i != 3}
+
+        found = read_through_many(lru, [1, 2, 3], lambda i: f"k{i}", load)
+
+        assert found == {1: "cached", 2: "loaded2"}
+        assert loads == [[2, 3]]
+        assert lru.get("k2") == "loaded2"
+        assert lru.get("k3") is MISSING
+        assert read_through_many(lru, [1, 2], lambda i: f"k{i}", load) == {
+            1: "cached",
+            2: "loaded2",
+        }
+        assert len(loads) == 1
+
+    def test_absence_is_not_cached(self):
+        lru = LRUCache(max_entries=10, ttl=60)
+
+        assert read_through(lru, "d", lambda: None) is None
+        assert len(lru) == 0
+
+
+class TestCachedRepositories:
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        return engine
+
+    @pytest.fixture
+    def db_session(self, engine):
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def statements(self, engine):
+        executed = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: executed.append(statement),
+        )
+        return executed
+
+    @pytest.fixture
+    def lru(self):
+        return LRUCache(max_entries=100, ttl=60)
+
+    @pytest.fixture
+    def dictionaries(self, db_session, lru):
+        return DictionaryRepository(db_session, entity_cache=lru)
+
+    @pytest.fixture
+    def entries(self, db_session, lru):
+        return EntryRepository(db_session, entity_cache=lru)
+
+    @pytest.fixture
+    def dictionary(self, dictionaries):
+        return dictionaries.create(
+            Dictionary(name="Test", source_language="en", target_language="ru")
+        )
+
+    def test_dictionary_hit_skips_database(self, dictionaries, dictionary, statements):
+        dictionaries.get_by_id(dictionary.id)
+        queries = len(statements)
+
+        cached = dictionaries.get_by_id(dictionary.id)
+
+        assert cached.name == "Test"
+        assert len(statements) == queries
+        assert dictionaries.cache.stats.hits == 1
+
+    def test_entry_hit_counts_only_a_hit(self, entries, dictionary, lru):
+        entry = entries.create(
+            Entry(dictionary_id=dictionary.id, original_text="a", translated_text="b")
+        )
+        entries.get_by_id(entry.id)
+        before = lru.stats.snapshot()
+
+        entries.get_by_id(entry.id)
+        entries.get_by_ids([entry.id])
+
+        after = lru.stats.snapshot()
+        assert after["hits"] - before["hits"] == 2
+        assert after["misses"] == before["misses"]
+
+    def test_dictionary_update_and_delete_invalidate(
+        self, dictionaries, entries, dictionary
+    ):
+        entry = entries.create(
+            Entry(dictionary_id=dictionary.id, original_text="a", translated_text="b")
+        )
+        entries.get_by_id(entry.id)
+        loaded = dictionaries.get_by_id(dictionary.id)
+
+        loaded.update(name="Renamed")
+        dictionaries.update(loaded)
+        assert dictionaries.get_by_id(dictionary.id).name == "Renamed"
+
+        dictionaries.delete(dictionary.id)
+        assert dictionaries.get_by_id(dictionary.id) is None
+        assert entries.get_by_id(entry.id) is None
+        assert entries.get_by_ids([entry.id]) == {}
+
+    def test_dictionary_delete_does_not_enumerate_entries(
+        self, dictionaries, entries, dictionary, statements, lru
+    ):
+        created = entries.bulk_create(
+            [
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text=f"w{i}",
+                    translated_text="b",
+                )
+                for i in range(50)
+            ]
+        )
+        assert created == 50
+        invalidations = lru.stats.invalidations
+        queries = len(statements)
+
+        dictionaries.delete(dictionary.id)
+
+        assert not any(
+            "FROM entries" in statement for statement in statements[queries:]
+        )
+        assert lru.stats.invalidations - invalidations <= 1
+
+    def test_entry_delete_invalidates(self, entries, dictionary, statements):
+        entry = entries.create(
+            Entry(dictionary_id=dictionary.id, original_text="a", translated_text="b")
+        )
+        entries.get_by_id(entry.id)
+        queries = len(statements)
+        assert entries.get_by_id(entry.id).original_text == "a"
+        assert len(statements) == queries
+
+        entries.delete(entry.id)
+
+        assert entries.get_by_id(entry.id) is None
+
+    def test_bulk_create_entries_are_visible(self, entries, dictionary):
+        entry = Entry(
+            dictionary_id=dictionary.id, original_text="a", translated_text="b"
+        )
+        assert entries.get_by_id(entry.id) is None
+
+        entries.bulk_create([entry])
+
+        assert entries.get_by_id(entry.id).original_text == "a"
+
+    def test_shared_backend_invalidates_across_workers(self, db_session, dictionary):
+        store = InMemoryKeyValueStore()
+        worker_a = DictionaryRepository(db_session, entity_cache=SharedCache(store))
+        worker_b = DictionaryRepository(db_session, entity_cache=SharedCache(store))
+        worker_a.get_by_id(dictionary.id)
+
+        loaded = worker_b.get_by_id(dictionary.id)
+        loaded.update(name="Shared")
+        worker_b.update(loaded)
+
+        assert worker_b.cache.stats.hits == 1
+        assert worker_a.get_by_id(dictionary.id).name == "Shared"
+
+
+class TestCreateEntityCache:
+    def test_default_is_in_process_lru(self):
+        assert isinstance(cache.create_entity_cache(), LRUCache)
+
+    def test_redis_url_selects_shared_backend(self, monkeypatch):
+        store = InMemoryKeyValueStore()
+        fake_redis = types.ModuleType("redis")
+        fake_redis.Redis = types.SimpleNamespace(from_url=lambda url: store)
+        monkeypatch.setitem(sys.modules, "redis", fake_redis)
+        monkeypatch.setattr(cache, "CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+        shared = cache.create_entity_cache()
+
+        assert isinstance(shared, SharedCache)
+        assert shared.client is store
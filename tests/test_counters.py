@@ -0,0 +1,127 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domain.dictionary import Dictionary
+from app.domain.entry import Entry
+from app.infrastructure import maintenance
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import DictionaryORM
+from app.infrastructure.repository import DictionaryRepository
+
+
+class TestEntryCounters:
+    @pytest.fixture
+    def session_factory(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        return sessionmaker(bind=engine)
+
+    @pytest.fixture
+    def db_session(self, session_factory):
+        session = session_factory()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def dictionary(self, db_session):
+        repo = DictionaryRepository(db_session)
+        return repo.create(
+            Dictionary(name="Test Dict", source_language="en", target_language="ru")
+        )
+
+    def _create_entries(self, db_session, dictionary, count):
+        repo = EntryRepository(db_session)
+        return [
+            repo.create(
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text=f"Word{i}",
+                    translated_text=f"Слово{i}",
+                )
+            )
+            for i in range(count)
+        ]
+
+    def test_create_increments_counter(self, db_session, dictionary):
+        self._create_entries(db_session, dictionary, 3)
+
+        assert EntryRepository(db_session).count_by_dictionary(dictionary.id) == 3
+
+    def test_delete_decrements_counter(self, db_session, dictionary):
+        entries = self._create_entries(db_session, dictionary, 3)
+        repo = EntryRepository(db_session)
+
+        assert repo.delete(entries[0].id) is True
+        assert repo.delete(entries[0].id) is False
+        assert repo.count_by_dictionary(dictionary.id) == 2
+        assert repo.get_by_id(entries[0].id) is None
+
+    def test_count_for_unknown_dictionary_is_zero(self, db_session):
+        assert EntryRepository(db_session).count_by_dictionary(uuid4()) == 0
+
+    def test_rebuild_entry_counts(self, db_session, dictionary):
+        self._create_entries(db_session, dictionary, 4)
+        db_session.execute(update(DictionaryORM).values(entry_count=100))
+        db_session.commit()
+
+        updated = maintenance.rebuild_entry_counts(db_session)
+
+        assert updated == 1
+        assert EntryRepository(db_session).count_by_dictionary(dictionary.id) == 4
+
+    def test_maintenance_cli(self, session_factory, db_session, dictionary, capsys):
+        self._create_entries(db_session, dictionary, 2)
+        db_session.execute(update(DictionaryORM).values(entry_count=0))
+        db_session.commit()
+
+        exit_code = maintenance.main(
+            ["rebuild-counters"], session_factory=session_factory
+        )
+
+        assert exit_code == 0
+        assert "rebuild-counters" in capsys.readouterr().out
+        db_session.expire_all()
+        assert EntryRepository(db_session).count_by_dictionary(dictionary.id) == 2
+
+    def test_bulk_create_updates_counter(self, db_session, dictionary):
+        repo = EntryRepository(db_session)
+        entries = [
+            Entry(
+                dictionary_id=dictionary.id, original_text=f"W{i}", translated_text="T"
+            )
+            for i in range(10)
+        ]
+
+        assert repo.bulk_create(entries) == 10
+        assert repo.bulk_create([]) == 0
+        assert repo.count_by_dictionary(dictionary.id) == 10
+
+    def test_bulk_create_rolls_back_failed_batch(self, db_session, dictionary):
+        repo = EntryRepository(db_session)
+        entry = Entry(
+            dictionary_id=dictionary.id, original_text="W", translated_text="T"
+        )
+        repo.bulk_create([entry])
+
+        with pytest.raises(ValueError, match="Failed to insert entries"):
+            repo.bulk_create(
+                [
+                    Entry(
+                        dictionary_id=dictionary.id,
+                        original_text="New",
+                        translated_text="T",
+                    ),
+                    entry,
+                ]
+            )
+
+        assert repo.count_by_dictionary(dictionary.id) == 1
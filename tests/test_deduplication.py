@@ -0,0 +1,262 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domain import Dictionary, DuplicateEntryError, Entry, normalize_key
+from app.infrastructure import maintenance
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import DictionaryStatsORM
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.statistics import rebuild_dictionary_stats
+from app.infrastructure.text_indexes import DictionaryIndexCache
+
+
+class TestNormalizeKey:
+    @pytest.mark.parametrize(
+        "text",
+        ["Break the  ice", "break the ice", "BREAK\tTHE\nICE", " break the ice "],
+    )
+    def test_case_and_whitespace_are_ignored(self, text):
+        assert normalize_key(text) == "break the ice"
+
+    def test_unicode_forms_are_equal(self):
+        assert normalize_key("Café") == normalize_key("café")
+        assert normalize_key("Straße") == normalize_key("STRASSE")
+
+    def test_entry_exposes_key(self):
+        entry = Entry(
+            dictionary_id=Dictionary(
+                name="D", source_language="en", target_language="ru"
+            ).id,
+            original_text="Hello  World",
+            translated_text="Привет",
+        )
+
+        assert entry.normalized_key == "hello world"
+
+
+class TestUpsert:
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def dictionary(self, db_session):
+        return DictionaryRepository(db_session).create(
+            Dictionary(name="Dedup", source_language="en", target_language="ru")
+        )
+
+    @pytest.fixture
+    def repo(self, db_session):
+        return EntryRepository(
+            db_session,
+            prefix_indexes=DictionaryIndexCache(max_bytes=2**20),
+            trigram_indexes=DictionaryIndexCache(max_bytes=2**20),
+            entity_cache=LRUCache(),
+        )
+
+    @staticmethod
+    def entry(dictionary, original, translated="перевод", **kwargs):
+        return Entry(
+            dictionary_id=dictionary.id,
+            original_text=original,
+            translated_text=translated,
+            **kwargs,
+        )
+
+    @staticmethod
+    def stats_consistent(db_session) -> bool:
+        incremental = set(db_session.execute(select(DictionaryStatsORM.__table__)))
+        rebuild_dictionary_stats(db_session)
+        return set(db_session.execute(select(DictionaryStatsORM.__table__))) == (
+            incremental
+        )
+
+    def test_create_rejects_duplicate(self, repo, dictionary):
+        repo.create(self.entry(dictionary, "Cat"))
+
+        with pytest.raises(DuplicateEntryError, match="'cat' already exists"):
+            repo.create(self.entry(dictionary, "cat  "))
+
+        assert repo.count_by_dictionary(dictionary.id) == 1
+
+    def test_same_text_in_other_dictionary_is_allowed(
+        self, db_session, repo, dictionary
+    ):
+        other = DictionaryRepository(db_session).create(
+            Dictionary(name="Other", source_language="en", target_language="ru")
+        )
+
+        repo.create(self.entry(dictionary, "cat"))
+        repo.create(self.entry(other, "cat"))
+
+        assert repo.count_by_dictionary(other.id) == 1
+
+    def test_skip_keeps_existing_entry(self, db_session, repo, dictionary):
+        existing = repo.create(self.entry(dictionary, "cat", "кот"))
+        repo.autocomplete(dictionary.id, "")
+
+        inserted = repo.bulk_create(
+            [
+                self.entry(dictionary, "CAT", "кошка"),
+                self.entry(dictionary, "dog"),
+                self.entry(dictionary, "Dog "),
+            ],
+            on_duplicate="skip",
+        )
+
+        assert inserted == 1
+        assert repo.count_by_dictionary(dictionary.id) == 2
+        assert repo.get_by_id(existing.id).translated_text == "кот"
+        assert repo.autocomplete(dictionary.id, "d") == ["dog"]
+        assert self.stats_consistent(db_session)
+
+    def test_merge_updates_existing_entry(self, db_session, repo, dictionary):
+        existing = repo.create(
+            self.entry(dictionary, "cat", "кот", notes="мяу", usage_example="A cat")
+        )
+        # Прогретые кэш и индексы должны увидеть слияние
+        repo.get_by_id(existing.id)
+        repo.fuzzy_search(dictionary.id, "cat")
+        version = repo.get_entries_version(dictionary.id)[0]
+
+        inserted = repo.bulk_create(
+            [
+                self.entry(dictionary, "Cat", "кошка", usage_example=""),
+                self.entry(dictionary, "horse", "лошадь"),
+                self.entry(dictionary, "HORSE", "конь", usage_example="A horse"),
+            ],
+            on_duplicate="merge",
+        )
+
+        assert inserted == 1
+        merged = repo.get_by_id(existing.id)
+        assert merged.original_text == "cat"
+        assert merged.translated_text == "кошка"
+        assert merged.usage_example == "A cat"
+        assert merged.notes == "мяу"
+        assert merged.created_at == existing.created_at
+        horse = repo.get_by_original_text(dictionary.id, "horse")
+        assert [(e.translated_text, e.usage_example) for e in horse] == [
+            ("конь", "A horse")
+        ]
+        assert repo.count_by_dictionary(dictionary.id) == 2
+        assert repo.get_entries_version(dictionary.id)[0] > version
+        assert [m.translated_text for m in repo.fuzzy_search(dictionary.id, "cat")] == [
+            "кошка"
+        ]
+        assert self.stats_consistent(db_session)
+
+    def test_merge_only_duplicates_still_bumps_version(self, repo, dictionary):
+        repo.create(self.entry(dictionary, "cat", "кот"))
+        version = repo.get_entries_version(dictionary.id)[0]
+
+        assert repo.bulk_create([self.entry(dictionary, "cat", "кошка")], "merge") == 0
+        assert repo.get_entries_version(dictionary.id)[0] == version + 1
+
+    def test_error_mode_rejects_whole_batch(self, repo, dictionary):
+        repo.create(self.entry(dictionary, "cat"))
+
+        with pytest.raises(DuplicateEntryError):
+            repo.bulk_create(
+                [self.entry(dictionary, "dog"), self.entry(dictionary, "Cat")]
+            )
+
+        assert repo.count_by_dictionary(dictionary.id) == 1
+
+    def test_insert_new_skips_only_conflicting_rows(self, db_session, repo, dictionary):
+        repo.create(self.entry(dictionary, "cat"))
+        dog, cat, bird, dog_again = (
+            self.entry(dictionary, "dog"),
+            self.entry(dictionary, "Cat"),
+            self.entry(dictionary, "bird"),
+            self.entry(dictionary, "DOG"),
+        )
+
+        inserted = repo.insert_new([dog, cat, bird, dog_again])
+
+        assert inserted == [dog, bird]
+        assert repo.count_by_dictionary(dictionary.id) == 3
+        assert self.stats_consistent(db_session)
+
+
+class TestDedupCommand:
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        Base.metadata.create_all(bind=engine)
+        # Схема до normalized_key: ни колонки, ни уникального индекса
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "DROP INDEX ux_entries_dictionary_normalized_key"
+            )
+            connection.exec_driver_sql("ALTER TABLE entries DROP COLUMN normalized_key")
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    def test_removes_duplicates_and_builds_index(self, session_factory, capsys):
+        db = session_factory()
+        dictionary = DictionaryRepository(db).create(
+            Dictionary(name="Legacy", source_language="en", target_language="ru")
+        )
+        connection = db.connection()
+        rows = [
+            ("cat", "кот", None, None, datetime(2024, 1, 1)),
+            ("Cat ", "кошка", "A cat", None, datetime(2024, 1, 2)),
+            ("CAT", "котик", "Big cat", "заметка", datetime(2024, 1, 3)),
+            ("dog", "собака", None, None, datetime(2024, 1, 4)),
+        ]
+        connection.exec_driver_sql(
+            "INSERT INTO entries (id, dictionary_id, original_text, translated_text, "
+            "usage_example, notes, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    uuid4().bytes,
+                    dictionary.id.bytes,
+                    *row[:4],
+                    row[4].isoformat(" ", "microseconds"),
+                    row[4].isoformat(" ", "microseconds"),
+                )
+                for row in rows
+            ],
+        )
+        db.commit()
+        db.close()
+
+        assert maintenance.main(["dedup-entries"], session_factory) == 0
+        assert maintenance.main(["dedup-entries"], session_factory) == 0
+
+        output = capsys.readouterr().out
+        assert "dedup-entries: 2 rows updated" in output
+        assert "dedup-entries: 0 rows updated" in output
+        db = session_factory()
+        repo = EntryRepository(db, entity_cache=LRUCache())
+        cats = repo.get_by_original_text(dictionary.id, "cat")
+        assert [(e.translated_text, e.usage_example, e.notes) for e in cats] == [
+            ("кот", "Big cat", "заметка")
+        ]
+        assert repo.count_by_dictionary(dictionary.id) == 2
+        with pytest.raises(DuplicateEntryError):
+            repo.create(
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text="DOG",
+                    translated_text="пёс",
+                )
+            )
+        db.close()
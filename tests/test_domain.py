@@ -81,3 +81,23 @@ class TestDictionary:
         assert "Dictionary" in repr_str
         assert "Test Dictionary" in repr_str
         assert str(dictionary.id) in repr_str
+
+    def test_from_storage_skips_validation_and_parses_lazily(self):
+        dictionary = Dictionary.from_storage(
+            "1b4e28ba-2fa1-11d2-883f-0016d3cca427",
+            "Stored",
+            None,
+            "EN",
+            "ru",
+            "2024-01-02 03:04:05",
+            "2024-01-03 00:00:00.500000",
+        )
+
+        assert not hasattr(dictionary, "__dict__")
+        assert dictionary.source_language == "EN"
+        assert dictionary.id == UUID("1b4e28ba-2fa1-11d2-883f-0016d3cca427")
+        assert dictionary.created_at == datetime(2024, 1, 2, 3, 4, 5)
+        assert dictionary.updated_at == datetime(2024, 1, 3, 0, 0, 0, 500000)
+
+        dictionary.update(name="Renamed")
+        assert dictionary.updated_at > datetime(2024, 1, 3)
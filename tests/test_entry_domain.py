@@ -1,5 +1,7 @@
+import copy
+import pickle
 from datetime import datetime
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -76,3 +78,68 @@ class TestEntry:
         repr_str = repr(entry)
         assert "Entry" in repr_str
         assert "Hello" in repr_str
+
+
+class TestEntryFromStorage:
+    ROW = (
+        "1b4e28ba-2fa1-11d2-883f-0016d3cca427",
+        "6fa459ea-ee8a-3ca4-894e-db77e160355e",
+        "  Hello  ",
+        "Привет",
+        None,
+        "",
+        "2024-01-02 03:04:05.000006",
+        "2024-01-02 03:04:05.000006",
+    )
+
+    def test_has_no_instance_dict(self):
+        entry = Entry.from_storage(*self.ROW)
+
+        assert not hasattr(entry, "__dict__")
+        with pytest.raises(AttributeError):
+            entry.unknown = 1
+
+    def test_skips_validation(self):
+        entry = Entry.from_storage(*self.ROW)
+
+        assert entry.original_text == "  Hello  "
+        assert entry.notes == ""
+
+    def test_parses_stored_values_on_first_access(self):
+        entry = Entry.from_storage(*self.ROW)
+
+        assert entry._id == self.ROW[0]
+        assert entry.id == UUID(self.ROW[0])
+        assert entry.id is entry.id
+        assert entry.dictionary_id == UUID(self.ROW[1])
+        assert entry.created_at == datetime(2024, 1, 2, 3, 4, 5, 6)
+        assert entry.updated_at == entry.created_at
+
+    def test_accepts_parsed_values(self):
+        dictionary_id = uuid4()
+        moment = datetime(2024, 1, 1)
+
+        entry = Entry.from_storage(
+            uuid4(), dictionary_id, "a", "b", None, None, moment, moment
+        )
+
+        assert entry.dictionary_id is dictionary_id
+        assert entry.created_at is moment
+
+    def test_assignment_replaces_stored_value(self):
+        entry = Entry.from_storage(*self.ROW)
+        moment = datetime(2025, 1, 1)
+
+        entry.updated_at = moment
+
+        assert entry.updated_at is moment
+        assert entry.created_at == datetime(2024, 1, 2, 3, 4, 5, 6)
+
+    def test_copy_and_pickle_keep_fields(self):
+        entry = Entry.from_storage(*self.ROW)
+
+        for clone in (copy.copy(entry), pickle.loads(pickle.dumps(entry))):
+            assert clone.id == UUID(self.ROW[0])
+            assert clone.original_text == entry.original_text
+            assert clone.usage_example is None
+            assert clone.created_at == datetime(2024, 1, 2, 3, 4, 5, 6)
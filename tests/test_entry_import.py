@@ -0,0 +1,130 @@
+import pytest
+
+from app.services import entry_import
+from app.services.entry_import import CSVRowParser, ImportReport, NDJSONRowParser
+
+
+def feed_all(parser, data: bytes, chunk_size: int):
+    rows = []
+    for i in range(0, len(data), chunk_size):
+        rows.extend(parser.feed(data[i : i + chunk_size]))
+    rows.extend(parser.close())
+    return rows
+
+
+class TestNDJSONRowParser:
+    def test_parses_rows_across_chunk_boundaries(self):
+        data = (
+            '{"original_text": "Hello", "translated_text": "Привет"}\n'
+            "\n"
+            '{"original_text": "Bye", "translated_text": "Пока"}'
+        ).encode()
+
+        rows = feed_all(NDJSONRowParser(), data, chunk_size=7)
+
+        assert rows == [
+            (1, {"original_text": "Hello", "translated_text": "Привет"}),
+            (3, {"original_text": "Bye", "translated_text": "Пока"}),
+        ]
+
+    def test_reports_invalid_lines(self):
+        data = b'not json\n[1, 2]\n\xff\xfe\n{"original_text": "ok"}\n'
+
+        rows = feed_all(NDJSONRowParser(), data, chunk_size=1024)
+
+        assert rows[0][0] == 1 and rows[0][1].startswith("Invalid JSON")
+        assert rows[1] == (2, "Row must be a JSON object")
+        assert rows[2] == (3, "Invalid UTF-8")
+        assert rows[3] == (4, {"original_text": "ok"})
+
+
+class TestCSVRowParser:
+    def test_parses_header_and_quoted_multiline_fields(self):
+        data = (
+            "original_text,translated_text,usage_example\r\n"
+            'Hello,Привет,"Say ""hello""\nto everyone"\r\n'
+            "Bye,Пока,\r\n"
+        ).encode()
+
+        rows = feed_all(CSVRowParser(), data, chunk_size=5)
+
+        assert rows == [
+            (
+                2,
+                {
+                    "original_text": "Hello",
+                    "translated_text": "Привет",
+                    "usage_example": 'Say "hello"\nto everyone',
+                },
+            ),
+            (
+                4,
+                {
+                    "original_text": "Bye",
+                    "translated_text": "Пока",
+                    "usage_example": None,
+                },
+            ),
+        ]
+
+    def test_reports_column_mismatch_and_unterminated_quote(self):
+        data = b'original_text,translated_text\nonly-one\nA,"broken\n'
+
+        rows = feed_all(CSVRowParser(), data, chunk_size=1024)
+
+        assert rows == [
+            (2, "Expected 2 columns, got 1"),
+            (3, "Unterminated quoted field"),
+        ]
+
+
+class TestImportReport:
+    def test_add_error_counts_failures(self):
+        report = ImportReport()
+
+        report.add_error(3, "boom")
+
+        assert report.failed == 1
+        assert report.errors[0].line == 3
+
+    def test_stored_errors_are_capped(self, monkeypatch):
+        monkeypatch.setattr(entry_import, "IMPORT_MAX_ERRORS", 2)
+        report = ImportReport()
+
+        for line in range(5):
+            report.add_error(line, "boom")
+
+        assert report.failed == 5
+        assert [e.line for e in report.errors] == [0, 1]
+        assert report.errors_omitted == 3
+
+
+class TestLineLimit:
+    def test_row_parser_is_abstract(self):
+        with pytest.raises(TypeError):
+            entry_import._RowParser()
+
+    def test_oversized_line_without_newline_is_a_row_error(self):
+        data = b'{"original_text": "a"}\n' + b"x" * 100 + b'\n{"original_text": "b"}\n'
+
+        rows = feed_all(NDJSONRowParser(max_line_bytes=32), data, chunk_size=8)
+
+        assert rows == [
+            (1, {"original_text": "a"}),
+            (2, "Line exceeds 32 bytes"),
+            (3, {"original_text": "b"}),
+        ]
+
+    def test_oversized_line_in_one_chunk(self):
+        data = b"x" * 100 + b'\n{"original_text": "b"}\n'
+
+        rows = feed_all(NDJSONRowParser(max_line_bytes=32), data, chunk_size=1024)
+
+        assert rows == [(1, "Line exceeds 32 bytes"), (2, {"original_text": "b"})]
+
+    def test_oversized_quoted_csv_record(self):
+        data = b'original_text\n"' + b"x\n" * 20 + b"Bye\n"
+
+        rows = feed_all(CSVRowParser(max_line_bytes=16), data, chunk_size=4)
+
+        assert rows[0] == (2, "Record exceeds 16 bytes")
@@ -0,0 +1,87 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.executor import DatabaseExecutor
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture
+def executor():
+    executor = DatabaseExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+class TestDatabaseExecutor:
+    async def test_runs_calls_off_the_event_loop(self, executor):
+        loop_thread = threading.get_ident()
+
+        thread = await executor.run(threading.get_ident)
+
+        assert thread != loop_thread
+
+    async def test_blocking_call_does_not_stall_the_loop(self, executor):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await executor.run(time.sleep, 0.2)
+        task.cancel()
+
+        assert ticks >= 5
+
+    async def test_concurrency_is_bounded(self, executor):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        await asyncio.gather(*(executor.run(work) for _ in range(6)))
+
+        assert peak == 2
+
+    async def test_propagates_context_and_exceptions(self, executor):
+        request_id.set("abc")
+
+        assert await executor.run(request_id.get) == "abc"
+        with pytest.raises(ValueError, match="boom"):
+            await executor.run(int, "boom")
+
+    async def test_iterate_closes_abandoned_iterator(self, executor):
+        closed = []
+
+        def numbers():
+            try:
+                yield from range(10)
+            finally:
+                closed.append(True)
+
+        items = []
+        iterator = executor.iterate(numbers())
+        async for item in iterator:
+            items.append(item)
+            if item == 2:
+                break
+        await iterator.aclose()
+
+        assert items == [0, 1, 2]
+        assert closed == [True]
+        assert [x async for x in executor.iterate(iter("ab"))] == ["a", "b"]
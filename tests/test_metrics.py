@@ -0,0 +1,184 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure import get_db, metrics
+from app.infrastructure.database import Base
+from app.main import app
+
+
+def sample_value(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMetricTypes:
+    def test_counter_renders_total(self):
+        counter = metrics.Counter("jobs", "Processed jobs", ("queue",))
+
+        counter.inc("fast")
+        counter.inc("fast", amount=2)
+        counter.inc('a"b\\c')
+
+        assert counter.render() == (
+            "# HELP jobs Processed jobs\n"
+            "# TYPE jobs counter\n"
+            'jobs_total{queue="fast"} 3\n'
+            'jobs_total{queue="a\\"b\\\\c"} 1\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram(
+            "latency_seconds", "Latency", ("route",), buckets=(0.1, 1)
+        )
+
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, "/a")
+
+        lines = histogram.render().splitlines()[2:]
+        assert lines == [
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="1"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 3.65',
+            'latency_seconds_count{route="/a"} 4',
+        ]
+        assert histogram.count("/a") == 4
+
+    def test_collected_metric_reads_values_at_render(self):
+        values = {"size": 1}
+        gauge = metrics.CollectedMetric("pool", "Pool", "gauge", ("state",))
+        gauge.add_collector(lambda: [(("size",), values["size"])])
+
+        values["size"] = 5
+
+        assert 'pool{state="size"} 5' in gauge.render()
+
+    def test_metric_without_samples_cannot_be_created(self):
+        class Broken(metrics.Metric):
+            pass
+
+        with pytest.raises(TypeError, match="samples"):
+            Broken("broken", "Broken")
+
+    def test_duplicate_registration_is_rejected(self):
+        registry = metrics.Registry()
+        registry.register(metrics.Gauge("up", "Up"))
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register(metrics.Gauge("up", "Up"))
+
+
+class TestMetricsEndpoint:
+    @pytest.fixture
+    def client(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'metrics.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        previous = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        if previous is None:
+            del app.dependency_overrides[get_db]
+        else:
+            app.dependency_overrides[get_db] = previous
+        engine.dispose()
+
+    def test_requests_are_labelled_by_route_template(self, client):
+        labels = 'method="GET",route="/api/v1/dictionaries/{dictionary_id}"'
+        before = client.get("/metrics").text
+
+        created = client.post(
+            "/api/v1/dictionaries/",
+            json={"name": "M", "source_language": "en", "target_language": "ru"},
+        ).json()
+        client.get(f"/api/v1/dictionaries/{created['id']}")
+        client.get("/api/v1/dictionaries/00000000-0000-0000-0000-000000000000")
+        after = client.get("/metrics").text
+
+        ok = f'http_requests_total{{{labels},status="200"}}'
+        missing = f'http_requests_total{{{labels},status="404"}}'
+        count = f"http_request_duration_seconds_count{{{labels}}}"
+        assert sample_value(after, ok) - sample_value(before, ok) == 1
+        assert sample_value(after, missing) - sample_value(before, missing) == 1
+        assert sample_value(after, count) - sample_value(before, count) == 2
+        assert "/00000000-0000" not in after
+
+    def test_sql_statements_are_counted_per_request(self, client):
+        labels = 'method="GET",route="/api/v1/dictionaries/"'
+        before = client.get("/metrics").text
+
+        client.get("/api/v1/dictionaries/")
+        after = client.get("/metrics").text
+
+        queries = f"http_request_db_queries_sum{{{labels}}}"
+        # Страница словарей и общее число
+        assert sample_value(after, queries) - sample_value(before, queries) == 2
+        assert sample_value(
+            after, 'db_query_duration_seconds_count{operation="SELECT"}'
+        )
+
+    def test_exposes_pool_and_cache_state(self, client):
+        text = client.get("/metrics").text
+
+        assert 'db_pool_connections{engine="main",state="size"}' in text
+        assert 'cache_operations_total{cache="entity",result="hits"}' in text
+        assert 'text_index_cache_bytes{cache="trigram"}' in text
+
+    def test_unknown_paths_share_one_label(self, client):
+        client.get("/no/such/path")
+
+        text = client.get("/metrics").text
+
+        assert 'route="unmatched",status="404"' in text
+        assert "/no/such/path" not in text
+
+
+class TestHealth:
+    def test_reports_database_ping(self):
+        response = TestClient(app).get("/health")
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["database"]["status"] == "connected"
+        assert data["database"]["ping_ms"] >= 0
+        assert data["uptime_seconds"] >= 0
+
+    def test_unreachable_database_is_unhealthy(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+        session_factory = sessionmaker(bind=engine)
+
+        def broken_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        previous = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = broken_get_db
+        try:
+            response = TestClient(app).get("/health")
+        finally:
+            if previous is None:
+                del app.dependency_overrides[get_db]
+            else:
+                app.dependency_overrides[get_db] = previous
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unhealthy"
+        assert response.json()["database"]["status"] == "disconnected"
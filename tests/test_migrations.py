@@ -0,0 +1,238 @@
+import subprocess
+import sys
+import threading
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.infrastructure import maintenance, migrations
+from app.infrastructure.database import Base, create_db_engine
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+
+# Схема базы до появления счётчиков, BLOB-ключей, статистики и FTS5
+LEGACY_SCHEMA = (
+    "CREATE TABLE dictionaries (id VARCHAR(36) NOT NULL, name VARCHAR NOT NULL, "
+    "description VARCHAR, source_language VARCHAR NOT NULL, "
+    "target_language VARCHAR NOT NULL, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL, PRIMARY KEY (id))",
+    "CREATE INDEX ix_dictionaries_name ON dictionaries (name)",
+    "CREATE TABLE entries (id VARCHAR(36) NOT NULL, "
+    "dictionary_id VARCHAR(36) NOT NULL, original_text TEXT NOT NULL, "
+    "translated_text TEXT NOT NULL, usage_example TEXT, notes TEXT, "
+    "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, PRIMARY KEY (id), "
+    "FOREIGN KEY(dictionary_id) REFERENCES dictionaries (id) ON DELETE CASCADE)",
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+def schema_version(engine) -> int:
+    with engine.connect() as connection:
+        return migrations.get_schema_version(connection)
+
+
+@pytest.fixture
+def legacy(engine):
+    dictionary_id = uuid4()
+    now = datetime(2024, 1, 1).isoformat(" ", "microseconds")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "INSERT INTO dictionaries VALUES (?, 'Legacy', NULL, 'en', 'ru', ?, ?)",
+            (str(dictionary_id), now, now),
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO entries VALUES (?, ?, ?, 'перевод', ?, NULL, ?, ?)",
+            [
+                (str(uuid4()), str(dictionary_id), text, example, created, created)
+                for text, example, created in (
+                    ("Break a leg", None, "2024-01-01 10:00:00.000000"),
+                    (
+                        "break  a LEG",
+                        "Break a leg tonight!",
+                        "2024-01-01 11:00:00.000000",
+                    ),
+                    ("Piece of cake", None, "2024-01-01 12:00:00.000000"),
+                )
+            ],
+        )
+    return dictionary_id
+
+
+class TestMigrate:
+    def test_empty_database_is_created_at_latest_version(self, engine, session_factory):
+        db = session_factory()
+
+        assert migrations.migrate(db) == 1
+
+        db.close()
+        assert schema_version(engine) == migrations.SCHEMA_VERSION
+        tables = set(inspect(engine).get_table_names())
+        assert set(Base.metadata.tables) | {"entries_fts"} <= tables
+
+    def test_up_to_date_database_is_left_alone(self, engine, session_factory):
+        db = session_factory()
+        migrations.migrate(db)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert migrations.migrate(db) == 0
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+            db.close()
+
+        assert statements == ["PRAGMA user_version"]
+
+    def test_legacy_database_is_upgraded(self, engine, session_factory, legacy):
+        db = session_factory()
+
+        assert migrations.migrate(db) == len(migrations.MIGRATIONS)
+
+        assert schema_version(engine) == migrations.SCHEMA_VERSION
+        types = db.connection().exec_driver_sql(
+            "SELECT typeof(id), typeof(dictionary_id) FROM entries"
+        )
+        assert set(types) == {("blob", "blob")}
+
+        dictionary = DictionaryRepository(db).get_by_id(legacy)
+        assert dictionary.name == "Legacy"
+        entries = EntryRepository(db)
+        kept = sorted(e.original_text for e in entries.get_by_dictionary(legacy))
+        assert kept == ["Break a leg", "Piece of cake"]
+        assert entries.count_by_dictionary(legacy) == 2
+
+        stats = DictionaryRepository(db).get_stats(
+            legacy, date(2023, 12, 1), date(2024, 1, 31)
+        )
+        assert stats.with_example == 1
+
+        hits = entries.search("cake", legacy)
+        assert [entry.original_text for entry, _, _ in hits] == ["Piece of cake"]
+        db.close()
+
+    def test_interrupted_migration_resumes(self, engine, session_factory, legacy):
+        db = session_factory()
+        migrations.migrate(db)
+        # Откат номера версии эмулирует сбой после шага 2
+        db.connection().exec_driver_sql("PRAGMA user_version = 2")
+        db.commit()
+
+        assert migrations.migrate(db) == len(migrations.MIGRATIONS) - 2
+
+        assert EntryRepository(db).count_by_dictionary(legacy) == 2
+        db.close()
+
+    def test_concurrent_workers_migrate_once(
+        self, engine, session_factory, legacy, monkeypatch
+    ):
+        calls = []
+
+        def counted(migration):
+            def apply(db):
+                calls.append(migration.version)
+                return migration.apply(db)
+
+            return migration._replace(apply=apply)
+
+        monkeypatch.setattr(
+            migrations, "MIGRATIONS", tuple(map(counted, migrations.MIGRATIONS))
+        )
+        workers = 4
+        barrier = threading.Barrier(workers)
+        results = []
+
+        def start_worker():
+            barrier.wait()
+            results.append(migrations.prepare_database(session_factory, True))
+
+        threads = [threading.Thread(target=start_worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == [0] * (workers - 1) + [len(migrations.MIGRATIONS)]
+        assert calls == [m.version for m in migrations.MIGRATIONS]
+        assert schema_version(engine) == migrations.SCHEMA_VERSION
+
+    def test_newer_schema_is_refused(self, engine, session_factory):
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"PRAGMA user_version = {migrations.SCHEMA_VERSION + 1}"
+            )
+        db = session_factory()
+
+        with pytest.raises(migrations.SchemaVersionError, match="newer"):
+            migrations.migrate(db)
+        db.close()
+
+    def test_maintenance_command(self, engine, session_factory, capsys):
+        assert maintenance.main(["migrate"], session_factory) == 0
+
+        assert schema_version(engine) == migrations.SCHEMA_VERSION
+        assert "migrate: 1 rows updated" in capsys.readouterr().out
+
+
+class TestPrepareDatabase:
+    def test_check_only_accepts_current_schema(self, session_factory):
+        migrations.prepare_database(session_factory)
+
+        assert migrations.prepare_database(session_factory, migrate_schema=False) == 0
+
+    def test_check_only_refuses_outdated_schema(self, engine, session_factory):
+        with pytest.raises(migrations.SchemaVersionError, match="maintenance migrate"):
+            migrations.prepare_database(session_factory, migrate_schema=False)
+
+        assert not inspect(engine).get_table_names()
+
+
+class TestEngineSettings:
+    def test_engine_is_configurable(self, tmp_path):
+        engine = create_db_engine(
+            f"sqlite:///{tmp_path / 'settings.db'}", pool_size=2, max_overflow=1
+        )
+
+        assert engine.pool.size() == 2
+        assert engine.pool._max_overflow == 1
+        assert not (tmp_path / "settings.db").exists()
+        engine.dispose()
+
+
+class TestLifespan:
+    def test_startup_prepares_database(self, monkeypatch, session_factory, engine):
+        monkeypatch.setattr(main, "SessionLocal", session_factory)
+
+        with TestClient(main.app) as client:
+            assert schema_version(engine) == migrations.SCHEMA_VERSION
+            assert client.get("/").status_code == 200
+
+    def test_import_does_not_touch_database(self, tmp_path):
+        path = tmp_path / "import.db"
+        subprocess.run(
+            [sys.executable, "-c", "import app.main"],
+            env={"DATABASE_URL": f"sqlite:///{path}", "PYTHONPATH": "."},
+            check=True,
+        )
+
+        assert not path.exists()
@@ -0,0 +1,184 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.dictionary import Dictionary
+from app.domain.entry import Entry
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.services.dictionary_service import DictionaryService
+
+
+class QueryCounter:
+    """Запоминает SQL, отправленный драйверу внутри блока ``with``."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(" ".join(statement.split()))
+
+    @property
+    def verbs(self) -> list[str]:
+        return [statement.split(" ", 1)[0].upper() for statement in self.statements]
+
+    def assert_count(self, expected: int) -> None:
+        assert len(self.statements) == expected, "\n".join(self.statements)
+
+
+class TestWriteQueryCounts:
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        return engine
+
+    @pytest.fixture
+    def db_session(self, engine):
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def cache(self):
+        return LRUCache(max_entries=100, ttl=60)
+
+    @pytest.fixture
+    def dictionary(self, db_session, cache):
+        return DictionaryRepository(db_session, entity_cache=cache).create(
+            Dictionary(name="Test", source_language="en", target_language="ru")
+        )
+
+    def test_dictionary_create_is_one_insert(self, engine, db_session, cache):
+        repo = DictionaryRepository(db_session, entity_cache=cache)
+        dictionary = Dictionary(name="New", source_language="en", target_language="ru")
+
+        with QueryCounter(engine) as counter:
+            created = repo.create(dictionary)
+
+        counter.assert_count(1)
+        assert counter.verbs == ["INSERT"]
+        assert created.id == dictionary.id
+        stored = DictionaryRepository(db_session, entity_cache=LRUCache())
+        assert stored.get_by_id(dictionary.id).created_at == dictionary.created_at
+
+    def test_dictionary_update_is_one_statement(self, engine, db_session, dictionary):
+        dictionary.update(name="Renamed")
+
+        with QueryCounter(engine) as counter:
+            updated = DictionaryRepository(db_session).update(dictionary)
+
+        counter.assert_count(1)
+        assert "RETURNING" in counter.statements[0]
+        assert updated.name == "Renamed"
+        assert updated.updated_at == dictionary.updated_at
+
+    def test_update_missing_dictionary_raises(self, engine, db_session):
+        missing = Dictionary(name="Gone", source_language="en", target_language="ru")
+
+        with QueryCounter(engine) as counter:
+            with pytest.raises(ValueError, match="not found"):
+                DictionaryRepository(db_session).update(missing)
+
+        counter.assert_count(1)
+
+    @pytest.mark.parametrize("warm", [True, False])
+    def test_service_update(self, engine, db_session, cache, dictionary, warm):
+        # Кэш не читается: UPDATE только переданных полей, с кэшем и без
+        service = DictionaryService(
+            DictionaryRepository(db_session, entity_cache=cache)
+        )
+        if warm:
+            service.get_dictionary(dictionary.id)
+
+        with QueryCounter(engine) as counter:
+            updated = service.update_dictionary(dictionary.id, description="new")
+
+        assert counter.verbs == ["UPDATE"]
+        assert "name" not in counter.statements[0].split("SET")[1].split("WHERE")[0]
+        assert updated.description == "new"
+        assert updated.name == dictionary.name
+
+    def test_service_update_keeps_concurrent_changes(
+        self, db_session, cache, dictionary
+    ):
+        # Устаревшая копия в кэше не возвращает старое имя поверх нового
+        service = DictionaryService(
+            DictionaryRepository(db_session, entity_cache=cache)
+        )
+        service.get_dictionary(dictionary.id)
+        DictionaryRepository(db_session, entity_cache=LRUCache()).update_fields(
+            dictionary.id, {"name": "Renamed elsewhere"}
+        )
+
+        updated = service.update_dictionary(dictionary.id, description="new")
+
+        assert updated.name == "Renamed elsewhere"
+        assert updated.description == "new"
+
+    def test_service_update_validates_before_writing(
+        self, engine, db_session, dictionary
+    ):
+        service = DictionaryService(DictionaryRepository(db_session))
+
+        with QueryCounter(engine) as counter:
+            with pytest.raises(ValueError, match="Language code"):
+                service.update_dictionary(dictionary.id, source_language="x")
+            assert service.update_dictionary(uuid4(), name="Gone") is None
+
+        assert counter.verbs == ["UPDATE"]
+
+    def test_entry_create_does_not_read_back(self, engine, db_session, dictionary):
+        repo = EntryRepository(db_session, entity_cache=LRUCache())
+        entry = Entry(
+            dictionary_id=dictionary.id, original_text="cat", translated_text="кот"
+        )
+
+        with QueryCounter(engine) as counter:
+            created = repo.create(entry)
+
+        # Сама запись, счётчик словаря и два UPSERT статистики
+        counter.assert_count(4)
+        assert "SELECT" not in counter.verbs
+        assert created is entry
+        assert repo.get_by_id(entry.id).original_text == "cat"
+
+    def test_entry_bulk_create_is_constant(self, engine, db_session, dictionary):
+        repo = EntryRepository(db_session)
+        entries = [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text=f"word{i}",
+                translated_text="слово",
+            )
+            for i in range(50)
+        ]
+
+        with QueryCounter(engine) as counter:
+            repo.bulk_create(entries)
+
+        counter.assert_count(4)
+
+    def test_entry_delete(self, engine, db_session, dictionary):
+        repo = EntryRepository(db_session)
+        entry = repo.create(
+            Entry(dictionary_id=dictionary.id, original_text="a", translated_text="b")
+        )
+
+        with QueryCounter(engine) as counter:
+            assert repo.delete(entry.id)
+            assert not repo.delete(uuid4())
+
+        assert counter.verbs == ["DELETE", "UPDATE", "INSERT", "INSERT", "DELETE"]
@@ -0,0 +1,318 @@
+import re
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.dictionary import Dictionary
+from app.domain.entry import Entry
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.text_indexes import DictionaryIndexCache
+
+# "SCAN entries" без индекса означает полный проход по таблице
+TABLE_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+class QueryPlanRecorder:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[tuple[str, tuple]] = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            # План одинаков для всех наборов параметров
+            parameters = parameters[0]
+        if (
+            statement.lstrip()
+            .upper()
+            .startswith(("SELECT", "INSERT", "UPDATE", "DELETE"))
+        ):
+            self.statements.append((statement, parameters))
+
+    def plans(self) -> list[tuple[str, list[str]]]:
+        result = []
+        with self.engine.connect() as conn:
+            for statement, parameters in self.statements:
+                rows = conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).all()
+                result.append((statement, [row[-1] for row in rows]))
+        return result
+
+    def assert_indexed(self, bounded: frozenset[str] = frozenset()) -> None:
+        # bounded - подзапросы с LIMIT: их результат можно обойти и отсортировать
+        assert self.statements, "no statements were recorded"
+
+        for statement, details in self.plans():
+            scans = {m[1] for m in map(TABLE_SCAN.match, details) if m}
+            assert scans <= bounded, f"{details}: {statement}"
+            if not scans:
+                for detail in details:
+                    assert "TEMP B-TREE" not in detail, f"{detail}: {statement}"
+
+
+class TestRepositoryQueryPlans:
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        return engine
+
+    @pytest.fixture
+    def db_session(self, engine):
+        SessionLocal = sessionmaker(bind=engine)
+        session = SessionLocal()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def dictionary(self, db_session):
+        repo = DictionaryRepository(db_session)
+        return repo.create(
+            Dictionary(name="Test Dict", source_language="en", target_language="ru")
+        )
+
+    @pytest.fixture
+    def entries(self, db_session, dictionary):
+        repo = EntryRepository(db_session)
+        return [
+            repo.create(
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text=f"Word{i}",
+                    translated_text=f"Слово{i}",
+                )
+            )
+            for i in range(5)
+        ]
+
+    def test_dictionary_get_by_id(self, engine, db_session, dictionary):
+        repo = DictionaryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.get_by_id(dictionary.id)
+
+        recorder.assert_indexed()
+
+    def test_conditional_request_versions(self, engine, db_session, dictionary):
+        with QueryPlanRecorder(engine) as recorder:
+            DictionaryRepository(db_session).get_updated_at(dictionary.id)
+            EntryRepository(db_session).get_entries_version(dictionary.id)
+
+        assert len(recorder.plans()) == 2
+        recorder.assert_indexed()
+
+    def test_dictionary_get_all(self, engine, db_session, dictionary):
+        repo = DictionaryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.get_all(skip=0, limit=10)
+            repo.get_all(limit=10, after=(dictionary.created_at, dictionary.id))
+
+        recorder.assert_indexed()
+
+    def test_dictionary_update(self, engine, db_session, dictionary):
+        repo = DictionaryRepository(db_session)
+        dictionary.update(name="Updated")
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.update(dictionary)
+
+        recorder.assert_indexed()
+
+    def test_dictionary_delete(self, engine, db_session, dictionary):
+        repo = DictionaryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.delete(dictionary.id)
+
+        recorder.assert_indexed()
+
+    def test_entry_get_by_id(self, engine, db_session, entries):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.get_by_id(entries[0].id)
+            repo.get_by_id(uuid4())
+
+        recorder.assert_indexed()
+
+    def test_dictionary_stats(self, engine, db_session, dictionary, entries):
+        repo = DictionaryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            stats = repo.get_stats(dictionary.id, date(2000, 1, 1), date.today())
+
+        assert stats.entry_count == len(entries)
+        recorder.assert_indexed()
+
+    def test_entry_get_by_ids(self, engine, db_session, entries):
+        repo = EntryRepository(db_session, entity_cache=LRUCache())
+
+        with QueryPlanRecorder(engine) as recorder:
+            found = repo.get_by_ids([entries[0].id, uuid4()])
+
+        assert list(found) == [entries[0].id]
+        recorder.assert_indexed()
+
+    def test_entry_get_by_dictionary(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(db_session)
+        last = entries[1]
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.get_by_dictionary(dictionary.id, skip=2, limit=2)
+            repo.get_by_dictionary(
+                dictionary.id, limit=2, after=(last.created_at, last.id)
+            )
+
+        recorder.assert_indexed()
+
+    def test_entry_get_by_original_text(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            found = repo.get_by_original_text(dictionary.id, "Word3")
+
+        assert [e.id for e in found] == [entries[3].id]
+        recorder.assert_indexed()
+
+    def test_dictionary_update_fields(self, engine, db_session, dictionary):
+        repo = DictionaryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.update_fields(dictionary.id, {"name": "Updated"})
+            repo.update_fields(uuid4(), {"name": "Missing"})
+
+        recorder.assert_indexed()
+
+    def test_dictionary_exists(self, engine, db_session, dictionary):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            assert repo.dictionary_exists(dictionary.id)
+            assert not repo.dictionary_exists(uuid4())
+
+        recorder.assert_indexed()
+
+    def test_entry_search(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            found = repo.search("word3", dictionary_id=dictionary.id)
+            repo.search("word3")
+
+        assert [entry.id for entry, *_ in found] == [entries[3].id]
+        # Подзапрос hits - не больше limit строк из FTS5, записи по rowid
+        recorder.assert_indexed(bounded=frozenset({"hits"}))
+
+    def test_entry_iter_rows(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            rows = [row for batch in repo.iter_rows(dictionary.id) for row in batch]
+
+        assert len(rows) == len(entries)
+        recorder.assert_indexed()
+
+    def test_text_index_loads(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(
+            db_session,
+            prefix_indexes=DictionaryIndexCache(1 << 20),
+            trigram_indexes=DictionaryIndexCache(1 << 20),
+        )
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.autocomplete(dictionary.id, "word")
+            repo.fuzzy_search(dictionary.id, "wrd1")
+
+        (_, prefix_plan), (_, trigram_plan) = recorder.plans()
+        # Автодополнению хватает покрывающего индекса, без чтения строк
+        assert any("COVERING INDEX" in detail for detail in prefix_plan)
+        recorder.assert_indexed()
+
+    @pytest.mark.parametrize("on_duplicate", ["error", "skip", "merge"])
+    def test_entry_bulk_create(
+        self, engine, db_session, dictionary, entries, on_duplicate
+    ):
+        repo = EntryRepository(db_session)
+        batch = [
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text=f"Bulk{i}" if on_duplicate == "error" else f"word{i}",
+                translated_text="Пачка",
+            )
+            for i in range(3, 8)
+        ]
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.bulk_create(batch, on_duplicate=on_duplicate)
+
+        recorder.assert_indexed()
+
+    def test_entry_insert_new(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(db_session)
+        batch = [
+            Entry(dictionary_id=dictionary.id, original_text=text, translated_text="x")
+            for text in ("word1", "New")
+        ]
+
+        with QueryPlanRecorder(engine) as recorder:
+            inserted = repo.insert_new(batch)
+
+        assert [entry.original_text for entry in inserted] == ["New"]
+        recorder.assert_indexed()
+
+    def test_recorder_detects_table_scan(self, engine, db_session, entries):
+        with QueryPlanRecorder(engine) as recorder:
+            db_session.execute(
+                Base.metadata.tables["entries"]
+                .select()
+                .where(Base.metadata.tables["entries"].c.notes.is_(None))
+            ).all()
+
+        with pytest.raises(AssertionError):
+            recorder.assert_indexed()
+
+    def test_entry_create_updates_counter_by_key(self, engine, db_session, dictionary):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.create(
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text="Hello",
+                    translated_text="Привет",
+                )
+            )
+
+        recorder.assert_indexed()
+
+    def test_entry_delete_and_count(self, engine, db_session, dictionary, entries):
+        repo = EntryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.delete(entries[0].id)
+            repo.count_by_dictionary(dictionary.id)
+
+        recorder.assert_indexed()
+
+    def test_dictionary_count(self, engine, db_session, dictionary):
+        repo = DictionaryRepository(db_session)
+
+        with QueryPlanRecorder(engine) as recorder:
+            repo.count()
+
+        for _, details in recorder.plans():
+            assert any("COVERING INDEX" in detail for detail in details)
@@ -0,0 +1,143 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.dictionary import Dictionary
+from app.domain.entry import Entry
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.fulltext import build_match_query, rebuild_fulltext
+from app.infrastructure.repository import DictionaryRepository
+
+
+class TestBuildMatchQuery:
+    def test_quotes_tokens_and_prefix_matches_last(self):
+        match = build_match_query('break "the ice')
+
+        assert match == (
+            "{original_text translated_text usage_example} : " '("break" "the" "ice"*)'
+        )
+
+    def test_filters_by_dictionary_token(self):
+        dictionary_id = uuid4()
+
+        match = build_match_query("ice", dictionary_id)
+
+        assert match.startswith(f'dictionary_key : "d{dictionary_id.hex}" AND ')
+
+    def test_query_without_words_is_empty(self):
+        assert build_match_query("'; --") == ""
+
+
+class TestEntrySearch:
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine)
+        session = SessionLocal()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def dictionaries(self, db_session):
+        repo = DictionaryRepository(db_session)
+        return [
+            repo.create(
+                Dictionary(name=name, source_language="en", target_language="ru")
+            )
+            for name in ("Idioms", "Food")
+        ]
+
+    @pytest.fixture
+    def repo(self, db_session, dictionaries):
+        repo = EntryRepository(db_session)
+        idioms, food = dictionaries
+        repo.create(
+            Entry(
+                dictionary_id=idioms.id,
+                original_text="break the ice",
+                translated_text="разрядить обстановку",
+                usage_example="He told a joke to break the ice.",
+            )
+        )
+        repo.create(
+            Entry(
+                dictionary_id=idioms.id,
+                original_text="once in a blue moon",
+                translated_text="очень редко",
+            )
+        )
+        repo.bulk_create(
+            [
+                Entry(
+                    dictionary_id=food.id,
+                    original_text="ice cream",
+                    translated_text="мороженое",
+                )
+            ]
+        )
+        return repo
+
+    def test_search_across_dictionaries(self, repo):
+        hits = repo.search("ice")
+
+        assert {entry.original_text for entry, _, _ in hits} == {
+            "break the ice",
+            "ice cream",
+        }
+
+    def test_search_within_dictionary(self, repo, dictionaries):
+        hits = repo.search("ice", dictionary_id=dictionaries[1].id)
+
+        assert [entry.original_text for entry, _, _ in hits] == ["ice cream"]
+
+    def test_snippet_highlights_matching_column(self, repo):
+        [(entry, score, snippet)] = repo.search("joke")
+
+        assert entry.original_text == "break the ice"
+        assert snippet == "He told a <mark>joke</mark> to break the ice."
+        assert score >= 0
+
+    def test_ranks_original_text_above_examples(self, repo, dictionaries):
+        repo.create(
+            Entry(
+                dictionary_id=dictionaries[0].id,
+                original_text="moon",
+                translated_text="луна",
+            )
+        )
+        repo.create(
+            Entry(
+                dictionary_id=dictionaries[0].id,
+                original_text="lunar",
+                translated_text="лунный",
+                usage_example="Related to the moon",
+            )
+        )
+
+        hits = repo.search("moon")
+
+        assert hits[-1][0].original_text == "lunar"
+
+    def test_index_follows_deletes(self, repo):
+        [(entry, _, _)] = repo.search("blue moon")
+
+        repo.delete(entry.id)
+
+        assert repo.search("blue moon") == []
+
+    def test_empty_query_returns_nothing(self, repo):
+        assert repo.search("!!!") == []
+
+    def test_rebuild_restores_index(self, db_session, repo):
+        db_session.connection().exec_driver_sql("DELETE FROM entries_fts")
+        db_session.commit()
+        assert repo.search("ice") == []
+
+        rebuilt = rebuild_fulltext(db_session)
+
+        assert rebuilt == 3
+        assert len(repo.search("ice")) == 2
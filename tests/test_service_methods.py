@@ -150,3 +150,15 @@ class TestEntryServiceMethods:
         entries = service.get_dictionary_entries(dictionary.id)
 
         assert len(entries) == 3
+
+    def test_find_entries_by_original_text(self, service, dictionary):
+        created = service.create_entry(
+            dictionary_id=dictionary.id, original_text="Word", translated_text="Слово"
+        )
+        service.create_entry(
+            dictionary_id=dictionary.id, original_text="Other", translated_text="Др"
+        )
+
+        found = service.find_entries(dictionary.id, "  Word ")
+
+        assert [e.id for e in found] == [created.id]
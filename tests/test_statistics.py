@@ -0,0 +1,176 @@
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domain import Dictionary, DictionaryStats, Entry
+from app.infrastructure import maintenance
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import DictionaryDailyStatsORM, DictionaryStatsORM
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.statistics import rebuild_dictionary_stats
+
+
+class TestDictionaryStats:
+    def test_shares_and_averages(self):
+        stats = DictionaryStats(
+            date(2024, 1, 10),
+            entry_count=4,
+            with_example=1,
+            with_notes=2,
+            original_length=22,
+            translated_length=30,
+        )
+
+        assert stats.with_example_share == 0.25
+        assert stats.with_notes_share == 0.5
+        assert stats.average_original_length == 5.5
+        assert stats.average_translated_length == 7.5
+
+    def test_empty_dictionary_has_zero_averages(self):
+        stats = DictionaryStats(date(2024, 1, 10))
+
+        assert stats.with_example_share == 0.0
+        assert stats.average_original_length == 0.0
+
+    def test_series_are_dense_and_weeks_start_on_monday(self):
+        # 2024-01-10 - среда
+        stats = DictionaryStats(
+            date(2024, 1, 10),
+            added_by_day={
+                date(2024, 1, 1): 5,
+                date(2024, 1, 9): 2,
+                date(2024, 1, 10): 1,
+            },
+        )
+
+        assert stats.added_per_day(3) == [
+            (date(2024, 1, 8), 0),
+            (date(2024, 1, 9), 2),
+            (date(2024, 1, 10), 1),
+        ]
+        assert stats.added_per_week(2) == [
+            (date(2024, 1, 1), 5),
+            (date(2024, 1, 8), 3),
+        ]
+
+
+class TestIncrementalStats:
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def dictionaries(self, db_session):
+        repo = DictionaryRepository(db_session)
+        return [
+            repo.create(
+                Dictionary(name=name, source_language="en", target_language="ru")
+            )
+            for name in ("First", "Second")
+        ]
+
+    @staticmethod
+    def snapshot(db_session) -> tuple[set, set]:
+        totals = set(db_session.execute(select(DictionaryStatsORM.__table__)))
+        days = set(
+            db_session.execute(
+                select(DictionaryDailyStatsORM.__table__).where(
+                    DictionaryDailyStatsORM.added != 0
+                )
+            )
+        )
+        return totals, days
+
+    def test_writes_match_full_recompute(self, db_session, dictionaries):
+        first, second = dictionaries
+        repo = EntryRepository(db_session)
+        created = repo.create(
+            Entry(
+                dictionary_id=first.id,
+                original_text="Hello",
+                translated_text="Привет",
+                usage_example="Hello there",
+                created_at=datetime(2024, 1, 1, 23, 59),
+            )
+        )
+        repo.bulk_create(
+            [
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text=f"word{i}",
+                    translated_text="слово",
+                    usage_example="" if i % 2 else None,
+                    notes="note" if i % 3 == 0 else None,
+                    created_at=datetime(2024, 1, 1 + i % 3),
+                )
+                for i in range(10)
+                for dictionary in dictionaries
+            ]
+        )
+        repo.delete(created.id)
+        repo.delete(uuid4())
+
+        incremental = self.snapshot(db_session)
+        assert rebuild_dictionary_stats(db_session) == 2
+        assert self.snapshot(db_session) == incremental
+
+        stats = DictionaryRepository(db_session).get_stats(
+            second.id, since=date(2024, 1, 2), as_of=date(2024, 1, 3)
+        )
+        assert stats.entry_count == 10
+        assert stats.with_example == 0
+        assert stats.with_notes == 4
+        assert stats.original_length == 50
+        assert stats.translated_length == 50
+        assert stats.added_by_day == {date(2024, 1, 2): 3, date(2024, 1, 3): 3}
+
+    def test_dictionary_without_entries(self, db_session, dictionaries):
+        stats = DictionaryRepository(db_session).get_stats(
+            dictionaries[0].id, since=date(2024, 1, 1), as_of=date(2024, 1, 31)
+        )
+
+        assert stats == DictionaryStats(date(2024, 1, 31))
+
+    def test_unknown_dictionary(self, db_session):
+        repo = DictionaryRepository(db_session)
+
+        assert repo.get_stats(uuid4(), date(2024, 1, 1), date(2024, 1, 2)) is None
+
+    def test_dictionary_delete_removes_aggregates(self, db_session, dictionaries):
+        EntryRepository(db_session).create(
+            Entry(
+                dictionary_id=dictionaries[0].id, original_text="a", translated_text="b"
+            )
+        )
+
+        DictionaryRepository(db_session).delete(dictionaries[0].id)
+
+        assert self.snapshot(db_session) == (set(), set())
+
+    def test_maintenance_command(self, db_session, dictionaries, capsys):
+        EntryRepository(db_session).create(
+            Entry(
+                dictionary_id=dictionaries[0].id, original_text="a", translated_text="b"
+            )
+        )
+        db_session.query(DictionaryStatsORM).delete()
+        db_session.commit()
+
+        assert maintenance.main(["rebuild-stats"], lambda: db_session) == 0
+
+        assert "rebuild-stats: 1 rows updated" in capsys.readouterr().out
+        totals, days = self.snapshot(db_session)
+        assert len(totals) == 1 and len(days) == 1
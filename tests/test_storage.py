@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import maintenance, storage
+from app.infrastructure.database import Base, create_db_engine
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.models import EntryORM
+from app.infrastructure.repository import DictionaryRepository
+
+
+def pragma(connection, name):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'storage.db'}", profile=storage.PROFILES["tuned"]
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+class TestProfile:
+    def test_tuned_pragmas_are_applied_to_every_connection(self, engine):
+        with engine.connect() as first, engine.connect() as second:
+            for connection in (first, second):
+                assert pragma(connection, "journal_mode") == "wal"
+                assert pragma(connection, "synchronous") == 1
+                assert pragma(connection, "busy_timeout") == 5000
+                assert pragma(connection, "cache_size") == -64 * 1024
+                assert pragma(connection, "mmap_size") == 256 << 20
+                assert pragma(connection, "temp_store") == 2
+                assert pragma(connection, "foreign_keys") == 1
+
+    def test_default_profile_keeps_sqlite_defaults(self, tmp_path):
+        engine = create_db_engine(
+            f"sqlite:///{tmp_path / 'default.db'}", profile=storage.PROFILES["default"]
+        )
+
+        with engine.connect() as connection:
+            assert pragma(connection, "journal_mode") == "delete"
+            assert pragma(connection, "foreign_keys") == 0
+        engine.dispose()
+
+    def test_environment_overrides_profile(self, monkeypatch):
+        monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "250")
+        monkeypatch.setenv("SQLITE_FOREIGN_KEYS", "off")
+        monkeypatch.setenv("SQLITE_JOURNAL_MODE", "truncate")
+
+        profile = storage.load_profile("tuned")
+
+        assert profile.busy_timeout_ms == 250
+        assert profile.foreign_keys is False
+        assert profile.synchronous == "NORMAL"
+        assert "PRAGMA journal_mode = truncate" in profile.pragmas()
+
+    def test_invalid_values_are_rejected(self):
+        with pytest.raises(ValueError, match="synchronous"):
+            storage.SQLiteProfile(synchronous="sometimes; DROP TABLE entries")
+
+    def test_deleting_dictionary_cascades_to_entries(self, session_factory):
+        db = session_factory()
+        dictionary = DictionaryRepository(db).create(
+            Dictionary(name="Cascade", source_language="en", target_language="ru")
+        )
+        EntryRepository(db).create(
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text="word",
+                translated_text="слово",
+            )
+        )
+
+        DictionaryRepository(db).delete(dictionary.id)
+
+        assert db.query(EntryORM).count() == 0
+        db.close()
+
+
+class TestMaintenance:
+    def test_checkpoint_moves_wal_into_database(self, session_factory):
+        db = session_factory()
+        DictionaryRepository(db).create(
+            Dictionary(name="WAL", source_language="en", target_language="ru")
+        )
+
+        busy, wal_pages, moved = storage.checkpoint(db)
+
+        assert busy == 0
+        assert wal_pages > 0
+        assert moved == wal_pages
+        db.close()
+
+    def test_checkpoint_command_truncates_wal(self, session_factory, tmp_path, capsys):
+        db = session_factory()
+        DictionaryRepository(db).create(
+            Dictionary(name="WAL", source_language="en", target_language="ru")
+        )
+
+        assert maintenance.main(["checkpoint"], session_factory) == 0
+
+        assert (tmp_path / "storage.db-wal").stat().st_size == 0
+        assert "checkpoint:" in capsys.readouterr().out
+        db.close()
+
+    def test_checkpoint_mode_is_validated(self, session_factory):
+        db = session_factory()
+
+        with pytest.raises(ValueError, match="checkpoint mode"):
+            storage.checkpoint(db, "NOW")
+        db.close()
+
+    async def test_runs_periodically_and_on_close(self, session_factory):
+        task = storage.StorageMaintenance(
+            session_factory, checkpoint_interval=0.01, optimize_interval=0.02
+        )
+
+        task.start()
+        await asyncio.sleep(0.2)
+        assert task.checkpoints >= 2
+        assert task.optimizations >= 1
+        optimizations = task.optimizations
+
+        await task.close()
+
+        assert task.optimizations == optimizations + 1
+        assert task.last_checkpoint[0] == 0
+
+    async def test_failures_do_not_stop_the_schedule(self, caplog):
+        def broken_session():
+            raise RuntimeError("database is gone")
+
+        task = storage.StorageMaintenance(
+            broken_session, checkpoint_interval=0.01, optimize_interval=0
+        )
+
+        task.start()
+        await asyncio.sleep(0.05)
+
+        assert not task._task.done()
+        assert "SQLite maintenance failed" in caplog.text
+        task._task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task._task
+
+    async def test_disabled_schedule_starts_nothing(self, session_factory):
+        task = storage.StorageMaintenance(
+            session_factory, checkpoint_interval=0, optimize_interval=0
+        )
+
+        task.start()
+        await task.close()
+
+        assert task.checkpoints == 0
@@ -0,0 +1,302 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.dictionary import Dictionary
+from app.domain.entry import Entry
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.text_indexes import (
+    DictionaryIndexCache,
+    PrefixIndex,
+    TrigramIndex,
+    bounded_edit_distance,
+)
+
+
+class TestPrefixIndex:
+    def test_complete_is_case_insensitive_and_sorted(self):
+        index = PrefixIndex(["Break the ice", "breakfast", "bread", "Apple"])
+
+        assert index.complete("BREA") == ["bread", "Break the ice", "breakfast"]
+        assert index.complete("bre", limit=1) == ["bread"]
+        assert index.complete("z") == []
+
+    def test_add_and_remove(self):
+        index = PrefixIndex(["cat"])
+        size = index.nbytes
+
+        index.add("Car")
+        index.add("car")
+        assert set(index.complete("ca")) == {"Car", "car", "cat"}
+        assert index.nbytes > size
+
+        index.remove("Car")
+        index.remove("missing")
+        assert index.complete("ca") == ["car", "cat"]
+
+    def test_duplicates_are_suggested_once(self):
+        index = PrefixIndex(["cat", "cat"])
+
+        assert index.complete("c") == ["cat"]
+        assert len(index) == 2
+
+
+class TestBoundedEditDistance:
+    @pytest.mark.parametrize(
+        "a, b, expected",
+        [
+            ("kitten", "sitting", 3),
+            ("recieve", "receive", 1),
+            ("same", "same", 0),
+            ("", "ab", 2),
+            ("prefix-ab-suffix", "prefix-ba-suffix", 1),
+            ("abc", "abcde", 2),
+        ],
+    )
+    def test_distance_within_bound(self, a, b, expected):
+        assert bounded_edit_distance(a, b, 3) == expected
+
+    def test_returns_none_over_bound(self):
+        assert bounded_edit_distance("abc", "xyz", 2) is None
+        assert bounded_edit_distance("a", "abcd", 2) is None
+        assert bounded_edit_distance("abcdef", "badcfe", 2) is None
+
+
+class TestTrigramIndex:
+    @pytest.fixture
+    def index(self):
+        return TrigramIndex(
+            [
+                (uuid4(), "necessary", "необходимый"),
+                (uuid4(), "receive", "получать"),
+                (uuid4(), "break the ice", "разрядить обстановку"),
+            ]
+        )
+
+    def test_finds_misspelled_original(self, index):
+        [match] = index.search("neccessary")
+
+        assert match.original_text == "necessary"
+        assert match.field == "original_text"
+        assert match.distance == 1
+        assert 0 < match.score < 1
+
+    def test_finds_misspelled_translation(self, index):
+        [match] = index.search("полчать")
+
+        assert match.original_text == "receive"
+        assert match.field == "translated_text"
+
+    def test_exact_match_ranks_first(self, index):
+        index.add((uuid4(), "recieve", "опечатка"))
+
+        matches = index.search("receive")
+
+        assert [m.distance for m in matches] == [0, 1]
+        assert matches[0].score == 1
+
+    def test_respects_distance_and_limit(self, index):
+        assert index.search("xyzzy") == []
+        assert index.search("   ") == []
+        assert len(index.search("receive", limit=1, max_distance=3)) == 1
+
+    def test_finds_transposition_near_word_start(self):
+        # Перестановка портит четыре триграммы, а не три
+        index = TrigramIndex([(uuid4(), "abcdefgh", "x")])
+
+        [match] = index.search("bacdefgh")
+
+        assert match.distance == 1
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [("cst", "cat"), ("act", "cat"), ("cots", "cats"), ("huose", "house")],
+    )
+    def test_short_queries_with_one_typo(self, query, expected):
+        # У 3-4 символов слишком мало триграмм: кандидаты берутся по длине
+        index = TrigramIndex(
+            [(uuid4(), "cat", "x"), (uuid4(), "cats", "y"), (uuid4(), "house", "z")]
+        )
+
+        matches = index.search(query, max_distance=1)
+
+        assert [m.original_text for m in matches] == [expected]
+        assert matches[0].distance == 1
+
+    def test_short_queries_honor_requested_distance(self):
+        index = TrigramIndex([(uuid4(), "dog", "x"), (uuid4(), "doge", "y")])
+
+        assert index.search("dgo", max_distance=0) == []
+        assert [m.original_text for m in index.search("dgo", max_distance=1)] == ["dog"]
+        assert [m.distance for m in index.search("dgo", max_distance=2)] == [1, 2]
+
+    def test_length_scan_skips_removed_entries(self):
+        entry_id = uuid4()
+        index = TrigramIndex([(entry_id, "cat", "x"), (uuid4(), "bird", "y")])
+
+        index.remove(entry_id)
+
+        assert index.search("cst", max_distance=1) == []
+
+    def test_remove_and_compaction(self, index):
+        entry_id = index.search("receive")[0].entry_id
+
+        index.remove(entry_id)
+        index.remove(entry_id)
+
+        assert index.search("receive") == []
+        assert len(index) == 2
+
+        for match in [index.search("necessary")[0], index.search("break the ice")[0]]:
+            index.remove(match.entry_id)
+        assert len(index) == 0
+        index.add((uuid4(), "receive", "получать"))
+        assert index.search("recieve")[0].original_text == "receive"
+
+
+class TestDictionaryIndexCache:
+    def test_builds_lazily_once(self):
+        cache = DictionaryIndexCache(max_bytes=10_000)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return PrefixIndex(["one"])
+
+        cache.get("a", build)
+        cache.get("a", build)
+
+        assert len(builds) == 1
+        assert "a" in cache
+
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = DictionaryIndexCache(max_bytes=PrefixIndex(["x" * 100]).nbytes * 2)
+        for key in ("a", "b"):
+            cache.get(key, lambda: PrefixIndex(["x" * 100]))
+        cache.get("a", lambda: PrefixIndex())
+
+        cache.get("c", lambda: PrefixIndex(["x" * 100]))
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_apply_updates_loaded_index_only(self):
+        cache = DictionaryIndexCache(max_bytes=10_000)
+        cache.apply("missing", lambda index: index.add("never"))
+        cache.get("a", lambda: PrefixIndex())
+
+        cache.apply("a", lambda index: index.add("word"))
+
+        assert cache.read("a", PrefixIndex, lambda i: i.complete("w")) == ["word"]
+        assert "missing" not in cache
+
+    def test_write_during_build_is_not_cached(self):
+        cache = DictionaryIndexCache(max_bytes=10_000)
+
+        def build():
+            cache.apply("a", lambda index: index.add("late"))
+            return PrefixIndex(["stale"])
+
+        cache.get("a", build)
+
+        assert "a" not in cache
+
+    def test_invalidate_and_clear(self):
+        cache = DictionaryIndexCache(max_bytes=10_000)
+        cache.get("a", lambda: PrefixIndex(["one"]))
+        cache.get("b", lambda: PrefixIndex(["two"]))
+
+        cache.invalidate("a")
+        assert "a" not in cache
+
+        cache.clear()
+        assert "b" not in cache
+        assert cache.nbytes == 0
+
+
+class TestEntryAutocomplete:
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine)
+        session = SessionLocal()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def dictionary(self, db_session):
+        return DictionaryRepository(db_session).create(
+            Dictionary(name="Test Dict", source_language="en", target_language="ru")
+        )
+
+    @pytest.fixture
+    def repo(self, db_session):
+        return EntryRepository(
+            db_session,
+            prefix_indexes=DictionaryIndexCache(max_bytes=1_000_000),
+            trigram_indexes=DictionaryIndexCache(max_bytes=1_000_000),
+        )
+
+    def test_index_follows_repository_writes(self, repo, dictionary):
+        repo.create(
+            Entry(
+                dictionary_id=dictionary.id, original_text="ice", translated_text="лёд"
+            )
+        )
+        assert repo.autocomplete(dictionary.id, "ic") == ["ice"]
+
+        created = repo.create(
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text="icebreaker",
+                translated_text="ледокол",
+            )
+        )
+        repo.bulk_create(
+            [
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text="Iceberg",
+                    translated_text="айсберг",
+                )
+            ]
+        )
+        assert repo.autocomplete(dictionary.id, "ICE") == [
+            "ice",
+            "Iceberg",
+            "icebreaker",
+        ]
+
+        repo.delete(created.id)
+        assert repo.autocomplete(dictionary.id, "ice", limit=5) == ["ice", "Iceberg"]
+
+    def test_fuzzy_search_follows_repository_writes(self, repo, dictionary):
+        created = repo.create(
+            Entry(
+                dictionary_id=dictionary.id,
+                original_text="necessary",
+                translated_text="необходимый",
+            )
+        )
+        assert repo.fuzzy_search(dictionary.id, "neccesary")[0].entry_id == created.id
+
+        repo.bulk_create(
+            [
+                Entry(
+                    dictionary_id=dictionary.id,
+                    original_text="accommodate",
+                    translated_text="разместить",
+                )
+            ]
+        )
+        [match] = repo.fuzzy_search(dictionary.id, "acommodate")
+        assert match.original_text == "accommodate"
+
+        repo.delete(created.id)
+        assert repo.fuzzy_search(dictionary.id, "neccesary") == []
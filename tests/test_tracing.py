@@ -0,0 +1,242 @@
+import logging
+import threading
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure import get_db, tracing
+from app.infrastructure.database import Base
+from app.main import app
+
+
+def span_names(root: tracing.Span) -> list[tuple[int, str]]:
+    return [(depth, span.name) for depth, span in root.walk()]
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'tracing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        del app.dependency_overrides[get_db]
+    else:
+        app.dependency_overrides[get_db] = previous
+    engine.dispose()
+
+
+@pytest.fixture
+def use_tracer(monkeypatch):
+    def install(**kwargs) -> tracing.Tracer:
+        tracer = tracing.Tracer(**kwargs)
+        monkeypatch.setattr(tracing, "tracer", tracer)
+        return tracer
+
+    return install
+
+
+def create_dictionary(client) -> str:
+    return client.post(
+        "/api/v1/dictionaries/",
+        json={"name": "Trace", "source_language": "en", "target_language": "ru"},
+    ).json()["id"]
+
+
+class TestRequestTracing:
+    def test_spans_cover_route_service_repository_and_sql(self, client, use_tracer):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=1, exporter=exporter)
+        dictionary_id = create_dictionary(client)
+
+        response = client.get(f"/api/v1/dictionaries/{dictionary_id}")
+
+        root = exporter.traces[-1]
+        assert response.headers["x-trace-id"] == root.trace.trace_id
+        assert root.name == "GET /api/v1/dictionaries/{dictionary_id}"
+        assert root.attributes["status"] == 200
+        names = span_names(root)
+        assert names[:3] == [
+            (0, "GET /api/v1/dictionaries/{dictionary_id}"),
+            (1, "route get_dictionary"),
+            (2, "get_dictionary"),
+        ]
+        assert (3, "DictionaryService.get_dictionary") in names
+        assert (4, "DictionaryRepository.get_by_id") in names
+        # Первое чтение идёт мимо кэша: загрузка, SQL и перевод в домен
+        assert (5, "DictionaryRepository._load") in names
+        assert (6, "SQL SELECT") in names
+        assert (6, "DictionaryRepository._to_domain") in names
+
+    def test_spans_are_nested_in_time(self, client, use_tracer):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=1, exporter=exporter)
+
+        client.get("/api/v1/dictionaries/")
+
+        root = exporter.traces[-1]
+        for _, span in root.walk():
+            assert span.end is not None
+            for child in span.children:
+                assert span.start <= child.start <= child.end <= span.end
+
+    def test_unsampled_requests_are_not_recorded(self, client, use_tracer):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=0, exporter=exporter)
+
+        response = client.get("/api/v1/dictionaries/")
+
+        assert "x-trace-id" not in response.headers
+        assert not exporter.traces
+
+    def test_sample_rate_is_applied_per_request(self, client, use_tracer, monkeypatch):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=0.5, exporter=exporter)
+        draws = iter([0.7, 0.2])
+        monkeypatch.setattr(tracing.random, "random", lambda: next(draws))
+
+        client.get("/api/v1/dictionaries/")
+        client.get("/api/v1/dictionaries/")
+
+        assert len(exporter.traces) == 1
+
+    def test_errors_are_recorded(self, client, use_tracer):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=1, exporter=exporter)
+
+        client.get("/api/v1/dictionaries/00000000-0000-0000-0000-000000000000")
+
+        route = exporter.traces[-1].children[0]
+        assert route.attributes["error"].startswith("HTTPException(status_code=404")
+
+    def test_span_limit_drops_extra_spans(self, client, use_tracer):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=1, exporter=exporter, max_spans=3)
+
+        client.get("/api/v1/dictionaries/")
+
+        root = exporter.traces[-1]
+        assert len(list(root.walk())) == 3
+        assert root.trace.dropped > 0
+
+
+class TestSlowRequestLog:
+    def test_slow_request_dumps_span_tree(self, client, use_tracer, caplog):
+        exporter = tracing.InMemoryExporter()
+        use_tracer(sample_rate=0, exporter=exporter, slow_request_ms=0.001)
+
+        with caplog.at_level(logging.WARNING, logger="app.infrastructure.tracing"):
+            client.get("/api/v1/dictionaries/")
+
+        # Записан ради журнала, но не сэмплирован - в экспорт не попадает
+        assert not exporter.traces
+        (record,) = caplog.records
+        assert "Slow request GET /api/v1/dictionaries/" in record.getMessage()
+        assert "DictionaryRepository.get_rows" in record.getMessage()
+        assert "SQL SELECT" in record.getMessage()
+
+    def test_fast_requests_are_not_logged(self, client, use_tracer, caplog):
+        use_tracer(slow_request_ms=60_000)
+
+        with caplog.at_level(logging.WARNING, logger="app.infrastructure.tracing"):
+            client.get("/api/v1/dictionaries/")
+
+        assert not caplog.records
+
+
+class TestJsonlExporter:
+    def test_writes_one_line_per_trace(self, client, use_tracer, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = tracing.JsonlExporter(path)
+        use_tracer(sample_rate=1, exporter=exporter)
+
+        client.get("/api/v1/dictionaries/")
+        client.get("/health")
+        exporter.flush()
+
+        lines = [orjson.loads(line) for line in path.read_bytes().splitlines()]
+        assert [line["name"] for line in lines] == [
+            "GET /api/v1/dictionaries/",
+            "GET /health",
+        ]
+        spans = lines[0]["spans"]
+        assert spans[0]["parent_id"] is None
+        ids = {span["span_id"] for span in spans}
+        assert all(span["parent_id"] in ids for span in spans[1:])
+        assert any(span["name"] == "SQL SELECT" for span in spans)
+        exporter.close()
+
+    def test_file_is_written_off_the_calling_thread(self, tmp_path, monkeypatch):
+        exporter = tracing.JsonlExporter(tmp_path / "traces.jsonl", max_queue=1)
+        writing = threading.Event()
+        release = threading.Event()
+        writers = []
+
+        def slow_to_dict(root):
+            writers.append(threading.current_thread())
+            writing.set()
+            release.wait()
+            return {"name": root.name}
+
+        monkeypatch.setattr(tracing, "trace_to_dict", slow_to_dict)
+        root = tracing.Span("root", tracing.Trace(sampled=True))
+        root.end = root.start
+
+        exporter.export(root)
+        writing.wait()
+        # Поток занят записью: одна трасса ждёт в очереди, следующая отброшена
+        exporter.export(root)
+        exporter.export(root)
+        release.set()
+        exporter.close()
+
+        assert writers and threading.current_thread() not in writers
+        assert exporter.dropped == 1
+        assert len((tmp_path / "traces.jsonl").read_bytes().splitlines()) == 2
+
+
+class TestTraced:
+    def test_outside_trace_calls_function_directly(self):
+        @tracing.traced
+        def double(x):
+            return x * 2
+
+        assert double(2) == 4
+        assert double.__wrapped__(3) == 6
+
+    async def test_async_functions_get_spans(self):
+        @tracing.traced
+        async def work():
+            return tracing.current_span.get().name
+
+        root = tracing.Span("root", tracing.Trace(sampled=True))
+        token = tracing.current_span.set(root)
+        try:
+            name = await work()
+        finally:
+            tracing.current_span.reset(token)
+
+        assert name.endswith("work")
+        assert [span.name for _, span in root.walk()][1:] == [name]
+
+    def test_generator_functions_are_left_as_is(self):
+        def rows():
+            yield 1
+
+        assert tracing.traced(rows) is rows
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, Entry
+from app.infrastructure import get_db
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import DictionaryRepository
+from app.infrastructure.write_batching import EntryWriteBatcher, get_entry_batcher
+from app.main import app
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'batching.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def dictionary(session_factory):
+    db = session_factory()
+    created = DictionaryRepository(db).create(
+        Dictionary(name="Batch", source_language="en", target_language="ru")
+    )
+    db.close()
+    return created
+
+
+def make_entries(dictionary, count, prefix="word"):
+    return [
+        Entry(
+            dictionary_id=dictionary.id,
+            original_text=f"{prefix}{i}",
+            translated_text="слово",
+        )
+        for i in range(count)
+    ]
+
+
+def stored_count(session_factory, dictionary) -> int:
+    db = session_factory()
+    try:
+        return EntryRepository(db).count_by_dictionary(dictionary.id)
+    finally:
+        db.close()
+
+
+class TestEntryWriteBatcher:
+    async def test_concurrent_inserts_share_one_transaction(
+        self, session_factory, dictionary
+    ):
+        batcher = EntryWriteBatcher(session_factory, max_size=50, max_delay=0.05)
+        entries = make_entries(dictionary, 20)
+
+        created = await asyncio.gather(*(batcher.submit(e) for e in entries))
+        await batcher.close()
+
+        assert created == entries
+        assert batcher.batches == 1
+        assert stored_count(session_factory, dictionary) == 20
+
+    async def test_batch_is_cut_at_max_size(self, session_factory, dictionary):
+        batcher = EntryWriteBatcher(session_factory, max_size=4, max_delay=0.05)
+
+        await asyncio.gather(*(batcher.submit(e) for e in make_entries(dictionary, 10)))
+        await batcher.close()
+
+        assert batcher.batches == 3
+        assert stored_count(session_factory, dictionary) == 10
+
+    async def test_failed_insert_does_not_fail_the_batch(
+        self, session_factory, dictionary
+    ):
+        batcher = EntryWriteBatcher(session_factory, max_size=10, max_delay=0.05)
+        existing = await batcher.submit(make_entries(dictionary, 1)[0])
+        duplicate = Entry.from_storage(
+            existing.id,
+            dictionary.id,
+            "duplicate",
+            "дубль",
+            None,
+            None,
+            existing.created_at,
+            existing.updated_at,
+        )
+        good = make_entries(dictionary, 3, prefix="good")
+
+        results = await asyncio.gather(
+            *(batcher.submit(e) for e in [good[0], duplicate, *good[1:]]),
+            return_exceptions=True,
+        )
+        await batcher.close()
+
+        assert results[0] is good[0] and results[2:] == good[1:]
+        assert isinstance(results[1], ValueError)
+        assert stored_count(session_factory, dictionary) == 4
+
+    async def test_close_without_writes(self, session_factory):
+        batcher = EntryWriteBatcher(session_factory)
+
+        await batcher.close()
+
+        assert batcher.batches == 0
+
+
+class TestBatchedCreateAPI:
+    @pytest.fixture
+    def client(self, session_factory):
+        batcher = EntryWriteBatcher(session_factory, max_delay=0.001)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_entry_batcher] = lambda: batcher
+        previous_get_db = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app), batcher
+        del app.dependency_overrides[get_entry_batcher]
+        if previous_get_db is None:
+            del app.dependency_overrides[get_db]
+        else:
+            app.dependency_overrides[get_db] = previous_get_db
+
+    def test_create_goes_through_batcher(self, client, dictionary, session_factory):
+        http, batcher = client
+
+        response = http.post(
+            f"/api/v1/dictionaries/{dictionary.id}/entries",
+            json={"original_text": "cat", "translated_text": "кот"},
+        )
+
+        assert response.status_code == 201
+        assert response.json()["original_text"] == "cat"
+        assert batcher.batches == 1
+        assert stored_count(session_factory, dictionary) == 1
+
+    def test_validation_errors_are_reported_per_request(self, client, dictionary):
+        http, batcher = client
+
+        response = http.post(
+            f"/api/v1/dictionaries/{dictionary.id}/entries",
+            json={"original_text": "   ", "translated_text": "кот"},
+        )
+
+        assert response.status_code == 400
+        assert batcher.batches == 0
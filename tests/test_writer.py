@@ -0,0 +1,369 @@
+import asyncio
+import socket
+import threading
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import Dictionary, DuplicateEntryError, Entry
+from app.infrastructure import get_db
+from app.infrastructure.cache import MISSING, LRUCache
+from app.infrastructure.database import Base
+from app.infrastructure.entry_repository import EntryRepository
+from app.infrastructure.repository import (
+    deleted_dictionary_key,
+    dictionary_key,
+    entry_key,
+)
+from app.infrastructure.text_indexes import (
+    DictionaryIndexCache,
+    PrefixIndex,
+    TrigramIndex,
+)
+from app.infrastructure.writer import (
+    WriterClient,
+    WriterNoReplyError,
+    WriterOverloadedError,
+    WriterServer,
+    WriterUnavailableError,
+    get_writer,
+)
+from app.main import app
+from app.services.dictionary_service import DictionaryService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'writer.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "writer.sock")
+
+
+@pytest.fixture
+def silent_socket(tmp_path):
+    # Соединения принимает ядро, но ответов никто не пишет
+    path = str(tmp_path / "silent.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    yield path
+    listener.close()
+
+
+@pytest.fixture
+async def server(session_factory, socket_path):
+    server = WriterServer(socket_path, session_factory)
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def client(server, socket_path):
+    client = WriterClient(socket_path, entity_cache=LRUCache(), index_caches={})
+    yield client
+    await client.close()
+
+
+def make_entries(dictionary, count, prefix="word"):
+    return [
+        Entry(
+            dictionary_id=dictionary.id,
+            original_text=f"{prefix}{i}",
+            translated_text="слово",
+        )
+        for i in range(count)
+    ]
+
+
+def stored_count(session_factory, dictionary) -> int:
+    db = session_factory()
+    try:
+        return EntryRepository(db).count_by_dictionary(dictionary.id)
+    finally:
+        db.close()
+
+
+async def create_dictionary(client, name="Writer") -> Dictionary:
+    return await client.call(
+        "DictionaryRepository.create",
+        Dictionary(name=name, source_language="en", target_language="ru"),
+    )
+
+
+class TestWriter:
+    async def test_concurrent_inserts_share_one_transaction(
+        self, server, client, session_factory
+    ):
+        dictionary = await create_dictionary(client)
+        batches = server.batches
+        entries = make_entries(dictionary, 20)
+
+        created = await asyncio.gather(
+            *(client.call("EntryRepository.create", e) for e in entries)
+        )
+
+        assert [e.id for e in created] == [e.id for e in entries]
+        assert server.batches == batches + 1
+        assert stored_count(session_factory, dictionary) == 20
+
+    async def test_errors_are_raised_in_the_caller(self, client, session_factory):
+        dictionary = await create_dictionary(client)
+        first = make_entries(dictionary, 1)[0]
+        duplicate = Entry(
+            dictionary_id=dictionary.id,
+            original_text=first.original_text.upper(),
+            translated_text="дубль",
+        )
+
+        results = await asyncio.gather(
+            client.call("EntryRepository.create", first),
+            client.call("EntryRepository.create", duplicate),
+            client.call("EntryRepository.delete", first.id),
+            return_exceptions=True,
+        )
+
+        assert results[0].id == first.id
+        assert isinstance(results[1], DuplicateEntryError)
+        assert results[2] is True
+        assert stored_count(session_factory, dictionary) == 0
+
+    async def test_unknown_operations_are_refused(self, client):
+        with pytest.raises(WriterUnavailableError, match="Unknown write"):
+            await client.call("EntryRepository.search", "word")
+
+    async def test_full_queue_rejects_instead_of_waiting(
+        self, session_factory, socket_path
+    ):
+        server = WriterServer(socket_path, session_factory, queue_size=2)
+        await server.start()
+        client = WriterClient(socket_path, entity_cache=LRUCache(), index_caches={})
+        dictionary = await create_dictionary(client)
+
+        results = await asyncio.gather(
+            *(
+                client.call("EntryRepository.create", e)
+                for e in make_entries(dictionary, 20)
+            ),
+            return_exceptions=True,
+        )
+        await client.close()
+        await server.close()
+
+        rejected = [r for r in results if isinstance(r, WriterOverloadedError)]
+        assert rejected and len(rejected) == server.rejected
+        assert stored_count(session_factory, dictionary) == 20 - len(rejected)
+
+    async def test_changes_are_broadcast_to_every_worker(self, client, socket_path):
+        other_cache = LRUCache()
+        prefix_indexes = DictionaryIndexCache(1 << 20)
+        other = WriterClient(
+            socket_path,
+            entity_cache=other_cache,
+            index_caches={"prefix": prefix_indexes},
+        )
+        await other.connect()
+        dictionary = await create_dictionary(client)
+        entry = await client.call(
+            "EntryRepository.create", make_entries(dictionary, 1)[0]
+        )
+        other_cache.set(entry_key(entry.id), entry)
+
+        await client.call("EntryRepository.delete", entry.id)
+
+        assert other_cache.get(entry_key(entry.id)) is MISSING
+        await other.close()
+
+    async def test_index_changes_are_applied_without_rebuilding(
+        self, client, socket_path
+    ):
+        prefix_indexes = DictionaryIndexCache(1 << 20)
+        trigram_indexes = DictionaryIndexCache(1 << 20)
+        other = WriterClient(
+            socket_path,
+            entity_cache=LRUCache(),
+            index_caches={"prefix": prefix_indexes, "trigram": trigram_indexes},
+        )
+        await other.connect()
+        dictionary = await create_dictionary(client)
+        first, second = make_entries(dictionary, 2)
+        await client.call("EntryRepository.create", first)
+        # Индексы воркера уже загружены; построить их заново было бы ошибкой
+        loaded = [first.original_text]
+        prefix = prefix_indexes.get(dictionary.id, lambda: PrefixIndex(loaded))
+        trigram = trigram_indexes.get(
+            dictionary.id,
+            lambda: TrigramIndex(
+                [(first.id, first.original_text, first.translated_text)]
+            ),
+        )
+
+        await client.call("EntryRepository.create", second)
+        await client.call("EntryRepository.delete", first.id)
+
+        assert prefix_indexes.get(dictionary.id, pytest.fail) is prefix
+        assert trigram_indexes.get(dictionary.id, pytest.fail) is trigram
+        assert prefix.complete("word") == [second.original_text]
+        assert [m.entry_id for m in trigram.search("word1")] == [second.id]
+
+        assert await client.call("DictionaryRepository.delete", dictionary.id)
+
+        assert dictionary.id not in prefix_indexes
+        assert dictionary.id not in trigram_indexes
+        await other.close()
+
+    async def test_dictionary_delete_hides_cached_entries_in_workers(
+        self, client, socket_path
+    ):
+        other_cache = LRUCache()
+        other = WriterClient(socket_path, entity_cache=other_cache, index_caches={})
+        await other.connect()
+        dictionary = await create_dictionary(client)
+        entry = await client.call(
+            "EntryRepository.create", make_entries(dictionary, 1)[0]
+        )
+        other_cache.set(entry_key(entry.id), entry)
+
+        assert await client.call("DictionaryRepository.delete", dictionary.id)
+
+        assert other_cache.get(deleted_dictionary_key(dictionary.id)) is True
+        await other.close()
+
+    async def test_dictionary_changes_go_through_the_writer(self, client, socket_path):
+        other_cache = LRUCache()
+        other = WriterClient(socket_path, entity_cache=other_cache, index_caches={})
+        await other.connect()
+        # Без репозитория: любое обращение к базе в обход писателя упадёт
+        service = DictionaryService(None, client)
+        dictionary = await service.add_dictionary("Writer", "en", "ru")
+        other_cache.set(dictionary_key(dictionary.id), dictionary)
+
+        updated = await service.change_dictionary(dictionary.id, name="Renamed")
+        missing = await service.change_dictionary(uuid4(), name="Nobody")
+        deleted = await service.remove_dictionary(dictionary.id)
+
+        assert updated.name == "Renamed"
+        assert updated.source_language == "en"
+        assert missing is None
+        assert deleted is True
+        assert other_cache.get(dictionary_key(dictionary.id)) is MISSING
+        with pytest.raises(ValueError):
+            await service.change_dictionary(dictionary.id, name="")
+        await other.close()
+
+    async def test_missing_reply_is_not_reported_as_overload(self, silent_socket):
+        client = WriterClient(silent_socket, timeout=0.05)
+
+        with pytest.raises(WriterNoReplyError, match="No reply"):
+            await client.call("DictionaryRepository.delete", uuid4())
+        await client.close()
+
+    async def test_unreachable_writer(self, tmp_path):
+        client = WriterClient(str(tmp_path / "missing.sock"))
+
+        await client.connect()
+        with pytest.raises(WriterUnavailableError, match="not reachable"):
+            await client.call("DictionaryRepository.delete", uuid4())
+
+
+class TestWriterAPI:
+    @pytest.fixture
+    def http(self, session_factory):
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        previous_get_db = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_writer, None)
+        if previous_get_db is None:
+            del app.dependency_overrides[get_db]
+        else:
+            app.dependency_overrides[get_db] = previous_get_db
+
+    @pytest.fixture
+    def writer_thread(self, session_factory, socket_path):
+        # Писатель в своём потоке и event loop, как отдельный процесс
+        loop = asyncio.new_event_loop()
+        server = WriterServer(socket_path, session_factory)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        yield server
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def test_writes_go_through_the_writer(
+        self, http, writer_thread, socket_path, session_factory
+    ):
+        writer = WriterClient(socket_path)
+        app.dependency_overrides[get_writer] = lambda: writer
+
+        response = http.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Remote", "source_language": "en", "target_language": "ru"},
+        )
+        dictionary_id = response.json()["id"]
+        entry = http.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries",
+            json={"original_text": "cat", "translated_text": "кот"},
+        )
+        imported = http.post(
+            f"/api/v1/dictionaries/{dictionary_id}/entries/import",
+            content=b'{"original_text": "dog", "translated_text": "pes"}\n'
+            b'{"original_text": "cat", "translated_text": "kot"}\n',
+        )
+        deleted = http.delete(f"/api/v1/entries/{entry.json()['id']}")
+
+        assert response.status_code == 201
+        assert entry.status_code == 201
+        assert imported.json()["imported"] == 1
+        assert imported.json()["duplicates"] == 1
+        assert deleted.status_code == 204
+        assert writer_thread.batches >= 1
+        assert (
+            http.get(f"/api/v1/dictionaries/{dictionary_id}/entries").json()["total"]
+            == 1
+        )
+
+    def test_unavailable_writer_returns_503(self, http, tmp_path):
+        missing = WriterClient(str(tmp_path / "missing.sock"))
+        app.dependency_overrides[get_writer] = lambda: missing
+
+        response = http.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Remote", "source_language": "en", "target_language": "ru"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_missing_reply_returns_504_without_retry_after(self, http, silent_socket):
+        silent = WriterClient(silent_socket, timeout=0.05)
+        app.dependency_overrides[get_writer] = lambda: silent
+
+        response = http.post(
+            "/api/v1/dictionaries/",
+            json={"name": "Remote", "source_language": "en", "target_language": "ru"},
+        )
+
+        assert response.status_code == 504
+        assert "Retry-After" not in response.headers